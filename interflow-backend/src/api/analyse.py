@@ -53,7 +53,7 @@ async def analyze_coverage(
                 raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez le format ISO (YYYY-MM-DD)")
         else:
             # Utiliser datetime.now() sans timezone pour cohérence
-            date_debut = datetime.now().replace(tzinfo=None)
+            date_debut = datetime.now()
 
         # Créer le service d'analyse
         analyse_service = get_analyse_service()
@@ -102,7 +102,7 @@ async def analyze_matiere_coverage(
                 raise HTTPException(status_code=400, detail="Format de date invalide. Utilisez le format ISO (YYYY-MM-DD)")
         else:
             # Utiliser datetime.now() sans timezone pour cohérence
-            date_debut = datetime.now().replace(tzinfo=None)
+            date_debut = datetime.now()
 
         # Créer le service d'analyse
         analyse_service = get_analyse_service()
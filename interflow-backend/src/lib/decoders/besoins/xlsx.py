@@ -183,7 +183,7 @@ class XLSXBesoinsDecoder(Decoder[Besoin]):
 
             # Parser l'échéance
             echeance_str = self._find_column_value(row, 'date_echeance')
-            echeance = datetime.now().replace(tzinfo=None)  # Par défaut
+            echeance = datetime.now()  # Par défaut
             if echeance_str:
                 try:
                     echeance = datetime.strptime(echeance_str, '%d/%m/%Y')
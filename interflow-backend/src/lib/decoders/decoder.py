@@ -2,12 +2,33 @@
 Interface et implémentations pour les décodeurs de fichiers
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, Iterator, List
 from pathlib import Path
 from typing import TypeVar, Generic
 
 T = TypeVar('T')
 
+# Nombre de lignes converties à la fois lors du parcours d'un DataFrame
+BATCH_SIZE = 5000
+
+
+def iter_records(df, batch_size: int = BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt les lignes d'un DataFrame sous forme de dictionnaires, par tranches
+
+    Mêmes conversions que df.to_dict('records'), sans matérialiser la liste de
+    toutes les lignes.
+
+    Args:
+        df: DataFrame pandas à parcourir
+        batch_size: Nombre de lignes converties à la fois
+
+    Returns:
+        Iterator[Dict[str, Any]]: Lignes du DataFrame, dans l'ordre
+    """
+    for debut in range(0, len(df), batch_size):
+        yield from df.iloc[debut:debut + batch_size].to_dict('records')
+
 class Decoder(ABC, Generic[T]):
     """
     Interface pour les décodeurs de fichiers
@@ -38,3 +59,18 @@ class Decoder(ABC, Generic[T]):
             List[T]: Liste des éléments créés
         """
         pass
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[T]:
+        """
+        Décode un fichier élément par élément
+
+        Par défaut, parcourt le résultat de decode_file ; les décodeurs capables de
+        produire leurs éléments au fil de la lecture redéfinissent cette méthode.
+
+        Args:
+            file_path: Chemin vers le fichier à décoder
+
+        Returns:
+            Iterator[T]: Éléments créés, dans l'ordre du fichier
+        """
+        return iter(self.decode_file(file_path))
@@ -1,9 +1,10 @@
 """
 Décodeur pour les rapatriements depuis XLSX
 """
-from typing import List, Union, Dict, Optional
+from typing import Iterator, List, Union, Dict, Optional
 from pathlib import Path
 import pandas as pd
+from openpyxl import load_workbook
 import logging
 from models.rappatriement import Rappatriement, ProduitRappatriement
 from datetime import datetime
@@ -128,7 +129,7 @@ class XLSXRappatriementsDecoder(Decoder[Rappatriement]):
             # Créer le rapatriement avec des valeurs par défaut
             rappatriement = Rappatriement(
                 numero_transfert="RAP_UNKNOWN",
-                date_derniere_maj=datetime.now().replace(tzinfo=None),
+                date_derniere_maj=datetime.now(),
                 responsable_diffusion="Service Entrepôts & Distribution",
                 date_demande=None,
                 date_reception_souhaitee=None,
@@ -155,6 +156,22 @@ class XLSXRappatriementsDecoder(Decoder[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements décodés
         """
+        return list(self.decode_file_iter(file_path))
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[Rappatriement]:
+        """
+        Décode un fichier XLSX de rapatriement au fil de la lecture
+
+        Le classeur est ouvert en lecture seule et parcouru une seule fois :
+        les métadonnées, l'en-tête et les lignes produits sont traités à la
+        volée, sans charger la feuille dans un DataFrame.
+
+        Args:
+            file_path: Le chemin vers le fichier XLSX
+
+        Yields:
+            Rappatriement: Les rapatriements décodés
+        """
         try:
             file_path = Path(file_path)
 
@@ -164,159 +181,198 @@ class XLSXRappatriementsDecoder(Decoder[Rappatriement]):
             if file_path.suffix.lower() not in self.supported_extensions:
                 raise ValueError(f"Format de fichier non supporté. Formats supportés: {self.supported_extensions}")
 
-            # Lire le fichier Excel avec pandas
             logger.info(f"Lecture du fichier XLSX: {file_path}")
 
-            # Essayer de lire avec header=None pour voir toutes les lignes
-            df_raw = pd.read_excel(file_path, header=None)
-            logger.info(f"Fichier lu (raw): {df_raw.shape[0]} lignes, {df_raw.shape[1]} colonnes")
-
-            # Chercher l'en-tête (lignes contenant "Code Prdt")
-            header_row = None
-            for i, row in df_raw.iterrows():
-                row_values = [str(val).strip() for val in row.values if pd.notna(val)]
-                if any('Code Prdt' in val for val in row_values):
-                    header_row = i
-                    logger.info(f"En-tête trouvé à la ligne {i+1}: {row_values}")
-                    break
+            workbook = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                metadonnees = {
+                    'numero_transfert': "RAP_UNKNOWN",
+                    'date_demande': None,
+                    'date_reception_souhaitee': None,
+                    'adresse_destinataire': "",
+                    'adresse_enlevement': "",
+                    'remarques': "",
+                }
+                metadonnees_terminees = False
+                colonnes = None
+                ligne_entete = 0
+                produits = []
+
+                for i, values in enumerate(workbook.active.iter_rows(values_only=True)):
+                    row_values = [str(val).strip() for val in values if pd.notna(val)]
+
+                    # Les métadonnées se lisent jusqu'à la ligne de règle du rapatriement
+                    if not metadonnees_terminees:
+                        metadonnees_terminees = self._lire_metadonnees(values, row_values, metadonnees)
+
+                    # Chercher l'en-tête (première ligne contenant "Code Prdt")
+                    if colonnes is None:
+                        if any('Code Prdt' in val for val in row_values):
+                            colonnes = self._noms_colonnes(values)
+                            ligne_entete = i
+                            logger.info(f"En-tête trouvé à la ligne {i+1}: {row_values}")
+                            logger.info(f"Colonnes détectées: {colonnes}")
+                        continue
 
-            if header_row is None:
-                raise ValueError("En-tête CSV non trouvé dans le fichier XLSX")
+                    produit = self._decode_produit(dict(zip(colonnes, values)), i - ligne_entete)
+                    if produit is not None:
+                        produits.append(produit)
+            finally:
+                workbook.close()
 
-            logger.info(f"En-tête trouvé à la ligne {header_row + 1}")
-
-            # Lire le fichier avec l'en-tête correct
-            df = pd.read_excel(file_path, header=header_row)
-            logger.info(f"Fichier lu avec en-tête: {df.shape[0]} lignes, {df.shape[1]} colonnes")
-
-            # Afficher les colonnes détectées pour debug
-            logger.info(f"Colonnes détectées: {list(df.columns)}")
-
-            # Extraire les métadonnées du rapatriement depuis le fichier XLSX
-            numero_transfert = "RAP_UNKNOWN"
-            date_demande = None
-            date_reception_souhaitee = None
-            adresse_destinataire = ""
-            adresse_enlevement = ""
-            remarques = ""
-
-            # Lire les métadonnées depuis les premières lignes
-            for i, row in df_raw.iterrows():
-                row_values = [str(val).strip() for val in row.values if pd.notna(val)]
-                row_text = " ".join(row_values).lower()
-
-                # Numéro de transfert
-                if "numéro de transfert" in row_text:
-                    for val in row_values:
-                        if "n°" in val or "lsr" in val.lower():
-                            # Nettoyer le numéro de transfert
-                            numero_clean = val.strip()
-                            if "Numéro de Transfert N°" in numero_clean:
-                                numero_transfert = numero_clean.replace("Numéro de Transfert N°", "").strip()
-                            else:
-                                numero_transfert = numero_clean
-                            break
-
-                # Date de demande
-                if "date de la demande" in row_text:
-                    for val in row.values:
-                        if isinstance(val, datetime):
-                            date_demande = val
-                            break
-
-                # Date de réception souhaitée
-                if "date de réception souhaitée" in row_text:
-                    for val in row.values:
-                        if isinstance(val, datetime):
-                            date_reception_souhaitee = val
-                            break
-
-                # Adresse destinataire
-                if "adresse destinataire" in row_text:
-                    for j, val in enumerate(row.values):
-                        if pd.notna(val) and "adresse destinataire" in str(val).lower():
-                            if j + 1 < len(row.values) and pd.notna(row.values[j + 1]):
-                                adresse_destinataire = str(row.values[j + 1]).strip()
-                            break
-
-                # Adresse enlèvement
-                if "adresse enlèvement" in row_text:
-                    for j, val in enumerate(row.values):
-                        if pd.notna(val) and "adresse enlèvement" in str(val).lower():
-                            if j + 1 < len(row.values) and pd.notna(row.values[j + 1]):
-                                adresse_enlevement = str(row.values[j + 1]).strip()
-                            break
-
-                # Remarques
-                if "règle du rapatriement" in row_text:
-                    remarques = " ".join(row_values)
-                    break
+            if colonnes is None:
+                raise ValueError("En-tête CSV non trouvé dans le fichier XLSX")
 
             # Créer le rapatriement avec les informations extraites
             rappatriement = Rappatriement(
-                numero_transfert=numero_transfert,
-                date_derniere_maj=datetime.now().replace(tzinfo=None),  # Date actuelle
+                date_derniere_maj=datetime.now(),  # Date actuelle
                 responsable_diffusion="Service Entrepôts & Distribution",
-                date_demande=date_demande,
-                date_reception_souhaitee=date_reception_souhaitee,
                 contacts="",
-                adresse_destinataire=adresse_destinataire,
-                adresse_enlevement=adresse_enlevement,
-                remarques=remarques
+                **metadonnees
             )
+            for produit in produits:
+                rappatriement.ajouter_produit(produit)
 
-            # Convertir le DataFrame en liste de dictionnaires
-            data = df.to_dict('records')
+            logger.info(f"Fichier {file_path} décodé avec succès. {len(rappatriement.produits)} produits créés.")
+            yield rappatriement
 
-            # Parser chaque ligne comme un produit
-            for i, row in enumerate(data):
-                try:
-                    # Vérifier si la ligne contient au moins les données minimales
-                    code_prdt = self._find_column_value(row, 'code_prdt')
-                    designation_prdt = self._find_column_value(row, 'designation_prdt')
+        except Exception as e:
+            logger.error(f"Erreur lors du décodage du fichier {file_path}: {str(e)}")
+            raise
 
-                    # Debug pour voir les valeurs trouvées
-                    logger.debug(f"Ligne {i+1} - code_prdt: '{code_prdt}', designation_prdt: '{designation_prdt}'")
+    @staticmethod
+    def _noms_colonnes(values: tuple) -> List[str]:
+        """
+        Construit les noms de colonnes à partir de la ligne d'en-tête
 
-                    # Ignorer les lignes sans code produit ou avec des erreurs
-                    if not code_prdt or not designation_prdt:
-                        logger.debug(f"Ligne {i+1} ignorée : données insuffisantes")
-                        continue
+        Les cellules vides et les doublons sont nommés comme le fait pandas
+        ("Unnamed: N", "Nom.1") pour que le mapping reste inchangé.
 
-                    # Ignorer les lignes qui ne sont pas des produits (remarques, totaux, etc.)
-                    if (designation_prdt.lower() in ['remarques', 'remarque', 'note', 'total', 'somme'] or
-                        code_prdt.lower() in ['remarques', 'remarque', 'note', 'total', 'somme'] or
-                        code_prdt.lower().startswith('remarques') or
-                        designation_prdt.lower().startswith('remarques')):
-                        logger.debug(f"Ligne {i+1} ignorée : ligne de remarques/total")
-                        continue
+        Args:
+            values: Valeurs de la ligne d'en-tête
+
+        Returns:
+            List[str]: Noms des colonnes
+        """
+        colonnes = []
+        vus: Dict[str, int] = {}
+        for j, val in enumerate(values):
+            nom = f"Unnamed: {j}" if val is None else str(val)
+            if nom in vus:
+                vus[nom] += 1
+                nom = f"{nom}.{vus[nom]}"
+            else:
+                vus[nom] = 0
+            colonnes.append(nom)
+        return colonnes
+
+    @staticmethod
+    def _lire_metadonnees(values: tuple, row_values: List[str], metadonnees: dict) -> bool:
+        """
+        Extrait les métadonnées du rapatriement d'une ligne du fichier
 
-                    # Créer le produit (la normalisation se fait automatiquement dans le modèle Pydantic)
-                    produit = ProduitRappatriement(
-                        prelevement=self._find_column_value(row, 'prelevement'),
-                        code_prdt=code_prdt,
-                        designation_prdt=designation_prdt,
-                        lot=self._find_column_value(row, 'lot') or "",
-                        poids_net=self._find_column_value(row, 'poids_net') or '0',  # Normalisation automatique dans Pydantic
-                        type_emballage=self._find_column_value(row, 'type_emballage') or 'AUTRE',  # Normalisation automatique dans Pydantic
-                        stock_solde=self._find_column_value(row, 'stock_solde') or False,  # Normalisation automatique dans Pydantic
-                        nb_contenants=self._find_column_value(row, 'nb_contenants') or '0',  # Normalisation automatique dans Pydantic
-                        nb_palettes=self._find_column_value(row, 'nb_palettes') or '0',  # Normalisation automatique dans Pydantic
-                        dimension_palettes=self._find_column_value(row, 'dimension_palettes') or "",
-                        code_onu=self._find_column_value(row, 'code_onu') or "",
-                        grp_emballage=self._find_column_value(row, 'grp_emballage') or "",
-                        po=clean_string_value(self._find_column_value(row, 'po'))  # Champ optionnel
-                    )
-
-                    rappatriement.ajouter_produit(produit)
-
-                except Exception as e:
-                    logger.warning(f"Erreur lors du décodage de la ligne {i+1}: {e}")
-                    continue
+        Args:
+            values: Valeurs brutes de la ligne
+            row_values: Valeurs non vides de la ligne, converties en texte
+            metadonnees: Métadonnées à compléter
 
-            logger.info(f"Fichier {file_path} décodé avec succès. {len(rappatriement.produits)} produits créés.")
-            return [rappatriement]
+        Returns:
+            bool: True si la ligne de règle du rapatriement a été atteinte
+        """
+        row_text = " ".join(row_values).lower()
+
+        # Numéro de transfert
+        if "numéro de transfert" in row_text:
+            for val in row_values:
+                if "n°" in val or "lsr" in val.lower():
+                    # Nettoyer le numéro de transfert
+                    numero_clean = val.strip()
+                    if "Numéro de Transfert N°" in numero_clean:
+                        metadonnees['numero_transfert'] = numero_clean.replace("Numéro de Transfert N°", "").strip()
+                    else:
+                        metadonnees['numero_transfert'] = numero_clean
+                    break
+
+        # Date de demande
+        if "date de la demande" in row_text:
+            for val in values:
+                if isinstance(val, datetime):
+                    metadonnees['date_demande'] = val
+                    break
+
+        # Date de réception souhaitée
+        if "date de réception souhaitée" in row_text:
+            for val in values:
+                if isinstance(val, datetime):
+                    metadonnees['date_reception_souhaitee'] = val
+                    break
+
+        # Adresses destinataire et enlèvement
+        for libelle, champ in (("adresse destinataire", 'adresse_destinataire'),
+                               ("adresse enlèvement", 'adresse_enlevement')):
+            if libelle in row_text:
+                for j, val in enumerate(values):
+                    if pd.notna(val) and libelle in str(val).lower():
+                        if j + 1 < len(values) and pd.notna(values[j + 1]):
+                            metadonnees[champ] = str(values[j + 1]).strip()
+                        break
+
+        # Remarques
+        if "règle du rapatriement" in row_text:
+            metadonnees['remarques'] = " ".join(row_values)
+            return True
+
+        return False
+
+    def _decode_produit(self, row: dict, numero_ligne: int) -> Optional[ProduitRappatriement]:
+        """
+        Décode une ligne produit située sous l'en-tête
+
+        Args:
+            row: Dictionnaire représentant la ligne
+            numero_ligne: Numéro de la ligne (pour les logs)
+
+        Returns:
+            Optional[ProduitRappatriement]: Le produit, ou None si la ligne est ignorée
+        """
+        try:
+            # Vérifier si la ligne contient au moins les données minimales
+            code_prdt = self._find_column_value(row, 'code_prdt')
+            designation_prdt = self._find_column_value(row, 'designation_prdt')
+
+            # Debug pour voir les valeurs trouvées
+            logger.debug(f"Ligne {numero_ligne} - code_prdt: '{code_prdt}', designation_prdt: '{designation_prdt}'")
+
+            # Ignorer les lignes sans code produit ou avec des erreurs
+            if not code_prdt or not designation_prdt:
+                logger.debug(f"Ligne {numero_ligne} ignorée : données insuffisantes")
+                return None
+
+            # Ignorer les lignes qui ne sont pas des produits (remarques, totaux, etc.)
+            if (designation_prdt.lower() in ['remarques', 'remarque', 'note', 'total', 'somme'] or
+                code_prdt.lower() in ['remarques', 'remarque', 'note', 'total', 'somme'] or
+                code_prdt.lower().startswith('remarques') or
+                designation_prdt.lower().startswith('remarques')):
+                logger.debug(f"Ligne {numero_ligne} ignorée : ligne de remarques/total")
+                return None
+
+            # Créer le produit (la normalisation se fait automatiquement dans le modèle Pydantic)
+            return ProduitRappatriement(
+                prelevement=self._find_column_value(row, 'prelevement'),
+                code_prdt=code_prdt,
+                designation_prdt=designation_prdt,
+                lot=self._find_column_value(row, 'lot') or "",
+                poids_net=self._find_column_value(row, 'poids_net') or '0',  # Normalisation automatique dans Pydantic
+                type_emballage=self._find_column_value(row, 'type_emballage') or 'AUTRE',  # Normalisation automatique dans Pydantic
+                stock_solde=self._find_column_value(row, 'stock_solde') or False,  # Normalisation automatique dans Pydantic
+                nb_contenants=self._find_column_value(row, 'nb_contenants') or '0',  # Normalisation automatique dans Pydantic
+                nb_palettes=self._find_column_value(row, 'nb_palettes') or '0',  # Normalisation automatique dans Pydantic
+                dimension_palettes=self._find_column_value(row, 'dimension_palettes') or "",
+                code_onu=self._find_column_value(row, 'code_onu') or "",
+                grp_emballage=self._find_column_value(row, 'grp_emballage') or "",
+                po=clean_string_value(self._find_column_value(row, 'po'))  # Champ optionnel
+            )
 
         except Exception as e:
-            logger.error(f"Erreur lors du décodage du fichier {file_path}: {str(e)}")
-            raise
+            logger.warning(f"Erreur lors du décodage de la ligne {numero_ligne}: {e}")
+            return None
@@ -1,13 +1,13 @@
 """
 Décodeur pour les réceptions depuis CSV (S3)
 """
-from typing import List, Union, Dict, Optional
+from typing import Iterator, List, Union, Dict, Optional
 from pathlib import Path
 import pandas as pd
 import logging
 from models.reception import Reception
 from datetime import datetime
-from lib.decoders.decoder import Decoder
+from lib.decoders.decoder import Decoder, iter_records
 from models.matieres import Matiere
 
 logger = logging.getLogger(__name__)
@@ -228,7 +228,7 @@ class CSVReceptionsDecoder(Decoder[Reception]):
             reception = Reception(
                 matiere=matiere,
                 quantite=quantite_kg,
-                date_creation=datetime.now().replace(tzinfo=None),  # Pas de date dans le CSV, utiliser maintenant
+                date_creation=datetime.now(),  # Pas de date dans le CSV, utiliser maintenant
                 # Champs optionnels
                 ordre=numero_reception,
                 fournisseur=fournisseur,
@@ -256,6 +256,18 @@ class CSVReceptionsDecoder(Decoder[Reception]):
         Returns:
             List[Reception]: Liste des réceptions créées
         """
+        return list(self.decode_file_iter(file_path))
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[Reception]:
+        """
+        Décode un fichier CSV en réceptions, au fil de la lecture
+
+        Args:
+            file_path: Chemin vers le fichier CSV
+
+        Returns:
+            Iterator[Reception]: Réceptions créées
+        """
         try:
             file_path = Path(file_path)
 
@@ -273,16 +285,14 @@ class CSVReceptionsDecoder(Decoder[Reception]):
             # Afficher les colonnes détectées pour debug
             logger.info(f"Colonnes détectées: {list(df.columns)}")
 
-            # Convertir le DataFrame en liste de dictionnaires
-            data = df.to_dict('records')
-
-            receptions = []
+            nb_crees = 0
             lignes_ignorees = 0
 
-            for i, row in enumerate(data):
+            for i, row in enumerate(iter_records(df)):
                 try:
                     reception = self.decode_row(row)
-                    receptions.append(reception)
+                    yield reception
+                    nb_crees += 1
                 except ValueError as e:
                     # Ignorer silencieusement les lignes avec des champs vides
                     lignes_ignorees += 1
@@ -295,8 +305,7 @@ class CSVReceptionsDecoder(Decoder[Reception]):
             if lignes_ignorees > 0:
                 logger.info(f"⚠ {lignes_ignorees} lignes ignorées (champs obligatoires vides)")
 
-            logger.info(f"Fichier {file_path} décodé avec succès. {len(receptions)} réceptions créées.")
-            return receptions
+            logger.info(f"Fichier {file_path} décodé avec succès. {nb_crees} réceptions créées.")
 
         except Exception as e:
             logger.error(f"Erreur lors du décodage du fichier {file_path}: {str(e)}")
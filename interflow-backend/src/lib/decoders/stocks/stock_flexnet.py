@@ -1,13 +1,13 @@
 """
 Décodeur pour les stocks depuis l'onglet stock_flexnet du fichier Excel
 """
-from typing import List, Union, Dict, Optional
+from typing import Iterator, List, Union, Dict, Optional
 from pathlib import Path
 import pandas as pd
 import logging
 from models.stock import Stock
 from datetime import datetime
-from lib.decoders.decoder import Decoder
+from lib.decoders.decoder import Decoder, iter_records
 from models.matieres import Matiere
 from lib.utils import parse_date
 
@@ -272,7 +272,7 @@ class StockFlexnetDecoder(Decoder[Stock]):
                 lot_fournisseur=self._find_column_value(row, 'lot_fournisseur') or 'N/A',
                 capacite=None,
                 commentaire=clean_string_value(self._find_column_value(row, 'commentaire')) or 'N/A',
-                date_creation=datetime.now().replace(tzinfo=None),
+                date_creation=datetime.now(),
                 dluo=dluo,
                 matiere=matiere
             )
@@ -292,6 +292,18 @@ class StockFlexnetDecoder(Decoder[Stock]):
         Returns:
             List[Stock]: Liste des stocks créés
         """
+        return list(self.decode_file_iter(file_path))
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[Stock]:
+        """
+        Décode un fichier Excel (onglet stock_flexnet) en stocks, au fil de la lecture
+
+        Args:
+            file_path: Chemin vers le fichier Excel
+
+        Returns:
+            Iterator[Stock]: Stocks créés
+        """
         try:
             file_path = Path(file_path)
 
@@ -309,16 +321,14 @@ class StockFlexnetDecoder(Decoder[Stock]):
             # Afficher les colonnes détectées pour debug
             logger.info(f"Colonnes détectées: {list(df.columns)}")
 
-            # Convertir le DataFrame en liste de dictionnaires
-            data = df.to_dict('records')
-
-            stocks = []
+            nb_crees = 0
             lignes_ignorees = 0
 
-            for i, row in enumerate(data):
+            for i, row in enumerate(iter_records(df)):
                 try:
                     stock = self.decode_row(row)
-                    stocks.append(stock)
+                    yield stock
+                    nb_crees += 1
                 except ValueError as e:
                     # Ignorer silencieusement les lignes avec des champs vides
                     lignes_ignorees += 1
@@ -331,8 +341,7 @@ class StockFlexnetDecoder(Decoder[Stock]):
             if lignes_ignorees > 0:
                 logger.info(f"⚠ {lignes_ignorees} lignes ignorées (champs obligatoires vides)")
 
-            logger.info(f"Fichier {file_path} décodé avec succès. {len(stocks)} stocks créés.")
-            return stocks
+            logger.info(f"Fichier {file_path} décodé avec succès. {nb_crees} stocks créés.")
 
         except Exception as e:
             logger.error(f"Erreur lors du décodage du fichier {file_path}: {str(e)}")
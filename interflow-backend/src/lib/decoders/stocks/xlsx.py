@@ -1,13 +1,13 @@
 """
 Décodeur pour les stocks depuis XLSX
 """
-from typing import List, Union
+from typing import Iterator, List, Union
 from pathlib import Path
 import pandas as pd
 import logging
 from models.stock import Stock
 from models.matieres import Matiere
-from lib.decoders.decoder import Decoder
+from lib.decoders.decoder import Decoder, iter_records
 from lib.utils import parse_date
 
 logger = logging.getLogger(__name__)
@@ -116,6 +116,18 @@ class XLSXStocksDecoder(Decoder[Stock]):
         Returns:
             List[Stock]: Liste des stocks créés
         """
+        return list(self.decode_file_iter(file_path))
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[Stock]:
+        """
+        Décode un fichier XLSX en stocks, au fil de la lecture
+
+        Args:
+            file_path: Chemin vers le fichier XLSX
+
+        Returns:
+            Iterator[Stock]: Stocks créés
+        """
         try:
             if not file_path.exists():
                 raise FileNotFoundError(f"Le fichier {file_path} n'existe pas")
@@ -128,16 +140,14 @@ class XLSXStocksDecoder(Decoder[Stock]):
             df = pd.read_excel(file_path)
             logger.info(f"Fichier lu: {df.shape[0]} lignes, {df.shape[1]} colonnes")
 
-            # Convertir le DataFrame en liste de dictionnaires
-            data = df.to_dict('records')
-
-            stocks = []
+            nb_crees = 0
             lignes_ignorees = 0
 
-            for row in data:
+            for row in iter_records(df):
                 try:
                     stock = self.decode_row(row)
-                    stocks.append(stock)
+                    yield stock
+                    nb_crees += 1
                 except ValueError as e:
                     logger.warning(f"Ligne ignorée: {e}")
                     lignes_ignorees += 1
@@ -149,8 +159,7 @@ class XLSXStocksDecoder(Decoder[Stock]):
             if lignes_ignorees > 0:
                 logger.info(f"⚠ {lignes_ignorees} lignes ignorées (champs obligatoires vides)")
 
-            logger.info(f"Fichier {file_path} décodé avec succès. {len(stocks)} stocks créés.")
-            return stocks
+            logger.info(f"Fichier {file_path} décodé avec succès. {nb_crees} stocks créés.")
 
         except Exception as e:
             logger.error(f"Erreur lors du décodage du fichier {file_path}: {str(e)}")
@@ -100,7 +100,7 @@ class Besoin(BaseModel):
                 try:
                     processed_data["echeance"] = datetime.strptime(processed_data["echeance"], "%Y-%m-%d %H:%M:%S")
                 except ValueError:
-                    processed_data["echeance"] = datetime.now().replace(tzinfo=None)
+                    processed_data["echeance"] = datetime.now()
 
         # On ne passe jamais id, il sera généré automatiquement
         processed_data.pop("id", None)
@@ -115,7 +115,7 @@ class Besoin(BaseModel):
             return cls(
                 matiere=processed_data.get("matiere", Matiere(code_mp="UNKNOWN", nom="Matière inconnue")),
                 quantite=processed_data.get("quantite", 0.0),
-                echeance=processed_data.get("echeance", datetime.now().replace(tzinfo=None)),
+                echeance=processed_data.get("echeance", datetime.now()),
                 etat=processed_data.get("etat", Etat.INCONNU),
                 lot=processed_data.get("lot", "")
             )
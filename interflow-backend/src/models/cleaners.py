@@ -0,0 +1,47 @@
+"""
+Validateurs partagés entre les modèles pour le nettoyage des champs texte
+"""
+import sys
+from typing import Any, Optional
+
+_NAN_VALUES = frozenset(('nan', 'none', 'null', ''))
+
+
+def make_nan_cleaner(default: Optional[str] = None):
+    """
+    Construit un validateur (mode 'before') qui nettoie les champs string
+
+    Args:
+        default: Valeur retournée pour None, NaN et les chaînes vides
+
+    Returns:
+        La fonction de validation à enregistrer avec field_validator
+    """
+    def clean_string_fields(cls, v: Any) -> Optional[str]:
+        """Nettoie les champs string pour gérer les valeurs NaN"""
+        if v is None:
+            return default
+
+        value_str = v.strip() if isinstance(v, str) else str(v).strip()
+        if value_str.lower() in _NAN_VALUES:
+            return default
+
+        return value_str
+
+    return clean_string_fields
+
+
+def intern_string(cls, v: Optional[str]) -> Optional[str]:
+    """
+    Validateur (mode 'after') qui internalise les champs texte à faible cardinalité
+
+    Les lignes partagent alors une seule chaîne par valeur distincte (magasin,
+    statut...) : moins de mémoire et des comparaisons d'égalité par identité.
+
+    Args:
+        v: Valeur validée du champ
+
+    Returns:
+        La chaîne internalisée (ou None)
+    """
+    return sys.intern(v) if v is not None else None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import List, Optional
+from models.cleaners import make_nan_cleaner
 
 
 class ProduitRappatriement(BaseModel):
@@ -76,56 +77,11 @@ class ProduitRappatriement(BaseModel):
 
         return value_str.lower() == 'pour prlvm'
 
-    @field_validator('code_prdt', 'designation_prdt', 'lot', 'dimension_palettes',
-                    'code_onu', 'grp_emballage', 'po', mode='before')
-    @classmethod
-    def clean_string_fields(cls, v):
-        """Nettoie les champs string pour gérer les valeurs NaN"""
-        if v is None:
-            return "" if 'po' not in cls.__name__ else None
-
-        # Si c'est déjà une string valide, la garder
-        if isinstance(v, str):
-            value_str = v.strip()
-            if value_str.lower() in ['nan', 'none', 'null', '']:
-                return "" if 'po' not in cls.__name__ else None
-            return value_str
-
-        # Si c'est un float NaN, retourner valeur par défaut
-        if isinstance(v, float) and str(v).lower() == 'nan':
-            return "" if 'po' not in cls.__name__ else None
-
-        # Convertir en string et nettoyer
-        value_str = str(v).strip()
-        if value_str.lower() in ['nan', 'none', 'null', '']:
-            return "" if 'po' not in cls.__name__ else None
-
-        return value_str
-
-    @field_validator('type_emballage', mode='before')
-    @classmethod
-    def normalize_type_emballage(cls, v):
-        """Normalise le type d'emballage"""
-        if v is None:
-            return ""
-
-        # Si c'est déjà une string valide, la nettoyer
-        if isinstance(v, str):
-            value_str = v.strip()
-            if value_str.lower() in ['nan', 'none', 'null', '']:
-                return ""
-            return value_str
-
-        # Si c'est un float NaN, retourner vide
-        if isinstance(v, float) and str(v).lower() == 'nan':
-            return ""
-
-        # Convertir en string et nettoyer
-        value_str = str(v).strip()
-        if value_str.lower() in ['nan', 'none', 'null', '']:
-            return ""
-
-        return value_str
+    # Nettoie les champs string (et le type d'emballage) pour gérer les valeurs NaN
+    clean_string_fields = field_validator(
+        'code_prdt', 'designation_prdt', 'lot', 'type_emballage', 'dimension_palettes',
+        'code_onu', 'grp_emballage', 'po', mode='before'
+    )(make_nan_cleaner(""))
 
     @field_validator('stock_solde', mode='before')
     @classmethod
@@ -162,31 +118,11 @@ class Rappatriement(BaseModel):
     produits: List[ProduitRappatriement] = Field(default_factory=list, description="Liste des produits")
     remarques: Optional[str] = Field(None, description="Remarques")
 
-    @field_validator('numero_transfert', 'responsable_diffusion', 'contacts', 'adresse_destinataire',
-                    'adresse_enlevement', 'remarques', mode='before')
-    @classmethod
-    def clean_string_fields(cls, v):
-        """Nettoie les champs string pour gérer les valeurs NaN"""
-        if v is None:
-            return "" if 'remarques' not in cls.__name__ else None
-
-        # Si c'est déjà une string valide, la garder
-        if isinstance(v, str):
-            value_str = v.strip()
-            if value_str.lower() in ['nan', 'none', 'null', '']:
-                return "" if 'remarques' not in cls.__name__ else None
-            return value_str
-
-        # Si c'est un float NaN, retourner valeur par défaut
-        if isinstance(v, float) and str(v).lower() == 'nan':
-            return "" if 'remarques' not in cls.__name__ else None
-
-        # Convertir en string et nettoyer
-        value_str = str(v).strip()
-        if value_str.lower() in ['nan', 'none', 'null', '']:
-            return "" if 'remarques' not in cls.__name__ else None
-
-        return value_str
+    # Nettoie les champs string pour gérer les valeurs NaN
+    clean_string_fields = field_validator(
+        'numero_transfert', 'responsable_diffusion', 'contacts', 'adresse_destinataire',
+        'adresse_enlevement', 'remarques', mode='before'
+    )(make_nan_cleaner(""))
 
     def ajouter_produit(self, produit: ProduitRappatriement):
         """
@@ -233,6 +169,9 @@ class Rappatriement(BaseModel):
         """
         Désérialise un dictionnaire en modèle
         """
+        # Copie du dictionnaire pour éviter de modifier l'original
+        data = data.copy()
+
         # Convertir les dates si elles existent en s'assurant qu'elles sont naive
         if data.get('date_derniere_maj'):
             date_derniere_maj = datetime.fromisoformat(data['date_derniere_maj'])
@@ -1,8 +1,21 @@
 from pydantic import BaseModel, Field, field_validator
 from models.matieres import Matiere
+from models.cleaners import intern_string, make_nan_cleaner
 from datetime import datetime
 from enum import Enum
 from typing import List, Dict, Any, Optional, Iterator
+import logging
+import sys
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_uuid4 = uuid.uuid4
+
+
+def _yyyymmdd(d: datetime) -> str:
+    """Formate une date en YYYYMMDD sans passer par strftime"""
+    return f"{d.year:04d}{d.month:02d}{d.day:02d}"
 
 
 class EtatReception(Enum):
@@ -16,6 +29,22 @@ class TypeReception(Enum):
     PRESTATAIRE = "prestataire"
     INTERNE = "interne"
 
+# Valeurs sérialisées des enums, calculées une seule fois pour model_dump
+_TYPE_V = {t: sys.intern(t.value) for t in TypeReception}
+_ETAT_V = {e: sys.intern(e.value) for e in EtatReception}
+
+# Correspondance statut d'ordre (en majuscules) -> état unifié des réceptions internes
+_STATUT_ETAT = {
+    "RELÂCHÉ": EtatReception.RELACHE,
+    "RELACHE": EtatReception.RELACHE,
+    "EN_ATTENTE": EtatReception.EN_ATTENTE,
+    "EN ATTENTE": EtatReception.EN_ATTENTE,
+    "TERMINÉ": EtatReception.TERMINEE,
+    "TERMINE": EtatReception.TERMINEE,
+    "ANNULÉ": EtatReception.ANNULEE,
+    "ANNULE": EtatReception.ANNULEE,
+}
+
 class Reception(BaseModel):
     id: Optional[str] = Field(None, description="Identifiant unique de la réception (généré automatiquement)")
     type: TypeReception = Field(TypeReception.PRESTATAIRE, description="Type de réception")
@@ -74,79 +103,49 @@ class Reception(BaseModel):
         except ValueError:
             return None if 'quantite_ordre' in cls.__name__ or 'quantite_receptionnee' in cls.__name__ else 0.0
 
-    @field_validator('ordre', 'type_ordre', 'statut_ordre', 'poste', 'statut_poste', 'division',
-                    'magasin', 'article', 'libelle_article', 'ref_externe', 'description_externe',
-                    'udm', 'fournisseur', 'description_fournisseur', 'lot', mode='before')
-    @classmethod
-    def clean_string_fields(cls, v):
-        """Nettoie les champs string pour gérer les valeurs NaN"""
-        if v is None:
-            return None
-
-        # Si c'est déjà une string valide, la garder
-        if isinstance(v, str):
-            value_str = v.strip()
-            if value_str.lower() in ['nan', 'none', 'null', '']:
-                return None
-            return value_str
-
-        # Si c'est un float NaN, retourner None
-        if isinstance(v, float) and str(v).lower() == 'nan':
-            return None
+    # Nettoie les champs string pour gérer les valeurs NaN
+    clean_string_fields = field_validator(
+        'ordre', 'type_ordre', 'statut_ordre', 'poste', 'statut_poste', 'division',
+        'magasin', 'article', 'libelle_article', 'ref_externe', 'description_externe',
+        'udm', 'fournisseur', 'description_fournisseur', 'lot', mode='before'
+    )(make_nan_cleaner())
 
-        # Convertir en string et nettoyer
-        value_str = str(v).strip()
-        if value_str.lower() in ['nan', 'none', 'null', '']:
-            return None
-
-        return value_str
+    # Internalise les champs à faible cardinalité, répétés d'une réception à l'autre
+    intern_low_cardinality_fields = field_validator(
+        'type_ordre', 'statut_ordre', 'statut_poste', 'division', 'magasin', 'udm',
+        'fournisseur', 'description_fournisseur', mode='after'
+    )(intern_string)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         # Générer l'id si non fourni
         if not self.id:
-            if self.type == TypeReception.INTERNE and self.ordre and self.article:
+            if self.type is TypeReception.INTERNE and self.ordre and self.article:
                 # Utiliser ordre + article + date_reception + poste (sans heure)
-                if self.date_reception:
-                    date_str = self.date_reception.strftime("%Y%m%d")
-                    poste_str = self.poste if self.poste else "NOPOSTE"
-                    self.id = f"{self.ordre}_{self.article}_{date_str}_{poste_str}"
-                else:
-                    # Si pas de date de réception, utiliser la date de création
-                    date_str = self.date_creation.strftime("%Y%m%d")
-                    poste_str = self.poste if self.poste else "NOPOSTE"
-                    self.id = f"{self.ordre}_{self.article}_{date_str}_{poste_str}"
+                # Si pas de date de réception, utiliser la date de création
+                date_ref = self.date_reception or self.date_creation
+                self.id = "_".join((self.ordre, self.article, _yyyymmdd(date_ref), self.poste or "NOPOSTE"))
             else:
                 # Pour les réceptions prestataires, utiliser un id auto-généré
-                import uuid
-                self.id = str(uuid.uuid4())
+                self.id = _uuid4().hex
 
         # Convertir les états de réceptions internes vers l'état unifié
-        if self.type == TypeReception.INTERNE and self.statut_ordre:
-            if self.statut_ordre.upper() in ["RELÂCHÉ", "RELACHE"]:
-                self.etat = EtatReception.RELACHE
-            elif self.statut_ordre.upper() in ["EN_ATTENTE", "EN ATTENTE"]:
-                self.etat = EtatReception.EN_ATTENTE
-            elif self.statut_ordre.upper() in ["TERMINÉ", "TERMINE"]:
-                self.etat = EtatReception.TERMINEE
-            elif self.statut_ordre.upper() in ["ANNULÉ", "ANNULE"]:
-                self.etat = EtatReception.ANNULEE
-            else:
-                self.etat = EtatReception.EN_COURS
+        if self.type is TypeReception.INTERNE and self.statut_ordre:
+            self.etat = _STATUT_ETAT.get(self.statut_ordre.upper(), EtatReception.EN_COURS)
 
     def model_dump(self) -> Dict[str, Any]:
         """Sérialise le modèle en dictionnaire"""
         return {
             "id": self.id,
-            "type": self.type.value if self.type else None,
+            "type": _TYPE_V.get(self.type),
             "matiere": self.matiere.model_dump() if self.matiere else None,
             "quantite": self.quantite,
             "lot": self.lot,
             "qualification": self.qualification,
             "date_creation": self.date_creation.isoformat() if self.date_creation else None,
             "date_modification": self.date_modification.isoformat() if self.date_modification else None,
-            "etat": self.etat.value if self.etat else None,
+            "etat": _ETAT_V.get(self.etat),
             # Champs spécifiques aux réceptions internes
             "ordre": self.ordre,
             "type_ordre": self.type_ordre,
@@ -203,7 +202,7 @@ class Reception(BaseModel):
             processed_data["qualification"] = False
 
         if "date_creation" not in processed_data:
-            processed_data["date_creation"] = datetime.now().replace(tzinfo=None)
+            processed_data["date_creation"] = datetime.now()
         elif isinstance(processed_data["date_creation"], str):
             try:
                 date_creation = datetime.fromisoformat(processed_data["date_creation"])
@@ -212,10 +211,10 @@ class Reception(BaseModel):
                     date_creation = date_creation.replace(tzinfo=None)
                 processed_data["date_creation"] = date_creation
             except ValueError:
-                processed_data["date_creation"] = datetime.now().replace(tzinfo=None)
+                processed_data["date_creation"] = datetime.now()
 
         if "date_modification" not in processed_data:
-            processed_data["date_modification"] = datetime.now().replace(tzinfo=None)
+            processed_data["date_modification"] = datetime.now()
         elif isinstance(processed_data["date_modification"], str):
             try:
                 date_modification = datetime.fromisoformat(processed_data["date_modification"])
@@ -224,7 +223,7 @@ class Reception(BaseModel):
                     date_modification = date_modification.replace(tzinfo=None)
                 processed_data["date_modification"] = date_modification
             except ValueError:
-                processed_data["date_modification"] = datetime.now().replace(tzinfo=None)
+                processed_data["date_modification"] = datetime.now()
 
         # Gestion de date_reception si elle existe
         if "date_reception" in processed_data and isinstance(processed_data["date_reception"], str):
@@ -262,8 +261,8 @@ class Reception(BaseModel):
         # Création de l'instance
         try:
             return cls(**processed_data)
-        except Exception as e:
-            print(f"Erreur lors de la création de la réception: {e}")
+        except Exception:
+            logger.exception("Erreur lors de la création de la réception")
             # En dernier recours, créer une réception avec des valeurs par défaut
             return cls(
                 id=None,  # Sera généré automatiquement
@@ -271,7 +270,7 @@ class Reception(BaseModel):
                 quantite=0,
                 lot="",
                 qualification=False,
-                date_creation=datetime.now().replace(tzinfo=None),
-                date_modification=datetime.now().replace(tzinfo=None),
+                date_creation=datetime.now(),
+                date_modification=datetime.now(),
                 etat=EtatReception.EN_COURS
             )
@@ -1,9 +1,13 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from typing import Optional, List, Iterator, Union
 from datetime import datetime
 from models.matieres import Matiere
+from models.cleaners import intern_string, make_nan_cleaner
 
 class Stock(BaseModel):
+    # Le schéma est construit à la première validation plutôt qu'à l'import
+    model_config = ConfigDict(arbitrary_types_allowed=False, defer_build=True)
+
     id: Optional[str] = Field(None, description="Identifiant unique du stock (généré automatiquement)")
     article: str = Field(..., description="Code de l'article")
     libelle_article: str = Field(..., description="Libellé de l'article")
@@ -78,30 +82,16 @@ class Stock(BaseModel):
         except ValueError:
             return None if 'capacite' in cls.__name__ else 0.0
 
-    @field_validator('restriction', 'classification', 'commentaire', 'du', mode='before')
-    @classmethod
-    def clean_string_fields(cls, v):
-        """Nettoie les champs string pour gérer les valeurs NaN"""
-        if v is None:
-            return None
-
-        # Si c'est déjà une string valide, la garder
-        if isinstance(v, str):
-            value_str = v.strip()
-            if value_str.lower() in ['nan', 'none', 'null', '']:
-                return None
-            return value_str
+    # Nettoie les champs string pour gérer les valeurs NaN
+    clean_string_fields = field_validator(
+        'restriction', 'classification', 'commentaire', 'du', mode='before'
+    )(make_nan_cleaner())
 
-        # Si c'est un float NaN, retourner None
-        if isinstance(v, float) and str(v).lower() == 'nan':
-            return None
-
-        # Convertir en string et nettoyer
-        value_str = str(v).strip()
-        if value_str.lower() in ['nan', 'none', 'null', '']:
-            return None
-
-        return value_str
+    # Internalise les champs à faible cardinalité, répétés d'un stock à l'autre
+    intern_low_cardinality_fields = field_validator(
+        'udm', 'statut_lot', 'division', 'magasin', 'statut_proprete', 'reutilisable',
+        'statut_contenant', mode='after'
+    )(intern_string)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -112,6 +102,20 @@ class Stock(BaseModel):
         # Générer une clé primaire composite basée sur le tuple unique
         self.id = f"{self.article}_{self.magasin}_{self.emplacement}_{self.contenant}"
 
+    @property
+    def est_exclu(self) -> bool:
+        """Stock du magasin 30, exclu des vues de stock"""
+        return self.magasin == "30"
+
+    @property
+    def est_externe(self) -> bool:
+        """Stock d'un magasin externe (code commençant par "EX")"""
+        return self.magasin.startswith("EX")
+
     @classmethod
     def from_model_dump(cls, data: dict):
         return cls(**data)
+
+
+# Adaptateur réutilisé pour valider une liste de stocks en un seul appel
+STOCK_LIST_ADAPTER = TypeAdapter(List[Stock])
@@ -7,7 +7,14 @@ from .receptions_repository import ReceptionsRepository
 from .stocks_repository import StocksRepository
 from .matieres_premieres_repository import MatieresPremieresRepository
 from .rappatriements_repository import RappatriementsRepository
-from .storage_strategies import JSONStorageStrategy, CSVStorageStrategy, SQLiteStorageStrategy, S3StorageStrategy
+from .storage_strategies import (
+    JSONStorageStrategy,
+    MsgPackStorageStrategy,
+    CSVStorageStrategy,
+    SQLiteStorageStrategy,
+    SQLiteRappatriementsStorageStrategy,
+    S3StorageStrategy,
+)
 
 __all__ = [
     'BesoinsRepository',
@@ -16,7 +23,9 @@ __all__ = [
     'MatieresPremieresRepository',
     'RappatriementsRepository',
     'JSONStorageStrategy',
+    'MsgPackStorageStrategy',
     'CSVStorageStrategy',
     'SQLiteStorageStrategy',
+    'SQLiteRappatriementsStorageStrategy',
     'S3StorageStrategy',
 ]
@@ -1,7 +1,16 @@
 """
 Repository de base avec pattern Strategy pour le stockage
 """
-from typing import TypeVar, Generic, List, Optional, Dict, Any
+from typing import TypeVar, Generic, List, Optional, Dict, Any, Iterable, Iterator, Callable, Tuple, Sequence
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import threading
+from bisect import bisect_right
+from operator import attrgetter
+import numpy as np
+from pydantic import TypeAdapter
 from models.matieres import Matiere
 from models.besoin import Besoin
 from models.stock import Stock
@@ -9,8 +18,36 @@ from models.reception import Reception
 import csv
 from pathlib import Path
 from lib.decoders.decoder import Decoder
+from lib.paths import get_repository_file
+
+logger = logging.getLogger(__name__)
+
+# Séparateur des clés concaténées pour la recherche partielle (absent des noms)
+_SEPARATEUR_CLES = "\x00"
 
 T = TypeVar('T')
+V = TypeVar('V')
+
+# Balayages vectorisés par tranches : les opérations NumPy relâchent le GIL, les
+# tranches d'un même masque sont donc calculées en parallèle par ce pool, créé au
+# premier balayage assez grand pour en profiter
+_SCAN_WORKERS = os.cpu_count() or 1
+_scanner: Optional[ThreadPoolExecutor] = None
+_scanner_lock = threading.Lock()
+# Nombre de lignes en dessous duquel le masque est calculé d'un seul bloc
+PARALLEL_SCAN_MIN_ROWS = 200_000
+# Les tranches commencent sur un multiple de cette taille (une ligne de cache de booléens)
+_SCAN_ALIGNEMENT = 64
+
+
+def _get_scanner() -> ThreadPoolExecutor:
+    """Retourne le pool des balayages par tranches, créé au premier appel"""
+    global _scanner
+    with _scanner_lock:
+        if _scanner is None:
+            _scanner = ThreadPoolExecutor(max_workers=_SCAN_WORKERS, thread_name_prefix="repository-scan")
+        return _scanner
+
 
 class BaseRepository(Generic[T]):
     """
@@ -27,105 +64,303 @@ class BaseRepository(Generic[T]):
             id_field: Nom du champ ID
         """
         self.model_class = model_class
+        self._adapter = TypeAdapter(List[model_class])
         self.storage = storage
         self.id_field = id_field
+        self._file_path = str(get_repository_file(f"{model_class.__name__.lower()}s"))
         self.data: List[T] = []
+        self._autocommit = True
+        self._dirty = False
+        self._index: Dict[Any, T] = {}
+        self._pos: Dict[Any, int] = {}
+        self._generation = 0
+        self._derived_cache: Dict[str, Tuple[int, Any]] = {}
         self._load_data()
 
     def _get_file_path(self) -> str:
         """Retourne le chemin du fichier de données"""
-        from lib.paths import get_repository_file
-        model_name = self.model_class.__name__.lower()
-        return str(get_repository_file(f"{model_name}s"))
+        return self._file_path
 
     def _load_data(self) -> None:
         """Charge les données depuis le stockage"""
         try:
-            file_path = self._get_file_path()
-            raw_data = self.storage.load(file_path)
-            self.data = [self.model_class.from_model_dump(item) for item in raw_data]
+            raw_data = self.storage.load(self._file_path)
+            self.data = self._decode_items(raw_data)
         except FileNotFoundError:
             self.data = []
         except Exception as e:
-            print(f"Erreur lors du chargement des données: {e}")
+            logger.error("Erreur lors du chargement des données: %s", e)
             self.data = []
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Reconstruit l'index ID -> élément et ID -> position (première occurrence)"""
+        self._index = {}
+        self._pos = {}
+        for pos, item in enumerate(self.data):
+            item_id = getattr(item, self.id_field)
+            if item_id not in self._index:
+                self._index[item_id] = item
+                self._pos[item_id] = pos
+        self._mark_changed()
+
+    def _append(self, item: T) -> None:
+        """Ajoute un élément à la liste en maintenant les index"""
+        item_id = getattr(item, self.id_field)
+        if item_id not in self._index:
+            self._index[item_id] = item
+            self._pos[item_id] = len(self.data)
+        self.data.append(item)
+        self._mark_changed()
+
+    def _extend(self, items: List[T]) -> None:
+        """Ajoute des éléments en bloc sans contrôle de doublon (index reconstruit une seule fois)"""
+        self.data.extend(items)
+        self._rebuild_index()
+
+    def _mark_changed(self) -> None:
+        """Invalide les structures dérivées des données (index secondaires...)"""
+        self._generation += 1
+
+    def _derived(self, name: str, builder: Callable[[], Any]) -> Any:
+        """
+        Retourne une structure dérivée des données, recalculée seulement après une modification
+
+        Args:
+            name: Nom de la structure dans le cache
+            builder: Fonction construisant la structure à partir de self.data
+
+        Returns:
+            La structure en cache pour l'état courant des données
+        """
+        cached = self._derived_cache.get(name)
+        if cached is None or cached[0] != self._generation:
+            cached = (self._generation, builder())
+            self._derived_cache[name] = cached
+        return cached[1]
+
+    def _group_by(self, key: Callable[[T], Any]) -> Dict[Any, List[T]]:
+        """Groupe les éléments selon une clé, en conservant l'ordre des données"""
+        groups: Dict[Any, List[T]] = {}
+        for item in self.data:
+            groups.setdefault(key(item), []).append(item)
+        return groups
+
+    def _positions_par_tranches(self, n: int, masque_tranche: Callable[[slice], np.ndarray]) -> np.ndarray:
+        """
+        Positions des lignes retenues par un masque vectorisé, calculé par tranches en parallèle
+
+        En dessous de PARALLEL_SCAN_MIN_ROWS lignes, le masque est calculé d'un seul bloc.
+        masque_tranche ne doit lire que des structures déjà construites (pas de _derived).
+
+        Args:
+            n: Nombre de lignes de la vue en colonnes
+            masque_tranche: Calcule le masque booléen des lignes d'une tranche
+
+        Returns:
+            np.ndarray: Positions croissantes dans self.data
+        """
+        if n < PARALLEL_SCAN_MIN_ROWS or _SCAN_WORKERS < 2:
+            return np.flatnonzero(masque_tranche(slice(0, n)))
+
+        taille = -(-n // _SCAN_WORKERS)
+        taille += -taille % _SCAN_ALIGNEMENT
+        tranches = [slice(debut, min(debut + taille, n)) for debut in range(0, n, taille)]
+        return np.flatnonzero(np.concatenate(list(_get_scanner().map(masque_tranche, tranches))))
+
+    def _cles_contenant(self, name: str, valeurs: Dict[Optional[str], V], recherche: str) -> List[V]:
+        """
+        Valeurs des clés d'une table dont la version en minuscules contient le texte recherché
+
+        Les clés en minuscules sont concaténées une seule fois (structure dérivée) et le texte
+        y est cherché par str.find, en C : seules les occurrences sont traitées en Python,
+        au lieu d'un test par clé à chaque requête.
+
+        Args:
+            name: Nom de la structure dans le cache
+            valeurs: Table clé -> valeur (code de la vue en colonnes, groupe d'un index...) ;
+                une clé None ne correspond à rien
+            recherche: Texte recherché, déjà en minuscules
+
+        Returns:
+            List[V]: Valeurs des clés correspondantes, dans l'ordre de la table
+        """
+        if not recherche or _SEPARATEUR_CLES in recherche:
+            return [valeur for cle, valeur in valeurs.items() if cle is not None and recherche in cle.lower()]
+
+        def build() -> Tuple[str, List[int], List[V]]:
+            cles = [(cle.lower(), valeur) for cle, valeur in valeurs.items() if cle is not None]
+            debuts = []
+            debut = 0
+            for cle, _ in cles:
+                debuts.append(debut)
+                debut += len(cle) + 1
+            return _SEPARATEUR_CLES.join(cle for cle, _ in cles), debuts, [valeur for _, valeur in cles]
+        texte, debuts, valeurs_cles = self._derived(name, build)
+
+        trouves = []
+        pos = texte.find(recherche)
+        while pos != -1:
+            i = bisect_right(debuts, pos) - 1
+            trouves.append(valeurs_cles[i])
+            if i + 1 == len(debuts):
+                break
+            # Reprendre à la clé suivante : une clé n'est retenue qu'une fois
+            pos = texte.find(recherche, debuts[i + 1])
+        return trouves
+
+    def _decode_items(self, raw_data: List[Dict[str, Any]]) -> List[T]:
+        """Convertit les enregistrements bruts du stockage en modèles"""
+        return [self.model_class.from_model_dump(item) for item in raw_data]
 
     def _save_data(self) -> None:
-        """Sauvegarde les données vers le stockage"""
+        """Sauvegarde les données vers le stockage (différée à l'intérieur d'un bloc bulk())"""
+        if not self._autocommit:
+            self._dirty = True
+            return
+        self._write_data()
+
+    def _write_data(self) -> None:
+        """Écrit toutes les données vers le stockage"""
         try:
-            file_path = self._get_file_path()
-            raw_data = [item.model_dump() for item in self.data]
-            self.storage.save(raw_data, file_path)
+            self.storage.save_models(self.data, self._adapter, self._file_path)
+            self._dirty = False
         except Exception as e:
-            print(f"Erreur lors de la sauvegarde: {e}")
+            logger.error("Erreur lors de la sauvegarde: %s", e)
+
+    def commit(self) -> None:
+        """Écrit les modifications en attente s'il y en a"""
+        if self._dirty:
+            self._write_data()
+
+    @contextmanager
+    def bulk(self) -> Iterator['BaseRepository[T]']:
+        """
+        Regroupe les modifications : une seule sauvegarde en sortie de bloc
+
+        Exemple:
+            with repo.bulk():
+                for item in items:
+                    repo.create(item)
+        """
+        previous = self._autocommit
+        self._autocommit = False
+        try:
+            yield self
+        finally:
+            self._autocommit = previous
+            if previous:
+                self.commit()
 
     def get_all(self) -> List[T]:
         """Récupère tous les éléments"""
         return self.data.copy()
 
+    def _get_all_view(self) -> Sequence[T]:
+        """Accès en lecture seule à tous les éléments, sans copie (usage interne)"""
+        return self.data
+
     def get_by_id(self, id_value: Any) -> Optional[T]:
         """Récupère un élément par son ID"""
-        for item in self.data:
-            if getattr(item, self.id_field) == id_value:
-                return item
-        return None
+        return self._index.get(id_value)
 
     def create(self, item: T) -> T:
         """Crée un nouvel élément"""
         # Vérifier si l'ID existe déjà
         item_id = getattr(item, self.id_field)
-        if item_id and self.get_by_id(item_id):
+        if item_id and item_id in self._index:
             raise ValueError(f"Un élément avec l'ID {item_id} existe déjà")
 
-        self.data.append(item)
+        self._append(item)
         self._save_data()
         return item
 
+    def create_many(self, items: Iterable[T]) -> List[T]:
+        """
+        Crée plusieurs éléments avec une seule sauvegarde
+
+        Les ID sont vérifiés avant tout ajout : en cas de doublon, aucun
+        élément n'est créé.
+
+        Args:
+            items: Éléments à créer
+
+        Returns:
+            List[T]: Les éléments créés
+        """
+        items = list(items)
+        seen = set()
+        for item in items:
+            item_id = getattr(item, self.id_field)
+            if item_id and (item_id in self._index or item_id in seen):
+                raise ValueError(f"Un élément avec l'ID {item_id} existe déjà")
+            seen.add(item_id)
+
+        if items:
+            self._extend(items)
+            self._save_data()
+        return items
+
     def update(self, id_value: Any, updated_item: T) -> Optional[T]:
         """Met à jour un élément"""
-        for i, item in enumerate(self.data):
-            if getattr(item, self.id_field) == id_value:
-                self.data[i] = updated_item
-                self._save_data()
-                return updated_item
-        return None
+        pos = self._pos.get(id_value)
+        if pos is None:
+            return None
+
+        self.data[pos] = updated_item
+        if getattr(updated_item, self.id_field) == id_value:
+            self._index[id_value] = updated_item
+            self._mark_changed()
+        else:
+            # L'ID a changé : les index doivent être recalculés
+            self._rebuild_index()
+        self._save_data()
+        return updated_item
 
     def delete(self, id_value: Any) -> bool:
         """Supprime un élément"""
-        for i, item in enumerate(self.data):
-            if getattr(item, self.id_field) == id_value:
-                del self.data[i]
-                self._save_data()
-                return True
-        return False
+        pos = self._pos.get(id_value)
+        if pos is None:
+            return False
+
+        del self.data[pos]
+        self._rebuild_index()
+        self._save_data()
+        return True
 
     def filter(self, **kwargs) -> List[T]:
-        """Filtre les éléments selon les critères"""
-        filtered_data = self.data
+        """
+        Filtre les éléments selon les critères (égalité sur chaque attribut, None = ignoré)
 
-        for key, value in kwargs.items():
-            if value is not None:
-                filtered_data = [
-                    item for item in filtered_data
-                    if hasattr(item, key) and getattr(item, key) == value
-                ]
+        Raises:
+            AttributeError: Si un critère ne correspond à aucun attribut du modèle
+        """
+        predicats = [(attrgetter(key), value) for key, value in kwargs.items() if value is not None]
+        if not predicats:
+            return self.data.copy()
 
-        return filtered_data
+        return [
+            item for item in self.data
+            if all(accesseur(item) == value for accesseur, value in predicats)
+        ]
 
     def flush(self) -> None:
         """Vide toutes les données et sauvegarde la liste vide"""
         self.data = []
+        self._rebuild_index()
         self._save_data()  # Sauvegarder la liste vide
         self.storage.flush()
         print(f"✓ Repository {self.model_class.__name__} vidé avec succès")
 
-    def import_from_file(self, file_path: str, decoder_class: Decoder) -> None:
+    def import_from_file(self, file_path: str, decoder_class: Decoder, skip_dedup: bool = False) -> None:
         """
         Importe les données depuis un fichier (CSV ou XLSX)
 
         Args:
             file_path: Chemin vers le fichier à importer
             decoder_class: Classe du décodeur à utiliser
+            skip_dedup: Ajoute les éléments sans vérifier les ID existants
+                (chargement initial d'un repository vide)
         """
         try:
             file_extension = Path(file_path).suffix.lower()
@@ -138,19 +373,20 @@ class BaseRepository(Generic[T]):
             # Convertir le chemin en Path
             file_path_obj = Path(file_path)
 
-            # Décoder selon le type de fichier
+            # Décoder selon le type de fichier ; decode_file_iter produit les éléments au fil
+            # de la lecture, sans matérialiser la liste complète des lignes décodées
             if file_extension == '.csv':
                 if 'csv_path' in sig.parameters:
                     decoded_items = decoder.decode_file([], csv_path=file_path)
                 else:
-                    decoded_items = decoder.decode_file(file_path_obj)
+                    decoded_items = decoder.decode_file_iter(file_path_obj)
 
             elif file_extension == '.xlsx':
                 try:
                     if 'xlsx_path' in sig.parameters:
                         decoded_items = decoder.decode_file([], xlsx_path=file_path)
                     else:
-                        decoded_items = decoder.decode_file(file_path_obj)
+                        decoded_items = decoder.decode_file_iter(file_path_obj)
 
                 except ImportError:
                     raise ImportError("pandas requis pour XLSX. Installez: pip install pandas openpyxl")
@@ -160,36 +396,64 @@ class BaseRepository(Generic[T]):
                 raise ValueError(f"Type de fichier non supporté: {file_extension}. Utilisez .csv ou .xlsx")
 
             # Ajouter les éléments décodés
-            items_added = 0
-            items_ignored = 0
+            self._import_items(decoded_items, file_path, skip_dedup)
 
-            for item in decoded_items:
-                try:
-                    item_id = getattr(item, self.id_field)
-                    if item_id and self.get_by_id(item_id):
-                        items_ignored += 1
-                        continue
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Fichier non trouvé: {file_path}")
+        except Exception as e:
+            logger.error("Erreur lors de l'import: %s", e)
+            raise e
+
+    def _import_items(self, items: Iterable[T], source: str, skip_dedup: bool = False) -> None:
+        """
+        Ajoute des éléments importés et sauvegarde une seule fois
 
-                    self.data.append(item)
-                    items_added += 1
+        L'import est atomique : les éléments sont d'abord tous décodés et triés
+        (nouveaux / déjà existants), puis ajoutés en une fois. Une erreur de lecture
+        en cours de fichier laisse donc le repository inchangé.
 
-                except Exception as e:
-                    print(f"Erreur lors de l'import de l'élément: {e}")
+        Args:
+            items: Éléments décodés (liste ou itérateur consommé au fil de l'ajout)
+            source: Fichier d'origine (pour le message de fin)
+            skip_dedup: Ajoute les éléments sans vérifier les ID existants
+        """
+        if skip_dedup:
+            items = list(items)
+            self._extend(items)
+            self._save_data()
+            print(f"✓ {len(items)} éléments importés depuis {source}")
+            return
+
+        nouveaux: List[T] = []
+        ids_nouveaux = set()
+        items_ignored = 0
+
+        # Première phase : décoder et trier sans modifier le repository
+        for item in items:
+            try:
+                item_id = getattr(item, self.id_field)
+                if item_id and (item_id in self._index or item_id in ids_nouveaux):
+                    items_ignored += 1
                     continue
 
-            # Sauvegarder si des éléments ont été ajoutés
-            if items_added > 0:
-                self._save_data()
+                if item_id:
+                    ids_nouveaux.add(item_id)
+                nouveaux.append(item)
 
-            print(f"✓ {items_added} éléments importés depuis {file_path}")
-            if items_ignored > 0:
-                print(f"⚠ {items_ignored} éléments ignorés (déjà existants)")
+            except Exception as e:
+                logger.warning("Erreur lors de l'import de l'élément: %s", e)
+                continue
 
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Fichier non trouvé: {file_path}")
-        except Exception as e:
-            print(f"Erreur lors de l'import: {e}")
-            raise e
+        # Seconde phase : ajout en bloc et une seule sauvegarde
+        if nouveaux:
+            with self.bulk():
+                for item in nouveaux:
+                    self._append(item)
+                self._save_data()
+
+        print(f"✓ {len(nouveaux)} éléments importés depuis {source}")
+        if items_ignored > 0:
+            print(f"⚠ {items_ignored} éléments ignorés (déjà existants)")
 
     def import_from_csv(self, csv_path: str, decoder_class: Decoder) -> None:
         """Importe depuis CSV (compatibilité)"""
@@ -208,4 +472,4 @@ class BaseRepository(Generic[T]):
 
     def exists(self, id_value: Any) -> bool:
         """Vérifie si un élément existe"""
-        return self.get_by_id(id_value) is not None
+        return self._index.get(id_value) is not None
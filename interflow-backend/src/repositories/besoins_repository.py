@@ -1,21 +1,177 @@
 """
 Repository pour les besoins
 """
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, NamedTuple, Tuple, TYPE_CHECKING
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from operator import attrgetter, contains, eq, ge, is_, le
+import numpy as np
 from repositories.base_repository import BaseRepository
 from repositories.storage_strategies import StorageStrategy
 from models.besoin import Besoin, Etat
 
+if TYPE_CHECKING:
+    from repositories.matieres_premieres_repository import MatieresPremieresRepository
+
+# Code entier de chaque état dans la vue en colonnes
+_ETAT_CODES: Dict[Etat, int] = {etat: code for code, etat in enumerate(Etat)}
+
+
+class _ColonnesBesoins(NamedTuple):
+    """Vue en colonnes des besoins (une ligne par besoin, dans l'ordre du repository)"""
+    echeance: np.ndarray  # datetime64[us]
+    quantite: np.ndarray  # float64
+    etat: np.ndarray  # int8, codes de _ETAT_CODES
+    code_mp: np.ndarray  # int32, codes de codes_mp
+    nom: np.ndarray  # int32, codes de noms
+    lot: np.ndarray  # int32, codes de lots
+    codes_mp: Dict[str, int]
+    noms: Dict[str, int]
+    lots: Dict[str, int]
+
 
 class BesoinsRepository(BaseRepository[Besoin]):
     """
     Repository pour les besoins avec méthodes métier spécifiques
     """
 
-    def __init__(self, storage: StorageStrategy):
+    def __init__(self, storage: StorageStrategy, matieres_repo: Optional["MatieresPremieresRepository"] = None):
+        """
+        Args:
+            storage: Stratégie de stockage
+            matieres_repo: Repository des matières dont la table d'internement est partagée
+                (les besoins d'une même matière pointent alors vers une seule instance)
+        """
+        self._matieres_repo = matieres_repo
         super().__init__(Besoin, storage, id_field="id")
 
+    def _partager_matiere(self, besoin: Besoin) -> Besoin:
+        """Remplace la matière du besoin par l'instance internalisée"""
+        if self._matieres_repo is not None:
+            besoin.matiere = self._matieres_repo.intern_matiere(besoin.matiere)
+        return besoin
+
+    def _decode_items(self, raw_data: List[Dict[str, Any]]) -> List[Besoin]:
+        """Convertit les enregistrements bruts en besoins partageant leurs matières"""
+        return [self._partager_matiere(besoin) for besoin in super()._decode_items(raw_data)]
+
+    def _append(self, item: Besoin) -> None:
+        """Ajoute un besoin (créé ou importé) en partageant sa matière"""
+        super()._append(self._partager_matiere(item))
+
+    def _extend(self, items: List[Besoin]) -> None:
+        """Ajoute des besoins en bloc en partageant leurs matières"""
+        super()._extend([self._partager_matiere(besoin) for besoin in items])
+
+    def _get_index_by_etat(self) -> Dict[Etat, List[Besoin]]:
+        """Index secondaire des besoins par état"""
+        return self._derived("by_etat", lambda: self._group_by(attrgetter('etat')))
+
+    def _get_index_by_code_mp(self) -> Dict[str, List[Besoin]]:
+        """Index secondaire des besoins par code matière première"""
+        return self._derived("by_code_mp", lambda: self._group_by(attrgetter('matiere.code_mp')))
+
+    def _get_index_by_echeance(self) -> Dict[Etat, Tuple[List[datetime], List[Besoin]]]:
+        """Index secondaire : pour chaque état, les besoins triés par échéance et la liste des échéances"""
+        def build() -> Dict[Etat, Tuple[List[datetime], List[Besoin]]]:
+            index = {}
+            for etat, besoins in self._get_index_by_etat().items():
+                tries = sorted(besoins, key=attrgetter('echeance'))
+                index[etat] = ([b.echeance for b in tries], tries)
+            return index
+        return self._derived("by_echeance", build)
+
+    def _get_noms_minuscules(self) -> Dict[str, str]:
+        """Correspondance nom de matière -> nom en minuscules, pour la recherche partielle"""
+        return self._derived("noms_minuscules",
+                             lambda: {b.matiere.nom: b.matiere.nom.lower() for b in self._get_all_view()})
+
+    def _get_colonnes(self) -> _ColonnesBesoins:
+        """Vue en colonnes (tableaux NumPy) des besoins, recalculée après modification"""
+        def build() -> _ColonnesBesoins:
+            besoins = self._get_all_view()
+            n = len(besoins)
+            codes_mp: Dict[str, int] = {}
+            noms: Dict[str, int] = {}
+            lots: Dict[str, int] = {}
+            return _ColonnesBesoins(
+                echeance=np.array([b.echeance for b in besoins], dtype="datetime64[us]"),
+                quantite=np.fromiter((b.quantite for b in besoins), dtype=np.float64, count=n),
+                etat=np.fromiter((_ETAT_CODES[b.etat] for b in besoins), dtype=np.int8, count=n),
+                code_mp=np.fromiter((codes_mp.setdefault(b.matiere.code_mp, len(codes_mp)) for b in besoins),
+                                    dtype=np.int32, count=n),
+                nom=np.fromiter((noms.setdefault(b.matiere.nom, len(noms)) for b in besoins),
+                                dtype=np.int32, count=n),
+                lot=np.fromiter((lots.setdefault(b.lot, len(lots)) for b in besoins), dtype=np.int32, count=n),
+                codes_mp=codes_mp,
+                noms=noms,
+                lots=lots,
+            )
+        return self._derived("colonnes", build)
+
+    def _indices_par_colonnes(self,
+                              nom_matiere: Optional[str] = None,
+                              date_debut: Optional[datetime] = None,
+                              date_fin: Optional[datetime] = None,
+                              quantite_min: Optional[float] = None,
+                              quantite_max: Optional[float] = None,
+                              lot: Optional[str] = None) -> np.ndarray:
+        """
+        Positions des besoins satisfaisant les critères, calculées par masque vectorisé
+
+        Returns:
+            np.ndarray: Positions croissantes dans self.data
+        """
+        colonnes = self._get_colonnes()
+
+        # Valeurs des critères traduites une fois pour toutes (codes, dates NumPy)
+        codes_noms = None
+        if nom_matiere is not None:
+            codes_noms = self._cles_contenant("texte_noms", colonnes.noms, nom_matiere.lower())
+        debut = np.datetime64(date_debut, "us") if date_debut is not None else None
+        fin = np.datetime64(date_fin, "us") if date_fin is not None else None
+        # Un lot absent n'a pas de code : aucune ligne ne correspond
+        code_lot = colonnes.lots.get(lot, -1) if lot is not None else None
+
+        def masque_tranche(tranche: slice) -> np.ndarray:
+            masque = np.ones(tranche.stop - tranche.start, dtype=bool)
+
+            if codes_noms is not None:
+                masque &= np.isin(colonnes.nom[tranche], codes_noms)
+
+            if debut is not None:
+                masque &= colonnes.echeance[tranche] >= debut
+
+            if fin is not None:
+                masque &= colonnes.echeance[tranche] <= fin
+
+            if quantite_min is not None:
+                masque &= colonnes.quantite[tranche] >= quantite_min
+
+            if quantite_max is not None:
+                masque &= colonnes.quantite[tranche] <= quantite_max
+
+            if code_lot is not None:
+                masque &= colonnes.lot[tranche] == code_lot
+
+            return masque
+
+        return self._positions_par_tranches(len(colonnes.quantite), masque_tranche)
+
+    def _get_besoins_by_etat_jusqua(self, etat: Etat, date_limite: datetime) -> List[Besoin]:
+        """
+        Récupère les besoins d'un état dont l'échéance est inférieure ou égale à une date limite
+
+        Args:
+            etat: État des besoins
+            date_limite: Échéance maximale (incluse)
+
+        Returns:
+            List[Besoin]: Besoins triés par échéance croissante
+        """
+        echeances, besoins = self._get_index_by_echeance().get(etat, ([], []))
+        return besoins[:bisect_right(echeances, date_limite)]
+
     def get_besoins_by_etat(self, etat: Etat) -> List[Besoin]:
         """
         Récupère tous les besoins ayant un état donné
@@ -42,30 +198,37 @@ class BesoinsRepository(BaseRepository[Besoin]):
             List[Besoin]: Liste des besoins agrégés
         """
         if date_debut is None:
-            date_debut = datetime.now().replace(tzinfo=None)
+            date_debut = datetime.now()
         elif date_debut.tzinfo is not None:
             date_debut = date_debut.replace(tzinfo=None)
 
         date_fin = date_debut + timedelta(days=nb_jours)
-        besoins_filtered = self.filter_besoins_advanced(
-            date_debut=date_debut,
-            date_fin=date_fin
-        )
-        besoins_aggregated = []
-
-        for besoin in besoins_filtered:
-            # On cherche si un besoin similaire existe déjà
-            besoin_similaire = next((b for b in besoins_aggregated
-                                   if b.matiere == besoin.matiere
-                                   and b.etat == besoin.etat
-                                   and b.lot == besoin.lot), None)
-
-            if besoin_similaire:
-                # Si on trouve un besoin similaire, on additionne les quantités
-                besoin_similaire.quantite += besoin.quantite
-            else:
-                # Sinon on ajoute le nouveau besoin
-                besoins_aggregated.append(besoin)
+        indices = self._indices_par_colonnes(date_debut=date_debut, date_fin=date_fin)
+        if len(indices) == 0:
+            return []
+
+        # Les besoins sont regroupés par matière égale (tous ses champs, comme Matiere.__eq__),
+        # état et lot : clé combinée en un entier pour grouper en une passe vectorisée
+        colonnes = self._get_colonnes()
+        besoins = self._get_all_view()
+        matieres: Dict[tuple, int] = {}
+        codes_matieres = np.fromiter(
+            (matieres.setdefault(tuple(besoins[i].matiere.__dict__.values()), len(matieres))
+             for i in indices.tolist()),
+            dtype=np.int64, count=len(indices))
+        cles = ((codes_matieres * len(_ETAT_CODES) + colonnes.etat[indices])
+                * max(len(colonnes.lots), 1) + colonnes.lot[indices])
+        _, premiers, groupes = np.unique(cles, return_index=True, return_inverse=True)
+        # Les quantités sont additionnées dans l'ordre des besoins, comme une somme successive
+        totaux = np.bincount(groupes, weights=colonnes.quantite[indices])
+
+        besoins_aggregated: List[Besoin] = []
+        # Les groupes sont restitués dans l'ordre de leur premier besoin
+        for groupe in np.argsort(premiers, kind="stable"):
+            # Copie du premier besoin du groupe pour ne pas modifier celui du repository
+            besoin = besoins[int(indices[premiers[groupe]])].model_copy()
+            besoin.quantite = float(totaux[groupe])
+            besoins_aggregated.append(besoin)
 
         return besoins_aggregated
 
@@ -147,42 +310,56 @@ class BesoinsRepository(BaseRepository[Besoin]):
         Returns:
             List[Besoin]: Liste des besoins filtrés
         """
-        besoins = self.get_all()
-        filtered_besoins = besoins
+        # Partir du plus petit sous-ensemble fourni par les index secondaires
+        candidats = []
+        if etat is not None:
+            candidats.append(self._get_index_by_etat().get(etat, []))
+        if code_mp is not None:
+            candidats.append(self._get_index_by_code_mp().get(code_mp, []))
+        if not candidats:
+            # Aucun index applicable : masque vectorisé sur la vue en colonnes
+            besoins = self._get_all_view()
+            return [besoins[i] for i in self._indices_par_colonnes(
+                nom_matiere, date_debut, date_fin, quantite_min, quantite_max, lot).tolist()]
+        besoins = min(candidats, key=len)
+
+        # Construire la liste des prédicats (accesseur, opérateur, valeur) des critères fournis
+        predicats = []
 
         # Filtre par état
         if etat is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.etat == etat]
+            predicats.append((attrgetter('etat'), is_, etat))
 
         # Filtre par code matière première
         if code_mp is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.matiere.code_mp == code_mp]
+            predicats.append((attrgetter('matiere.code_mp'), eq, code_mp))
 
         # Filtre par nom de matière (recherche partielle)
         if nom_matiere is not None:
-            nom_lower = nom_matiere.lower()
-            filtered_besoins = [b for b in filtered_besoins
-                              if nom_lower in b.matiere.nom.lower()]
+            noms_minuscules = self._get_noms_minuscules()
+            predicats.append((lambda b: noms_minuscules[b.matiere.nom], contains, nom_matiere.lower()))
 
         # Filtre par échéance
         if date_debut is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.echeance >= date_debut]
+            predicats.append((attrgetter('echeance'), ge, date_debut))
 
         if date_fin is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.echeance <= date_fin]
+            predicats.append((attrgetter('echeance'), le, date_fin))
 
         # Filtre par quantité
         if quantite_min is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.quantite >= quantite_min]
+            predicats.append((attrgetter('quantite'), ge, quantite_min))
 
         if quantite_max is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.quantite <= quantite_max]
+            predicats.append((attrgetter('quantite'), le, quantite_max))
 
         # Filtre par lot
         if lot is not None:
-            filtered_besoins = [b for b in filtered_besoins if b.lot == lot]
+            predicats.append((attrgetter('lot'), eq, lot))
 
-        return filtered_besoins
+        # Un seul passage sur les besoins
+        return [b for b in besoins
+                if all(op(accesseur(b), valeur) for accesseur, op, valeur in predicats)]
 
     def get_besoins_actuels_by_horizon(self, horizon_days: int, date_initiale: datetime = None) -> List[Besoin]:
         """
@@ -193,20 +370,15 @@ class BesoinsRepository(BaseRepository[Besoin]):
             date_initiale: Date de début de l'analyse
 
         Returns:
-            List[Besoin]: Liste des besoins inconnus dans l'horizon
+            List[Besoin]: Liste des besoins inconnus dans l'horizon, triés par échéance
         """
         if date_initiale is None:
-            date_initiale = datetime.now().replace(tzinfo=None)
+            date_initiale = datetime.now()
         elif date_initiale.tzinfo is not None:
             date_initiale = date_initiale.replace(tzinfo=None)
 
-        besoins_actuels = self.get_besoins_by_etat(Etat.INCONNU)
         date_limite = date_initiale + timedelta(days=horizon_days)
-
-        return [
-            besoin for besoin in besoins_actuels
-            if besoin.echeance <= date_limite
-        ]
+        return self._get_besoins_by_etat_jusqua(Etat.INCONNU, date_limite)
 
     def get_besoins_critiques(self, seuil_jours: int = 7, date_reference: datetime = None) -> List[Besoin]:
         """
@@ -217,18 +389,15 @@ class BesoinsRepository(BaseRepository[Besoin]):
             date_reference: Date de référence pour le calcul
 
         Returns:
-            List[Besoin]: Liste des besoins critiques
+            List[Besoin]: Liste des besoins critiques, triés par échéance
         """
         if date_reference is None:
-            date_reference = datetime.now().replace(tzinfo=None)
+            date_reference = datetime.now()
         elif date_reference.tzinfo is not None:
             date_reference = date_reference.replace(tzinfo=None)
 
         date_limite = date_reference + timedelta(days=seuil_jours)
-        return self.filter_besoins_advanced(
-            date_fin=date_limite,
-                            etat=Etat.INCONNU
-        )
+        return self._get_besoins_by_etat_jusqua(Etat.INCONNU, date_limite)
 
 
 
@@ -261,7 +430,25 @@ class BesoinsRepository(BaseRepository[Besoin]):
         Returns:
             List[Besoin]: Besoins triés par échéance
         """
-        return sorted(besoins, key=lambda x: x.echeance, reverse=reverse)
+        if besoins is self.data:
+            return self.get_besoins_sorted_by_echeance(reverse)
+        return sorted(besoins, key=attrgetter('echeance'), reverse=reverse)
+
+    def get_besoins_sorted_by_echeance(self, reverse: bool = False) -> List[Besoin]:
+        """
+        Récupère tous les besoins triés par échéance
+
+        Le tri est conservé en cache jusqu'à la prochaine modification du repository.
+
+        Args:
+            reverse: True pour trier en ordre décroissant
+
+        Returns:
+            List[Besoin]: Besoins triés par échéance (à ordre égal, ordre du repository)
+        """
+        nom = "sorted_by_echeance_desc" if reverse else "sorted_by_echeance"
+        tries = self._derived(nom, lambda: sorted(self._get_all_view(), key=attrgetter('echeance'), reverse=reverse))
+        return list(tries)
 
     def calculate_total_quantite(self, besoins: List[Besoin]) -> float:
         """
@@ -301,5 +488,13 @@ class BesoinsRepository(BaseRepository[Besoin]):
         Returns:
             List[Besoin]: Liste des besoins inconnus de cette matière dans l'horizon
         """
-        besoins_actuels = self.get_besoins_actuels_by_horizon(horizon_days, date_initiale)
-        return [besoin for besoin in besoins_actuels if besoin.matiere.code_mp == code_mp]
+        if date_initiale is None:
+            date_initiale = datetime.now()
+        elif date_initiale.tzinfo is not None:
+            date_initiale = date_initiale.replace(tzinfo=None)
+
+        return self.filter_besoins_advanced(
+            etat=Etat.INCONNU,
+            code_mp=code_mp,
+            date_fin=date_initiale + timedelta(days=horizon_days)
+        )
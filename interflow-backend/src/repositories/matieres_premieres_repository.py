@@ -1,12 +1,43 @@
 """
 Repository pour les matières premières
 """
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
+from functools import lru_cache
+from pydantic import ValidationError
 from repositories.base_repository import BaseRepository
 from repositories.storage_strategies import StorageStrategy
 from models.matieres import Matiere
 from lib.paths import get_reference_file
 import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _load_matieres_reference(path: str, mtime: float) -> Tuple[Dict[str, Matiere], Dict[str, Matiere]]:
+    """
+    Charge le fichier de référence des matières, indexé par nom et par code
+
+    Le cache est invalidé dès que la date de modification du fichier change.
+
+    Args:
+        path: Chemin du fichier de référence
+        mtime: Date de modification du fichier (clé de cache)
+
+    Returns:
+        Tuple: (matières par nom, matières par code_mp), première occurrence conservée
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        matieres = json.load(file)
+
+    by_name: Dict[str, Matiere] = {}
+    by_code: Dict[str, Matiere] = {}
+    for data in matieres:
+        matiere = Matiere(**data)
+        by_name.setdefault(data["nom"], matiere)
+        by_code.setdefault(data["code_mp"], matiere)
+    return by_name, by_code
 
 
 class MatieresPremieresRepository(BaseRepository[Matiere]):
@@ -16,6 +47,30 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
 
     def __init__(self, storage: StorageStrategy):
         super().__init__(Matiere, storage, id_field="code_mp")
+        # Table d'internement : une seule instance par (code_mp, nom) partagée entre les besoins
+        self._intern: Dict[Tuple[str, str], Matiere] = {}
+
+    def intern_matiere(self, matiere: Matiere) -> Matiere:
+        """
+        Retourne l'instance partagée d'une matière identique, en l'enregistrant si nécessaire
+
+        Args:
+            matiere: La matière à internaliser
+
+        Returns:
+            Matiere: L'instance partagée si elle est identique, sinon la matière reçue
+        """
+        partagee = self._intern.setdefault((matiere.code_mp, matiere.nom), matiere)
+        if partagee is not matiere and partagee != matiere:
+            return matiere
+        return partagee
+
+    def _matiere_par_defaut(self, code_mp: str, nom: str) -> Matiere:
+        """Retourne la matière par défaut (TOBEDEFINED) internalisée, sans la recréer à chaque appel"""
+        matiere = self._intern.get((code_mp, nom))
+        if matiere is None:
+            matiere = self._intern[(code_mp, nom)] = Matiere(code_mp=code_mp, nom=nom)
+        return matiere
 
     def get_matieres_list(self) -> List[Matiere]:
         """
@@ -48,12 +103,17 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
         Returns:
             Optional[Matiere]: La matière première ou None si non trouvée
         """
-        matieres = self.get_all()
+        matieres = self._get_all_view()
         for matiere in matieres:
             if matiere.nom == nom:
                 return matiere
         return None
 
+    def _get_matieres_reference(self) -> Tuple[Dict[str, Matiere], Dict[str, Matiere]]:
+        """Retourne le fichier de référence des matières indexé (mis en cache selon sa date de modification)"""
+        matieres_file = get_reference_file("matieres.json")
+        return _load_matieres_reference(str(matieres_file), matieres_file.stat().st_mtime)
+
     def from_name(self, name: str) -> Matiere:
         """
         Recherche une matière par nom dans le fichier de référence
@@ -65,16 +125,11 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
             Matiere: La matière trouvée ou une matière par défaut
         """
         try:
-            matieres_file = get_reference_file("matieres.json")
-            with open(matieres_file, "r", encoding="utf-8") as file:
-                matieres = json.load(file)
-            for matiere in matieres:
-                if matiere["nom"] == name:
-                    return Matiere(**matiere)
-            return Matiere(code_mp="TOBEDEFINED", nom=name)
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            print(f"Erreur lors de la recherche de matière par nom: {e}")
-            return Matiere(code_mp="TOBEDEFINED", nom=name)
+            by_name, _ = self._get_matieres_reference()
+            return by_name.get(name) or self._matiere_par_defaut("TOBEDEFINED", name)
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            logger.warning("Erreur lors de la recherche de matière par nom: %s", e)
+            return self._matiere_par_defaut("TOBEDEFINED", name)
 
     def from_code_mp(self, code_mp: str) -> Matiere:
         """
@@ -87,36 +142,34 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
             Matiere: La matière trouvée ou une matière par défaut
         """
         try:
-            matieres_file = get_reference_file("matieres.json")
-            with open(matieres_file, "r", encoding="utf-8") as file:
-                matieres = json.load(file)
-            for matiere in matieres:
-                if matiere["code_mp"] == code_mp:
-                    return Matiere(**matiere)
-            return Matiere(code_mp=code_mp, nom="TOBEDEFINED")
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-            print(f"Erreur lors de la recherche de matière par code: {e}")
-            return Matiere(code_mp=code_mp, nom="TOBEDEFINED")
-
-    def import_from_json(self, json_path: str = "data/matieres.json") -> None:
+            _, by_code = self._get_matieres_reference()
+            return by_code.get(code_mp) or self._matiere_par_defaut(code_mp, "TOBEDEFINED")
+        except (FileNotFoundError, ValueError, KeyError) as e:
+            logger.warning("Erreur lors de la recherche de matière par code: %s", e)
+            return self._matiere_par_defaut(code_mp, "TOBEDEFINED")
+
+    def import_from_json(self, json_path: str = "data/matieres.json", skip_dedup: Optional[bool] = None) -> None:
         """
         Importe les matières depuis un fichier JSON
 
         Args:
             json_path: Chemin vers le fichier JSON
+            skip_dedup: Ajoute les matières sans vérifier les codes existants
+                (par défaut : seulement si le repository est vide)
         """
+        if skip_dedup is None:
+            skip_dedup = not self.data
+
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(json_path, 'rb') as f:
+                # Lecture et validation de toute la liste en un seul appel pydantic-core
+                matieres = self._adapter.validate_json(f.read())
 
-            # Créer les objets Matiere depuis les données JSON
-            for item in data:
-                matiere = Matiere(**item)
-                self.create(matiere)
+            self._import_items(matieres, json_path, skip_dedup)
         except FileNotFoundError:
-            print(f"Fichier {json_path} non trouvé")
-        except json.JSONDecodeError:
-            print(f"Erreur lors du décodage JSON du fichier {json_path}")
+            logger.error("Fichier %s non trouvé", json_path)
+        except ValidationError as e:
+            logger.error("Erreur lors du décodage JSON du fichier %s: %s", json_path, e)
 
     def search_by_nom(self, nom: str) -> List[Matiere]:
         """
@@ -128,8 +181,12 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
         Returns:
             List[Matiere]: Liste des matières correspondantes
         """
-        matieres = self.get_all()
-        return [matiere for matiere in matieres if nom.lower() in matiere.nom.lower()]
+        nom_minuscule = nom.lower()
+        return [matiere for nom_matiere, matiere in self._get_noms_minuscules() if nom_minuscule in nom_matiere]
+
+    def _get_noms_minuscules(self) -> List[Tuple[str, Matiere]]:
+        """Noms en minuscules des matières, calculés une fois par version des données"""
+        return self._derived("noms_minuscules", lambda: [(m.nom.lower(), m) for m in self._get_all_view()])
 
     def get_matieres_seveso(self) -> List[Matiere]:
         """
@@ -138,7 +195,7 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
         Returns:
             List[Matiere]: Liste des matières SEVESO
         """
-        matieres = self.get_all()
+        matieres = self._get_all_view()
         return [matiere for matiere in matieres if matiere.seveso]
 
     def get_matieres_by_type(self, type_matiere: str) -> List[Matiere]:
@@ -151,7 +208,7 @@ class MatieresPremieresRepository(BaseRepository[Matiere]):
         Returns:
             List[Matiere]: Liste des matières du type spécifié
         """
-        matieres = self.get_all()
+        matieres = self._get_all_view()
         return [matiere for matiere in matieres if matiere.type_matiere and matiere.type_matiere.value == type_matiere]
 
     def get_by_code_mp(self, code_mp: str) -> Optional[Matiere]:
@@ -1,10 +1,15 @@
 """
 Repository pour la gestion des rapatriements
 """
-from typing import List, Optional, Dict, Any
+import logging
+from bisect import bisect_left, bisect_right
+from operator import attrgetter, itemgetter
+from typing import List, Optional, Dict, Any, Callable, Iterable, NamedTuple, Tuple
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from .base_repository import BaseRepository
 from .storage_strategies import JSONStorageStrategy, StorageStrategy
 from models.rappatriement import Rappatriement, ProduitRappatriement
@@ -15,6 +20,20 @@ import re
 import os
 from lib.paths import get_output_file
 
+logger = logging.getLogger(__name__)
+
+
+class _ColonnesProduits(NamedTuple):
+    """Vue en colonnes des produits de tous les rapatriements (une ligne par produit)"""
+    rappatriement: np.ndarray  # position du rapatriement propriétaire
+    poids_net: np.ndarray  # float64
+    nb_palettes: np.ndarray  # int64
+    nb_contenants: np.ndarray  # int64
+    type_emballage: np.ndarray  # int32, index dans types_emballage
+    types_emballage: List[str]  # ordre de première apparition
+    responsable: np.ndarray  # int32 (une ligne par rapatriement), index dans responsables
+    responsables: List[str]  # ordre de première apparition
+
 
 class RappatriementsRepository(BaseRepository[Rappatriement]):
     """
@@ -33,6 +52,120 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
             storage=storage,
             id_field="numero_transfert"
         )
+        # Prochain compteur à essayer pour la seconde courante de génération des numéros
+        self._compteur_numeros: Tuple[str, int] = ("", 0)
+
+    def _get_positions(self) -> Dict[int, int]:
+        """Position de chaque rapatriement dans les données (par identité d'objet)"""
+        return self._derived("positions", lambda: {id(r): pos for pos, r in enumerate(self._get_all_view())})
+
+    def _index_par_produit(self, cle: Callable[[ProduitRappatriement], Any]) -> Dict[Any, List[Rappatriement]]:
+        """Index valeur -> rapatriements ayant au moins un produit de cette valeur (ordre des données)"""
+        index: Dict[Any, List[Rappatriement]] = {}
+        for rappatriement in self._get_all_view():
+            for valeur in {cle(p) for p in rappatriement.produits}:
+                index.setdefault(valeur, []).append(rappatriement)
+        return index
+
+    def _get_totaux(self) -> Dict[int, Tuple[float, int, int]]:
+        """Totaux (poids, nb palettes, nb contenants) de chaque rapatriement, par identité d'objet"""
+        return self._derived("totaux", lambda: {
+            id(r): (r.calculer_poids_total(), r.calculer_nb_palettes_total(), r.calculer_nb_contenants_total())
+            for r in self._get_all_view()
+        })
+
+    def _get_index_trie(self, nom: str, cle: Callable[[Rappatriement], Any]) -> Tuple[List[Any], List[int]]:
+        """
+        Index secondaire trié sur une clé, pour les recherches par plage (bisect)
+
+        Args:
+            nom: Nom de l'index dans le cache des structures dérivées
+            cle: Valeur indexée de chaque rapatriement (None : non indexé)
+
+        Returns:
+            Tuple[List[Any], List[int]]: Valeurs triées et positions des rapatriements correspondants
+        """
+        def build() -> Tuple[List[Any], List[int]]:
+            paires = sorted(((valeur, pos) for pos, r in enumerate(self._get_all_view())
+                             if (valeur := cle(r)) is not None), key=itemgetter(0))
+            return [valeur for valeur, _ in paires], [pos for _, pos in paires]
+        return self._derived(nom, build)
+
+    def _par_positions(self, positions: Iterable[int]) -> List[Rappatriement]:
+        """Rapatriements aux positions données, restitués dans l'ordre des données"""
+        rappatriements = self._get_all_view()
+        return [rappatriements[pos] for pos in sorted(positions)]
+
+    def _get_textes_minuscules(self) -> Dict[int, Tuple[str, str, str]]:
+        """Responsable, adresse destinataire et adresse enlèvement en minuscules, par identité d'objet"""
+        return self._derived("textes_minuscules", lambda: {
+            id(r): (r.responsable_diffusion.lower(), r.adresse_destinataire.lower(), r.adresse_enlevement.lower())
+            for r in self._get_all_view()
+        })
+
+    def _get_colonnes_produits(self) -> _ColonnesProduits:
+        """Vue en colonnes (tableaux NumPy) des produits, recalculée après modification"""
+        def build() -> _ColonnesProduits:
+            rappatriements = self._get_all_view()
+            produits = [(pos, p) for pos, r in enumerate(rappatriements) for p in r.produits]
+            n = len(produits)
+            types: Dict[str, int] = {}
+            responsables: Dict[str, int] = {}
+            return _ColonnesProduits(
+                rappatriement=np.fromiter((pos for pos, _ in produits), dtype=np.intp, count=n),
+                poids_net=np.fromiter((p.poids_net for _, p in produits), dtype=np.float64, count=n),
+                nb_palettes=np.fromiter((p.nb_palettes for _, p in produits), dtype=np.int64, count=n),
+                nb_contenants=np.fromiter((p.nb_contenants for _, p in produits), dtype=np.int64, count=n),
+                type_emballage=np.fromiter((types.setdefault(p.type_emballage, len(types)) for _, p in produits),
+                                           dtype=np.int32, count=n),
+                types_emballage=list(types),
+                responsable=np.fromiter((responsables.setdefault(r.responsable_diffusion, len(responsables))
+                                         for r in rappatriements), dtype=np.int32, count=len(rappatriements)),
+                responsables=list(responsables),
+            )
+        return self._derived("colonnes_produits", build)
+
+    def _get_index_by_responsable(self) -> Dict[str, List[Rappatriement]]:
+        """Index secondaire responsable (en minuscules) -> rapatriements"""
+        return self._derived("by_responsable",
+                             lambda: self._group_by(lambda r: r.responsable_diffusion.lower()))
+
+    def _get_index_by_code_prdt(self) -> Dict[str, List[Rappatriement]]:
+        """Index secondaire code produit (en minuscules) -> rapatriements"""
+        return self._derived("by_code_prdt", lambda: self._index_par_produit(lambda p: p.code_prdt.lower()))
+
+    def _get_index_by_designation(self) -> Dict[str, List[Rappatriement]]:
+        """Index secondaire désignation produit (en minuscules) -> rapatriements"""
+        return self._derived("by_designation",
+                             lambda: self._index_par_produit(lambda p: p.designation_prdt.lower()))
+
+    def _get_index_by_type_emballage(self) -> Dict[str, List[Rappatriement]]:
+        """Index secondaire type d'emballage -> rapatriements"""
+        return self._derived("by_type_emballage", lambda: self._index_par_produit(lambda p: p.type_emballage))
+
+    def _rechercher(self, recherche: str,
+                    *index: Callable[[], Dict[str, List[Rappatriement]]]) -> List[Rappatriement]:
+        """
+        Recherche partielle sur les clés d'un ou plusieurs index
+
+        Seules les clés distinctes sont comparées ; les rapatriements trouvés sont
+        dédoublonnés et restitués dans l'ordre des données.
+
+        Args:
+            recherche: Texte recherché, déjà en minuscules
+            *index: Accesseurs des index clé en minuscules -> rapatriements
+
+        Returns:
+            List[Rappatriement]: Rapatriements dont une clé contient le texte
+        """
+        groupes = [groupe for get_index in index
+                   for groupe in self._cles_contenant(f"texte_{get_index.__name__}", get_index(), recherche)]
+        if len(groupes) == 1:
+            return list(groupes[0])
+
+        positions = self._get_positions()
+        trouves = {positions[id(r)]: r for groupe in groupes for r in groupe}
+        return [trouves[pos] for pos in sorted(trouves)]
 
     def flush(self) -> None:
         """
@@ -41,14 +174,15 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         # Appeler la méthode flush du parent
         super().flush()
 
-        # Supprimer le fichier de log des fichiers traités
+        # Supprimer le fichier de log des fichiers traités (et l'ancien log JSON)
         try:
-            log_file = get_output_file("processed_rappatriement_files.json", "logs")
-            if log_file.exists():
-                log_file.unlink()
-                print(f"✓ Fichier de log des fichiers traités supprimé : {log_file}")
+            log_file = get_output_file("processed_rappatriement_files.log", "logs")
+            for fichier in (log_file, log_file.with_suffix('.json')):
+                if fichier.exists():
+                    fichier.unlink()
+                    logger.info("Fichier de log des fichiers traités supprimé : %s", fichier)
         except Exception as e:
-            print(f"⚠️ Erreur lors de la suppression du fichier de log : {e}")
+            logger.warning("Erreur lors de la suppression du fichier de log : %s", e)
 
     def get_rappatriements_list(self) -> List[Rappatriement]:
         """
@@ -100,12 +234,8 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements dans la plage
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if rappatriement.date_demande:
-                if date_debut <= rappatriement.date_demande <= date_fin:
-                    filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        dates, positions = self._get_index_trie("par_date_demande", attrgetter('date_demande'))
+        return self._par_positions(positions[bisect_left(dates, date_debut):bisect_right(dates, date_fin)])
 
     def get_rappatriements_by_responsable(self, responsable: str) -> List[Rappatriement]:
         """
@@ -117,11 +247,7 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements du responsable
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if responsable.lower() in rappatriement.responsable_diffusion.lower():
-                filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        return self._rechercher(responsable.lower(), self._get_index_by_responsable)
 
     def get_rappatriements_by_adresse_destinataire(self, adresse_partielle: str) -> List[Rappatriement]:
         """
@@ -133,11 +259,9 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements correspondants
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if adresse_partielle.lower() in rappatriement.adresse_destinataire.lower():
-                filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        adresse_min = adresse_partielle.lower()
+        textes = self._get_textes_minuscules()
+        return [r for r in self._get_all_view() if adresse_min in textes[id(r)][1]]
 
     def get_rappatriements_by_produit(self, code_produit: str) -> List[Rappatriement]:
         """
@@ -149,13 +273,7 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements contenant ce produit
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            for produit in rappatriement.produits:
-                if code_produit.lower() in produit.code_prdt.lower():
-                    filtered_rappatriements.append(rappatriement)
-                    break  # Éviter les doublons si plusieurs produits correspondent
-        return filtered_rappatriements
+        return self._rechercher(code_produit.lower(), self._get_index_by_code_prdt)
 
     def get_rappatriements_by_matiere(self, code_matiere: str) -> List[Rappatriement]:
         """
@@ -167,17 +285,9 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements contenant cette matière
         """
-        filtered_rappatriements = []
-        code_matiere_lower = code_matiere.lower()
-
-        for rappatriement in self.get_all():
-            for produit in rappatriement.produits:
-                # Recherche dans le code produit et la désignation
-                if (code_matiere_lower in produit.code_prdt.lower() or
-                    code_matiere_lower in produit.designation_prdt.lower()):
-                    filtered_rappatriements.append(rappatriement)
-                    break  # Éviter les doublons si plusieurs produits correspondent
-        return filtered_rappatriements
+        # Recherche dans le code produit et la désignation
+        return self._rechercher(code_matiere.lower(),
+                                self._get_index_by_code_prdt, self._get_index_by_designation)
 
     def get_rappatriements_by_type_emballage(self, type_emballage: str) -> List[Rappatriement]:
         """
@@ -189,11 +299,7 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements correspondants
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if any(p.type_emballage == type_emballage for p in rappatriement.produits):
-                filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        return list(self._get_index_by_type_emballage().get(type_emballage, []))
 
     def get_rappatriements_by_poids_min(self, poids_min: float) -> List[Rappatriement]:
         """
@@ -205,11 +311,9 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements correspondants
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if rappatriement.calculer_poids_total() >= poids_min:
-                filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        totaux = self._get_totaux()
+        poids, positions = self._get_index_trie("par_poids", lambda r: totaux[id(r)][0])
+        return self._par_positions(positions[bisect_left(poids, poids_min):])
 
     def get_rappatriements_by_nb_palettes_min(self, nb_palettes_min: int) -> List[Rappatriement]:
         """
@@ -221,20 +325,30 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements correspondants
         """
-        filtered_rappatriements = []
-        for rappatriement in self.get_all():
-            if rappatriement.calculer_nb_palettes_total() >= nb_palettes_min:
-                filtered_rappatriements.append(rappatriement)
-        return filtered_rappatriements
+        totaux = self._get_totaux()
+        palettes, positions = self._get_index_trie("par_nb_palettes", lambda r: totaux[id(r)][1])
+        return self._par_positions(positions[bisect_left(palettes, nb_palettes_min):])
 
     def get_statistiques_globales(self) -> Dict[str, Any]:
         """
         Calcule les statistiques globales des rapatriements
 
+        Les statistiques sont matérialisées jusqu'à la prochaine modification du repository ;
+        une copie est retournée pour que l'appelant puisse la modifier.
+
         Returns:
             Dict[str, Any]: Dictionnaire des statistiques
         """
-        rappatriements = self.get_all()
+        stats = self._derived("statistiques_globales", self._calculer_statistiques_globales)
+        return {
+            **stats,
+            "types_emballage": {cle: dict(valeur) for cle, valeur in stats["types_emballage"].items()},
+            "responsables": {cle: dict(valeur) for cle, valeur in stats["responsables"].items()},
+        }
+
+    def _calculer_statistiques_globales(self) -> Dict[str, Any]:
+        """Calcule les statistiques globales à partir de toutes les données"""
+        rappatriements = self._get_all_view()
 
         if not rappatriements:
             return {
@@ -247,34 +361,38 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
                 "responsables": {}
             }
 
-        stats = {
-            "total_rappatriements": len(rappatriements),
-            "total_produits": sum(len(r.produits) for r in rappatriements),
-            "poids_total": sum(r.calculer_poids_total() for r in rappatriements),
-            "total_palettes": sum(r.calculer_nb_palettes_total() for r in rappatriements),
-            "total_contenants": sum(r.calculer_nb_contenants_total() for r in rappatriements),
-            "types_emballage": {},
-            "responsables": {}
-        }
+        colonnes = self._get_colonnes_produits()
 
-        # Statistiques par type d'emballage
-        for rappatriement in rappatriements:
-            for produit in rappatriement.produits:
-                type_emb = produit.type_emballage
-                if type_emb not in stats["types_emballage"]:
-                    stats["types_emballage"][type_emb] = {"count": 0, "poids": 0}
-                stats["types_emballage"][type_emb]["count"] += 1
-                stats["types_emballage"][type_emb]["poids"] += produit.poids_net
+        # Statistiques par type d'emballage (bincount additionne dans l'ordre des produits)
+        nb_types = len(colonnes.types_emballage)
+        counts_types = np.bincount(colonnes.type_emballage, minlength=nb_types).tolist()
+        poids_types = np.bincount(colonnes.type_emballage, weights=colonnes.poids_net, minlength=nb_types).tolist()
 
         # Statistiques par responsable
-        for rappatriement in rappatriements:
-            responsable = rappatriement.responsable_diffusion
-            if responsable not in stats["responsables"]:
-                stats["responsables"][responsable] = {"count": 0, "poids_total": 0}
-            stats["responsables"][responsable]["count"] += 1
-            stats["responsables"][responsable]["poids_total"] += rappatriement.calculer_poids_total()
-
-        return stats
+        poids_rappatriements = np.bincount(colonnes.rappatriement, weights=colonnes.poids_net,
+                                           minlength=len(rappatriements))
+        nb_responsables = len(colonnes.responsables)
+        counts_responsables = np.bincount(colonnes.responsable, minlength=nb_responsables).tolist()
+        poids_responsables = np.bincount(colonnes.responsable, weights=poids_rappatriements,
+                                         minlength=nb_responsables).tolist()
+
+        # Dictionnaires construits en une passe (une seule insertion par clé)
+        return {
+            "total_rappatriements": len(rappatriements),
+            "total_produits": len(colonnes.poids_net),
+            "poids_total": float(colonnes.poids_net.sum()),
+            "total_palettes": int(colonnes.nb_palettes.sum()),
+            "total_contenants": int(colonnes.nb_contenants.sum()),
+            "types_emballage": {
+                type_emb: {"count": count, "poids": poids}
+                for type_emb, count, poids in zip(colonnes.types_emballage, counts_types, poids_types)
+            },
+            "responsables": {
+                responsable: {"count": count, "poids_total": poids_total}
+                for responsable, count, poids_total in zip(colonnes.responsables, counts_responsables,
+                                                           poids_responsables)
+            }
+        }
 
     def get_rappatriements_recents(self, nb_jours: int = 30) -> List[Rappatriement]:
         """
@@ -287,16 +405,14 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
             List[Rappatriement]: Liste des rapatriements récents
         """
         from datetime import timedelta
-        date_limite = datetime.now().replace(tzinfo=None) - timedelta(days=nb_jours)
-        filtered_rappatriements = []
-
-        for rappatriement in self.get_all():
-            # Considérer comme récent si la date de demande ou de dernière MAJ est récente
-            if (rappatriement.date_demande and rappatriement.date_demande >= date_limite) or \
-               (rappatriement.date_derniere_maj and rappatriement.date_derniere_maj >= date_limite):
-                filtered_rappatriements.append(rappatriement)
+        date_limite = datetime.now() - timedelta(days=nb_jours)
 
-        return filtered_rappatriements
+        # Considérer comme récent si la date de demande ou de dernière MAJ est récente
+        recents = set()
+        for nom, champ in (("par_date_demande", 'date_demande'), ("par_date_derniere_maj", 'date_derniere_maj')):
+            dates, positions = self._get_index_trie(nom, attrgetter(champ))
+            recents.update(positions[bisect_left(dates, date_limite):])
+        return self._par_positions(recents)
 
     def get_rappatriements_en_cours(self) -> List[Rappatriement]:
         """
@@ -392,18 +508,20 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             str: Numéro de transfert unique
         """
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        existing_numbers = [r.numero_transfert for r in self.get_all()]
 
-        # Format: YYYYMMDDHHMMSS + compteur si besoin
-        counter = 1
-        numero = f"{timestamp}"
+        # Reprendre après le dernier compteur attribué dans la même seconde
+        seconde, counter = self._compteur_numeros
+        if seconde != timestamp:
+            counter = 0
 
-        while numero in existing_numbers:
-            numero = f"{timestamp}{counter:03d}"
+        # Format: YYYYMMDDHHMMSS + compteur si besoin (vérification via l'index des ID)
+        numero = timestamp if counter == 0 else f"{timestamp}{counter:03d}"
+        while numero in self._index:
             counter += 1
+            numero = f"{timestamp}{counter:03d}"
 
+        self._compteur_numeros = (timestamp, counter + 1)
         return numero
 
     def import_from_file(self, file_path: str) -> int:
@@ -417,6 +535,7 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
             int: Nombre de rapatriements importés
         """
         imported_count = 0
+        rapatriements = []
         try:
             if file_path.endswith('.csv'):
                 raise ValueError("Le fichier doit être un fichier XLSX")
@@ -426,19 +545,18 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
             else:
                 raise ValueError("Le fichier doit être un fichier CSV ou XLSX")
 
-            rapatriements = decoder.decode_file(file_path)
-
-            for rappatriement in rapatriements:
-                # Utiliser create_rappatriement qui génère automatiquement le numéro si nécessaire
+            # Consommer les rapatriements au fil du décodage
+            for rappatriement in decoder.decode_file_iter(file_path):
+                # Générer le numéro de transfert si nécessaire
                 if not rappatriement.numero_transfert:
                     rappatriement.numero_transfert = self._generate_transfer_number()
+                rapatriements.append(rappatriement)
 
-                # Ajouter directement sans vérification de doublon
-                self.create(rappatriement)
-                print(f"✓ Rapatriement {rappatriement.numero_transfert} ajouté depuis {Path(file_path).name}")
-                imported_count += 1
+            # Ajout en bloc : une seule sauvegarde pour tout le fichier
+            imported_count = len(self.create_many(rapatriements))
+            logger.debug("%d rapatriement(s) ajouté(s) depuis %s", imported_count, Path(file_path).name)
         except Exception as e:
-            print(f"❌ Erreur lors de l'import {file_path}: {e}")
+            logger.error("Erreur lors de l'import %s: %s", file_path, e)
 
         return imported_count
 
@@ -471,26 +589,26 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         directory = Path(directory_path)
 
         if not directory.exists():
-            print(f"❌ Répertoire introuvable : {directory}")
+            logger.error("Répertoire introuvable : %s", directory)
             return 0
 
         # Trouver tous les fichiers CSV
         csv_files = list(directory.glob("*.csv"))
 
         if not csv_files:
-            print(f"ℹ️ Aucun fichier CSV trouvé dans {directory}")
+            logger.info("Aucun fichier CSV trouvé dans %s", directory)
             return 0
 
-        print(f"📁 Traitement de {len(csv_files)} fichiers CSV dans {directory}")
+        logger.info("Traitement de %d fichiers CSV dans %s", len(csv_files), directory)
 
         for csv_file in csv_files:
             try:
                 count = self.import_from_csv(str(csv_file))
                 total_imported += count
             except Exception as e:
-                print(f"❌ Erreur avec le fichier {csv_file.name}: {e}")
+                logger.error("Erreur avec le fichier %s: %s", csv_file.name, e)
 
-        print(f"✅ Import terminé : {total_imported} rapatriements importés au total")
+        logger.info("Import terminé : %d rapatriements importés au total", total_imported)
         return total_imported
 
     def import_from_csv_files(self, csv_files: List[str]) -> int:
@@ -510,9 +628,9 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
                 count = self.import_from_csv(csv_file)
                 total_imported += count
             except Exception as e:
-                print(f"❌ Erreur avec le fichier {csv_file}: {e}")
+                logger.error("Erreur avec le fichier %s: %s", csv_file, e)
 
-        print(f"✅ Import de {len(csv_files)} fichiers terminé : {total_imported} rapatriements importés")
+        logger.info("Import de %d fichiers terminé : %d rapatriements importés", len(csv_files), total_imported)
         return total_imported
 
     def append_csv_file(self, csv_path: str) -> int:
@@ -526,9 +644,37 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             int: Nombre de rapatriements ajoutés
         """
-        print(f"📥 Ajout du fichier CSV : {Path(csv_path).name}")
+        logger.info("Ajout du fichier CSV : %s", Path(csv_path).name)
         return self.import_from_csv(csv_path)
 
+    @staticmethod
+    def _charger_fichiers_traites(log_file: Path) -> set:
+        """
+        Charge les chemins des fichiers déjà traités depuis le log
+
+        Si seul l'ancien log JSON existe, son contenu est repris dans le log
+        texte (un chemin absolu par ligne) puis il est supprimé.
+
+        Args:
+            log_file: Fichier de log des fichiers traités
+
+        Returns:
+            set: Chemins absolus des fichiers déjà traités
+        """
+        ancien_log = log_file.with_suffix('.json')
+        if not log_file.exists() and ancien_log.exists():
+            with open(ancien_log, 'r', encoding='utf-8') as f:
+                anciens = [str(Path(chemin).resolve()) for chemin in json.load(f)]
+            with open(log_file, 'w', encoding='utf-8') as f:
+                f.writelines(f"{chemin}\n" for chemin in anciens)
+            ancien_log.unlink()
+            logger.info("Ancien log JSON migré vers %s", log_file)
+
+        if not log_file.exists():
+            return set()
+        with open(log_file, 'r', encoding='utf-8') as f:
+            return set(f.read().splitlines())
+
     def scan_and_import_new_csv(self, directory_path: str,
                                processed_files_log: Optional[str] = None) -> int:
         """
@@ -543,57 +689,54 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         """
         directory = Path(directory_path)
         if not directory.exists():
-            print(f"❌ Répertoire introuvable : {directory}")
+            logger.error("Répertoire introuvable : %s", directory)
             return 0
 
-        # Gérer le fichier de log des fichiers traités
+        # Gérer le fichier de log des fichiers traités (un chemin par ligne, en ajout seul)
         if processed_files_log:
             log_file = Path(processed_files_log)
+            if log_file.suffix == '.json':
+                log_file = log_file.with_suffix('.log')
         else:
-            log_file = get_output_file("processed_rappatriement_files.json", "logs")
-            log_file.parent.mkdir(parents=True, exist_ok=True)
+            log_file = get_output_file("processed_rappatriement_files.log", "logs")
+        log_file.parent.mkdir(parents=True, exist_ok=True)
 
         # Charger la liste des fichiers déjà traités
         processed_files = set()
-        if log_file.exists():
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    processed_files = set(json.load(f))
-            except Exception as e:
-                print(f"⚠️ Erreur lors de la lecture du log : {e}")
+        try:
+            processed_files = self._charger_fichiers_traites(log_file)
+        except Exception as e:
+            logger.warning("Erreur lors de la lecture du log : %s", e)
 
-        # Trouver les nouveaux fichiers CSV
-        csv_files = list(directory.glob("*.csv"))
+        # Trouver les nouveaux fichiers CSV (chemins absolus : relatif et absolu désignent la même entrée)
+        csv_files = [f.resolve() for f in directory.glob("*.csv")]
         new_files = [f for f in csv_files if str(f) not in processed_files]
 
         if not new_files:
-            print(f"ℹ️ Aucun nouveau fichier CSV trouvé dans {directory}")
+            logger.info("Aucun nouveau fichier CSV trouvé dans %s", directory)
             return 0
 
-        print(f"📁 Traitement de {len(new_files)} nouveaux fichiers CSV")
+        logger.info("Traitement de %d nouveaux fichiers CSV", len(new_files))
 
         total_imported = 0
-        newly_processed = []
 
         for csv_file in new_files:
             try:
                 count = self.import_from_csv(str(csv_file))
                 total_imported += count
-                newly_processed.append(str(csv_file))
             except Exception as e:
-                print(f"❌ Erreur avec le fichier {csv_file.name}: {e}")
+                logger.error("Erreur avec le fichier %s: %s", csv_file.name, e)
+                continue
 
-        # Mettre à jour le log des fichiers traités
-        if newly_processed:
-            processed_files.update(newly_processed)
+            # Enregistrer le fichier traité par simple ajout au log
             try:
-                with open(log_file, 'w', encoding='utf-8') as f:
-                    json.dump(list(processed_files), f, ensure_ascii=False, indent=2)
-                print(f"📝 Log mis à jour : {log_file}")
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(f"{csv_file}\n")
+                logger.debug("Log mis à jour : %s", log_file)
             except Exception as e:
-                print(f"⚠️ Erreur lors de la mise à jour du log : {e}")
+                logger.warning("Erreur lors de la mise à jour du log : %s", e)
 
-        print(f"✅ Scan terminé : {total_imported} nouveaux rapatriements importés")
+        logger.info("Scan terminé : %d nouveaux rapatriements importés", total_imported)
         return total_imported
 
     def filter_rappatriements_advanced(self,
@@ -627,56 +770,64 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         Returns:
             List[Rappatriement]: Liste des rapatriements correspondants
         """
-        rappatriements = self.get_all()
+        # Partir du plus petit sous-ensemble fourni par les index secondaires
+        candidats = []
+        if responsable:
+            candidats.append(self._rechercher(responsable.lower(), self._get_index_by_responsable))
+        if code_produit:
+            # Index en minuscules : sur-ensemble, le filtre exact ci-dessous s'applique toujours
+            candidats.append(self._get_index_by_code_prdt().get(code_produit.lower(), []))
+        if type_emballage:
+            candidats.append(self._get_index_by_type_emballage().get(type_emballage, []))
+        rappatriements = min(candidats, key=len) if candidats else self._get_all_view()
+
+        # Prédicats assemblés une seule fois (textes recherchés mis en minuscules hors de la boucle,
+        # textes stockés comparés à leur version en minuscules en cache)
+        predicats: List[Callable[[Rappatriement], bool]] = []
+        textes = self._get_textes_minuscules()
 
         # Filtrer par responsable
         if responsable:
-            rappatriements = [r for r in rappatriements
-                            if responsable.lower() in r.responsable_diffusion.lower()]
+            responsable_min = responsable.lower()
+            predicats.append(lambda r: responsable_min in textes[id(r)][0])
 
         # Filtrer par plage de dates
         if date_debut:
-            rappatriements = [r for r in rappatriements
-                            if r.date_demande and r.date_demande >= date_debut]
+            predicats.append(lambda r: bool(r.date_demande) and r.date_demande >= date_debut)
         if date_fin:
-            rappatriements = [r for r in rappatriements
-                            if r.date_demande and r.date_demande <= date_fin]
+            predicats.append(lambda r: bool(r.date_demande) and r.date_demande <= date_fin)
 
         # Filtrer par adresses
         if adresse_destinataire:
-            rappatriements = [r for r in rappatriements
-                            if adresse_destinataire.lower() in r.adresse_destinataire.lower()]
+            destinataire_min = adresse_destinataire.lower()
+            predicats.append(lambda r: destinataire_min in textes[id(r)][1])
         if adresse_enlevement:
-            rappatriements = [r for r in rappatriements
-                            if adresse_enlevement.lower() in r.adresse_enlevement.lower()]
+            enlevement_min = adresse_enlevement.lower()
+            predicats.append(lambda r: enlevement_min in textes[id(r)][2])
 
         # Filtrer par produit
         if code_produit:
-            rappatriements = [r for r in rappatriements
-                            if any(p.code_prdt == code_produit for p in r.produits)]
+            predicats.append(lambda r: any(p.code_prdt == code_produit for p in r.produits))
 
         # Filtrer par type d'emballage
         if type_emballage:
-            rappatriements = [r for r in rappatriements
-                            if any(p.type_emballage == type_emballage for p in r.produits)]
+            predicats.append(lambda r: any(p.type_emballage == type_emballage for p in r.produits))
 
-        # Filtrer par poids
+        # Filtrer par poids (totaux en cache)
+        totaux = self._get_totaux()
         if poids_min:
-            rappatriements = [r for r in rappatriements
-                            if r.calculer_poids_total() >= poids_min]
+            predicats.append(lambda r: totaux[id(r)][0] >= poids_min)
         if poids_max:
-            rappatriements = [r for r in rappatriements
-                            if r.calculer_poids_total() <= poids_max]
+            predicats.append(lambda r: totaux[id(r)][0] <= poids_max)
 
         # Filtrer par nombre de palettes
         if nb_palettes_min:
-            rappatriements = [r for r in rappatriements
-                            if r.calculer_nb_palettes_total() >= nb_palettes_min]
+            predicats.append(lambda r: totaux[id(r)][1] >= nb_palettes_min)
         if nb_palettes_max:
-            rappatriements = [r for r in rappatriements
-                            if r.calculer_nb_palettes_total() <= nb_palettes_max]
+            predicats.append(lambda r: totaux[id(r)][1] <= nb_palettes_max)
 
-        return rappatriements
+        # Un seul passage, arrêté au premier critère non satisfait
+        return [r for r in rappatriements if all(predicat(r) for predicat in predicats)]
 
     def export_to_csv(self, filepath: Path) -> bool:
         """
@@ -691,34 +842,37 @@ class RappatriementsRepository(BaseRepository[Rappatriement]):
         try:
             import csv
 
-            rappatriements = self.get_all()
+            rappatriements = self._get_all_view()
+            totaux = self._get_totaux()
 
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+            # Tampon d'écriture large : moins d'appels système pour les gros exports
+            with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
                 fieldnames = [
                     'numero_transfert', 'responsable_diffusion', 'date_demande',
                     'date_reception_souhaitee', 'adresse_destinataire', 'adresse_enlevement',
                     'nb_produits', 'poids_total', 'nb_palettes_total', 'nb_contenants_total'
                 ]
 
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for rappatriement in rappatriements:
-                    writer.writerow({
-                        'numero_transfert': rappatriement.numero_transfert,
-                        'responsable_diffusion': rappatriement.responsable_diffusion,
-                        'date_demande': rappatriement.date_demande.isoformat() if rappatriement.date_demande else '',
-                        'date_reception_souhaitee': rappatriement.date_reception_souhaitee.isoformat() if rappatriement.date_reception_souhaitee else '',
-                        'adresse_destinataire': rappatriement.adresse_destinataire,
-                        'adresse_enlevement': rappatriement.adresse_enlevement,
-                        'nb_produits': len(rappatriement.produits),
-                        'poids_total': rappatriement.calculer_poids_total(),
-                        'nb_palettes_total': rappatriement.calculer_nb_palettes_total(),
-                        'nb_contenants_total': rappatriement.calculer_nb_contenants_total()
-                    })
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+
+                # Lignes produites à la volée dans l'ordre des colonnes, écrites en un seul appel
+                writer.writerows(
+                    (
+                        rappatriement.numero_transfert,
+                        rappatriement.responsable_diffusion,
+                        rappatriement.date_demande.isoformat() if rappatriement.date_demande else '',
+                        rappatriement.date_reception_souhaitee.isoformat() if rappatriement.date_reception_souhaitee else '',
+                        rappatriement.adresse_destinataire,
+                        rappatriement.adresse_enlevement,
+                        len(rappatriement.produits),
+                        *totaux[id(rappatriement)]
+                    )
+                    for rappatriement in rappatriements
+                )
 
             return True
 
         except Exception as e:
-            print(f"Erreur lors de l'export CSV: {e}")
+            logger.error("Erreur lors de l'export CSV: %s", e)
             return False
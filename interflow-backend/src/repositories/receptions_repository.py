@@ -1,13 +1,33 @@
 """
 Repository pour les réceptions
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from bisect import bisect_right
 from datetime import datetime
+from operator import attrgetter
+import numpy as np
 from repositories.base_repository import BaseRepository
 from repositories.storage_strategies import StorageStrategy
 from models.reception import Reception, EtatReception, TypeReception
 
 
+class _ColonnesReceptions(NamedTuple):
+    """Vue en colonnes des réceptions (une ligne par réception, dans l'ordre du repository)"""
+    quantite: np.ndarray  # float64
+    date_reception: np.ndarray  # datetime64[us], NaT si absente
+    en_cours: np.ndarray  # bool, état EN_COURS
+    code_mp: np.ndarray  # int32, codes de codes_mp
+    nom: np.ndarray  # int32, codes de noms
+    ordre: np.ndarray  # int32, codes de ordres
+    article: np.ndarray  # int32, codes de articles
+    poste: np.ndarray  # int32, codes de postes
+    codes_mp: Dict[str, int]
+    noms: Dict[str, int]
+    ordres: Dict[Optional[str], int]
+    articles: Dict[Optional[str], int]
+    postes: Dict[Optional[str], int]
+
+
 class ReceptionsRepository(BaseRepository[Reception]):
     """
     Repository pour les réceptions avec méthodes métier spécifiques
@@ -16,6 +36,160 @@ class ReceptionsRepository(BaseRepository[Reception]):
     def __init__(self, storage: StorageStrategy):
         super().__init__(Reception, storage, id_field="id")
 
+    def _get_index_by_etat(self) -> Dict[EtatReception, List[Reception]]:
+        """Index secondaire des réceptions par état"""
+        return self._derived("by_etat", lambda: self._group_by(attrgetter('etat')))
+
+    def _get_index_by_type(self) -> Dict[TypeReception, List[Reception]]:
+        """Index secondaire des réceptions par type"""
+        return self._derived("by_type", lambda: self._group_by(attrgetter('type')))
+
+    def _get_index_by_fournisseur(self) -> Dict[Optional[str], List[Reception]]:
+        """Index secondaire des réceptions par fournisseur"""
+        return self._derived("by_fournisseur", lambda: self._group_by(attrgetter('fournisseur')))
+
+    def _get_noms_matieres_minuscules(self) -> Dict[str, str]:
+        """Noms de matière en minuscules (par nom), calculés une fois par version des données"""
+        return self._derived("noms_matieres_minuscules", lambda: {
+            item.matiere.nom: item.matiere.nom.lower() for item in self.data if item.matiere
+        })
+
+    def _get_index_by_code_mp(self) -> Dict[Optional[str], List[Reception]]:
+        """Index secondaire des réceptions par code matière première"""
+        return self._derived("by_code_mp",
+                             lambda: self._group_by(lambda r: r.matiere.code_mp if r.matiere else None))
+
+    def _get_quantites_en_cours(self) -> Dict[str, float]:
+        """Quantité totale des réceptions en cours par code matière première (cumulée dans l'ordre des données)"""
+        def build() -> Dict[str, float]:
+            colonnes = self._get_colonnes()
+            codes = colonnes.code_mp[colonnes.en_cours]
+            # np.bincount cumule les poids dans l'ordre des lignes, comme une somme séquentielle
+            totaux = np.bincount(codes, weights=colonnes.quantite[colonnes.en_cours],
+                                 minlength=len(colonnes.codes_mp)).tolist()
+            presents = np.bincount(codes, minlength=len(colonnes.codes_mp))
+            return {code_mp: totaux[code] for code_mp, code in colonnes.codes_mp.items() if presents[code]}
+        return self._derived("quantites_en_cours", build)
+
+    def _get_index_en_cours_par_date(self) -> Tuple[List[datetime], List[int]]:
+        """
+        Index secondaire des réceptions en cours datées, triées par date de réception
+
+        Returns:
+            Tuple[List[datetime], List[int]]: Dates de réception croissantes et positions
+            correspondantes dans self.data
+        """
+        def build() -> Tuple[List[datetime], List[int]]:
+            en_cours = sorted((reception.date_reception, position)
+                              for position, reception in enumerate(self._get_all_view())
+                              if reception.etat is EtatReception.EN_COURS and reception.date_reception is not None)
+            return [date for date, _ in en_cours], [position for _, position in en_cours]
+        return self._derived("en_cours_par_date", build)
+
+    def _get_receptions_en_cours_jusqua(self, date_limite: datetime) -> List[Reception]:
+        """
+        Récupère les réceptions en cours dont la date de réception est inférieure ou égale à une date limite
+
+        Équivaut à filter_receptions_advanced(etat=EN_COURS, date_reception_fin=date_limite),
+        par recherche dichotomique dans l'index trié au lieu d'un parcours du groupe en cours.
+
+        Args:
+            date_limite: Date de réception maximale (incluse)
+
+        Returns:
+            List[Reception]: Réceptions correspondantes, dans l'ordre des données
+        """
+        dates, positions = self._get_index_en_cours_par_date()
+        receptions = self._get_all_view()
+        return [receptions[i] for i in sorted(positions[:bisect_right(dates, date_limite)])]
+
+    def _get_colonnes(self) -> _ColonnesReceptions:
+        """Vue en colonnes (tableaux NumPy) des réceptions, recalculée après modification"""
+        def build() -> _ColonnesReceptions:
+            receptions = self._get_all_view()
+            n = len(receptions)
+            codes_mp: Dict[str, int] = {}
+            noms: Dict[str, int] = {}
+            ordres: Dict[Optional[str], int] = {}
+            articles: Dict[Optional[str], int] = {}
+            postes: Dict[Optional[str], int] = {}
+            return _ColonnesReceptions(
+                quantite=np.fromiter((r.quantite for r in receptions), dtype=np.float64, count=n),
+                date_reception=np.array([r.date_reception for r in receptions], dtype="datetime64[us]"),
+                en_cours=np.fromiter((r.etat is EtatReception.EN_COURS for r in receptions), dtype=bool, count=n),
+                code_mp=np.fromiter((codes_mp.setdefault(r.matiere.code_mp, len(codes_mp)) for r in receptions),
+                                    dtype=np.int32, count=n),
+                nom=np.fromiter((noms.setdefault(r.matiere.nom, len(noms)) for r in receptions),
+                                dtype=np.int32, count=n),
+                ordre=np.fromiter((ordres.setdefault(r.ordre, len(ordres)) for r in receptions),
+                                  dtype=np.int32, count=n),
+                article=np.fromiter((articles.setdefault(r.article, len(articles)) for r in receptions),
+                                    dtype=np.int32, count=n),
+                poste=np.fromiter((postes.setdefault(r.poste, len(postes)) for r in receptions),
+                                  dtype=np.int32, count=n),
+                codes_mp=codes_mp,
+                noms=noms,
+                ordres=ordres,
+                articles=articles,
+                postes=postes,
+            )
+        return self._derived("colonnes", build)
+
+    def _indices_par_colonnes(self,
+                              nom_matiere: Optional[str] = None,
+                              quantite_min: Optional[float] = None,
+                              quantite_max: Optional[float] = None,
+                              date_reception_debut: Optional[datetime] = None,
+                              date_reception_fin: Optional[datetime] = None,
+                              ordre: Optional[str] = None,
+                              article: Optional[str] = None,
+                              poste: Optional[str] = None) -> np.ndarray:
+        """
+        Positions des réceptions satisfaisant les critères, calculées par masque vectorisé
+
+        Returns:
+            np.ndarray: Positions croissantes dans self.data
+        """
+        colonnes = self._get_colonnes()
+
+        # Critères d'égalité sur les colonnes codées : un code absent ne correspond à aucune ligne
+        egalites = [(colonne, codes.get(valeur, -1))
+                    for valeur, colonne, codes in ((ordre, colonnes.ordre, colonnes.ordres),
+                                                   (article, colonnes.article, colonnes.articles),
+                                                   (poste, colonnes.poste, colonnes.postes))
+                    if valeur is not None]
+        debut = np.datetime64(date_reception_debut, "us") if date_reception_debut is not None else None
+        fin = np.datetime64(date_reception_fin, "us") if date_reception_fin is not None else None
+        codes_noms = None
+        if nom_matiere is not None:
+            codes_noms = self._cles_contenant("texte_noms", colonnes.noms, nom_matiere.lower())
+
+        def masque_tranche(tranche: slice) -> np.ndarray:
+            masque = np.ones(tranche.stop - tranche.start, dtype=bool)
+
+            for colonne, code in egalites:
+                masque &= colonne[tranche] == code
+
+            if quantite_min is not None:
+                masque &= colonnes.quantite[tranche] >= quantite_min
+
+            if quantite_max is not None:
+                masque &= colonnes.quantite[tranche] <= quantite_max
+
+            # Les réceptions sans date de réception (NaT) ne satisfont aucune borne
+            if debut is not None:
+                masque &= colonnes.date_reception[tranche] >= debut
+
+            if fin is not None:
+                masque &= colonnes.date_reception[tranche] <= fin
+
+            if codes_noms is not None:
+                masque &= np.isin(colonnes.nom[tranche], codes_noms)
+
+            return masque
+
+        return self._positions_par_tranches(len(colonnes.quantite), masque_tranche)
+
     def get_receptions_list(self) -> List[Reception]:
         """
         Récupère toutes les réceptions
@@ -35,8 +209,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions correspondantes
         """
-        receptions = self.filter(etat=etat.value)
-        return receptions
+        return list(self._get_index_by_etat().get(etat, []))
 
     def get_receptions_by_matiere(self, code_mp: str) -> List[Reception]:
         """
@@ -48,9 +221,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions correspondantes
         """
-        receptions = self.get_all()
-        filtered_receptions = [reception for reception in receptions if reception.matiere.code_mp == code_mp]
-        return filtered_receptions
+        return list(self._get_index_by_code_mp().get(code_mp, []))
 
     def get_receptions_en_cours(self) -> List[Reception]:
         """
@@ -93,10 +264,32 @@ class ReceptionsRepository(BaseRepository[Reception]):
         reception = self.get_by_id(id)
         if reception:
             reception.etat = nouvel_etat
-            reception.date_modification = datetime.now().replace(tzinfo=None)
+            reception.date_modification = datetime.now()
             return self.update(id, reception)
         return None
 
+    def bulk_update_etat(self, ids: Iterable[str], nouvel_etat: EtatReception) -> List[Reception]:
+        """
+        Met à jour l'état de plusieurs réceptions avec une seule sauvegarde
+
+        Args:
+            ids: Identifiants des réceptions (les identifiants inconnus sont ignorés)
+            nouvel_etat: Le nouvel état des réceptions
+
+        Returns:
+            List[Reception]: Les réceptions mises à jour
+        """
+        maintenant = datetime.now()
+        mises_a_jour = []
+        with self.bulk():
+            for id in ids:
+                reception = self.get_by_id(id)
+                if reception:
+                    reception.etat = nouvel_etat
+                    reception.date_modification = maintenant
+                    mises_a_jour.append(self.update(id, reception))
+        return mises_a_jour
+
     def get_total_quantity_by_matiere(self, code_mp: str) -> float:
         """
         Calcule la quantité totale réceptionnée d'une matière
@@ -107,8 +300,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             float: La quantité totale réceptionnée
         """
-        receptions = self.get_receptions_en_cours()
-        return sum(reception.quantite for reception in receptions if reception.matiere.code_mp == code_mp)
+        return self._get_quantites_en_cours().get(code_mp, 0)
 
     def get_receptions_prestataires(self) -> List[Reception]:
         """
@@ -117,9 +309,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions prestataires
         """
-        receptions = self.get_all()
-        receptions = [reception for reception in receptions if reception.type == TypeReception.PRESTATAIRE]
-        return receptions
+        return self.get_receptions_by_type(TypeReception.PRESTATAIRE)
 
     def get_receptions_internes(self) -> List[Reception]:
         """
@@ -128,9 +318,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions internes
         """
-        receptions = self.get_all()
-        receptions = [reception for reception in receptions if reception.type == TypeReception.INTERNE]
-        return receptions
+        return self.get_receptions_by_type(TypeReception.INTERNE)
 
     def get_receptions_by_type(self, type_reception: TypeReception) -> List[Reception]:
         """
@@ -142,9 +330,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions du type spécifié
         """
-        receptions = self.get_all()
-        receptions = [reception for reception in receptions if reception.type == type_reception]
-        return receptions
+        return list(self._get_index_by_type().get(type_reception, []))
 
     def get_receptions_by_fournisseur(self, fournisseur: str) -> List[Reception]:
         """
@@ -156,9 +342,7 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions correspondantes
         """
-        receptions = self.get_all()
-        receptions = [reception for reception in receptions if reception.fournisseur == fournisseur]
-        return receptions
+        return list(self._get_index_by_fournisseur().get(fournisseur, []))
 
     def get_receptions_relachees(self) -> List[Reception]:
         """
@@ -219,59 +403,64 @@ class ReceptionsRepository(BaseRepository[Reception]):
         Returns:
             List[Reception]: Liste des réceptions filtrées
         """
-        receptions = self.get_all()
-        filtered_receptions = receptions
-
-        # Filtre par état
+        # Critères d'égalité indexés : partir du plus petit groupe d'index
+        candidats = []
         if etat is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.etat == etat]
-
-        # Filtre par code matière première
+            candidats.append(self._get_index_by_etat().get(etat, []))
         if code_mp is not None:
-            filtered_receptions = [c for c in filtered_receptions
-                                if c.matiere and c.matiere.code_mp == code_mp]
-
-        # Filtre par nom de matière (recherche partielle)
-        if nom_matiere is not None:
-            nom_lower = nom_matiere.lower()
-            filtered_receptions = [c for c in filtered_receptions
-                                if c.matiere and nom_lower in c.matiere.nom.lower()]
-
-        # Filtre par type de réception
+            candidats.append(self._get_index_by_code_mp().get(code_mp, []))
         if type_reception is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.type == type_reception]
-
-        # Filtre par fournisseur
+            candidats.append(self._get_index_by_type().get(type_reception, []))
         if fournisseur is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.fournisseur == fournisseur]
-
-        # Filtre par quantité
-        if quantite_min is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.quantite >= quantite_min]
-
-        if quantite_max is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.quantite <= quantite_max]
-
-        # Filtre par date de réception
-        if date_reception_debut is not None:
-            filtered_receptions = [c for c in filtered_receptions
-                                if c.date_reception >= date_reception_debut]
-
-        if date_reception_fin is not None:
-            filtered_receptions = [c for c in filtered_receptions
-                                if c.date_reception <= date_reception_fin]
-
-        # Filtre par ordre
-        if ordre is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.ordre == ordre]
-
-        # Filtre par article
-        if article is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.article == article]
-
-        # Filtre par poste
-        if poste is not None:
-            filtered_receptions = [c for c in filtered_receptions if c.poste == poste]
+            candidats.append(self._get_index_by_fournisseur().get(fournisseur, []))
+        if not candidats:
+            # Aucun index applicable : masque vectorisé sur la vue en colonnes
+            receptions = self._get_all_view()
+            return [receptions[i] for i in self._indices_par_colonnes(
+                nom_matiere, quantite_min, quantite_max, date_reception_debut, date_reception_fin,
+                ordre, article, poste).tolist()]
+        receptions = min(candidats, key=len)
+
+        nom_lower = nom_matiere.lower() if nom_matiere is not None else None
+        noms_minuscules = self._get_noms_matieres_minuscules() if nom_matiere is not None else None
+
+        # Un seul passage : égalités d'abord (les moins coûteuses), puis plages et recherche partielle
+        filtered_receptions = []
+        for c in receptions:
+            # États et types sont des membres d'Enum (singletons) : comparaison par identité
+            if etat is not None and c.etat is not etat:
+                continue
+            if code_mp is not None and not (c.matiere and c.matiere.code_mp == code_mp):
+                continue
+            if type_reception is not None and c.type is not type_reception:
+                continue
+            if fournisseur is not None and c.fournisseur != fournisseur:
+                continue
+            if ordre is not None and c.ordre != ordre:
+                continue
+            if article is not None and c.article != article:
+                continue
+            if poste is not None and c.poste != poste:
+                continue
+
+            # Filtre par quantité
+            if quantite_min is not None and not c.quantite >= quantite_min:
+                continue
+            if quantite_max is not None and not c.quantite <= quantite_max:
+                continue
+
+            # Filtre par date de réception (les réceptions sans date sont écartées)
+            if date_reception_debut is not None and not (c.date_reception and c.date_reception >= date_reception_debut):
+                continue
+            if date_reception_fin is not None and not (c.date_reception and c.date_reception <= date_reception_fin):
+                continue
+
+            # Filtre par nom de matière (recherche partielle)
+            if nom_lower is not None and not (c.matiere and nom_lower in (
+                    noms_minuscules.get(c.matiere.nom) or c.matiere.nom.lower())):
+                continue
+
+            filtered_receptions.append(c)
 
         return filtered_receptions
 
@@ -288,15 +477,12 @@ class ReceptionsRepository(BaseRepository[Reception]):
         """
         from datetime import timedelta
         if date_reference is None:
-            date_reference = datetime.now().replace(tzinfo=None)
+            date_reference = datetime.now()
         elif date_reference.tzinfo is not None:
             date_reference = date_reference.replace(tzinfo=None)
 
         date_limite = date_reference + timedelta(days=seuil_jours)
-        return self.filter_receptions_advanced(
-            date_reception_fin=date_limite,
-            etat=EtatReception.EN_COURS
-        )
+        return self._get_receptions_en_cours_jusqua(date_limite)
 
     def get_receptions_par_matiere(self, code_mp: str) -> List[Reception]:
         """
@@ -349,11 +535,8 @@ class ReceptionsRepository(BaseRepository[Reception]):
             List[Reception]: Liste des réceptions en retard
         """
         if date_reference is None:
-            date_reference = datetime.now().replace(tzinfo=None)
+            date_reference = datetime.now()
         elif date_reference.tzinfo is not None:
             date_reference = date_reference.replace(tzinfo=None)
 
-        return self.filter_receptions_advanced(
-            date_reception_fin=date_reference,
-            etat=EtatReception.EN_COURS
-        )
+        return self._get_receptions_en_cours_jusqua(date_reference)
@@ -1,10 +1,23 @@
 """
 Repository pour les stocks
 """
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
+from operator import attrgetter
+import numpy as np
 from repositories.base_repository import BaseRepository
 from repositories.storage_strategies import StorageStrategy
-from models.stock import Stock
+from models.stock import Stock, STOCK_LIST_ADAPTER
+
+
+class _ColonnesStocks(NamedTuple):
+    """Vue en colonnes des stocks (une ligne par stock, dans l'ordre du repository)"""
+    quantite: np.ndarray  # float64
+    exclu: np.ndarray  # bool, magasin 30
+    externe: np.ndarray  # bool, magasin commençant par "EX"
+    code_mp: np.ndarray  # int32, codes de codes_mp (None si pas de matière)
+    nom: np.ndarray  # int32, codes de noms (None si pas de matière)
+    codes_mp: Dict[Optional[str], int]
+    noms: Dict[Optional[str], int]
 
 
 class StocksRepository(BaseRepository[Stock]):
@@ -15,6 +28,130 @@ class StocksRepository(BaseRepository[Stock]):
     def __init__(self, storage: StorageStrategy):
         super().__init__(Stock, storage, id_field="id")
 
+    def _decode_items(self, raw_data: List[Dict[str, Any]]) -> List[Stock]:
+        """Valide tous les stocks chargés en un seul appel à pydantic-core"""
+        return STOCK_LIST_ADAPTER.validate_python(raw_data)
+
+    def _get_index_by_magasin(self) -> Dict[str, List[Stock]]:
+        """Index secondaire des stocks par magasin"""
+        return self._derived("by_magasin", lambda: self._group_by(attrgetter('magasin')))
+
+    def _get_index_by_statut_lot(self) -> Dict[str, List[Stock]]:
+        """Index secondaire des stocks par statut de lot"""
+        return self._derived("by_statut_lot", lambda: self._group_by(attrgetter('statut_lot')))
+
+    def _get_noms_matieres_minuscules(self) -> Dict[str, str]:
+        """Noms de matière en minuscules (par nom), calculés une fois par version des données"""
+        return self._derived("noms_matieres_minuscules", lambda: {
+            item.matiere.nom: item.matiere.nom.lower() for item in self.data if item.matiere
+        })
+
+    def _get_index_by_code_mp(self) -> Dict[Optional[str], List[Stock]]:
+        """Index secondaire des stocks par code matière première"""
+        return self._derived("by_code_mp",
+                             lambda: self._group_by(lambda s: s.matiere.code_mp if s.matiere else None))
+
+    def _get_quantites_par_matiere(self) -> Dict[str, List[float]]:
+        """
+        Quantités totales par code matière première, hors magasin 30
+
+        Returns:
+            Dict[str, List[float]]: code_mp -> [total, total interne, total externe],
+            cumulés dans l'ordre des données
+        """
+        def build() -> Dict[str, List[float]]:
+            colonnes = self._get_colonnes()
+            nb_codes = len(colonnes.codes_mp)
+            inclus = ~colonnes.exclu
+            internes = inclus & ~colonnes.externe
+            externes = inclus & colonnes.externe
+
+            # np.bincount cumule les poids dans l'ordre des lignes, comme une somme séquentielle
+            def cumul(masque: np.ndarray) -> List[float]:
+                return np.bincount(colonnes.code_mp[masque], weights=colonnes.quantite[masque],
+                                   minlength=nb_codes).tolist()
+            total, interne, externe = cumul(inclus), cumul(internes), cumul(externes)
+            presents = np.bincount(colonnes.code_mp[inclus], minlength=nb_codes)
+            return {code_mp: [total[code], interne[code], externe[code]]
+                    for code_mp, code in colonnes.codes_mp.items()
+                    if code_mp is not None and presents[code]}
+        return self._derived("quantites_par_matiere", build)
+
+    def _get_partition(self) -> Tuple[List[Stock], List[Stock], List[Stock]]:
+        """
+        Partition des stocks hors magasin 30, construite en un seul passage
+
+        Returns:
+            Tuple[List[Stock], List[Stock], List[Stock]]: (stocks inclus, stocks internes,
+            stocks externes), dans l'ordre des données
+        """
+        def build() -> Tuple[List[Stock], List[Stock], List[Stock]]:
+            inclus: List[Stock] = []
+            internes: List[Stock] = []
+            externes: List[Stock] = []
+            for stock in self._get_all_view():
+                if stock.est_exclu:
+                    continue
+                inclus.append(stock)
+                (externes if stock.est_externe else internes).append(stock)
+            return inclus, internes, externes
+        return self._derived("partition", build)
+
+    def _get_colonnes(self) -> _ColonnesStocks:
+        """Vue en colonnes (tableaux NumPy) des stocks, recalculée après modification"""
+        def build() -> _ColonnesStocks:
+            stocks = self._get_all_view()
+            n = len(stocks)
+            codes_mp: Dict[Optional[str], int] = {}
+            noms: Dict[Optional[str], int] = {}
+            return _ColonnesStocks(
+                quantite=np.fromiter((s.quantite for s in stocks), dtype=np.float64, count=n),
+                exclu=np.fromiter((s.est_exclu for s in stocks), dtype=bool, count=n),
+                externe=np.fromiter((s.est_externe for s in stocks), dtype=bool, count=n),
+                code_mp=np.fromiter((codes_mp.setdefault(s.matiere.code_mp if s.matiere else None, len(codes_mp))
+                                     for s in stocks), dtype=np.int32, count=n),
+                nom=np.fromiter((noms.setdefault(s.matiere.nom if s.matiere else None, len(noms)) for s in stocks),
+                                dtype=np.int32, count=n),
+                codes_mp=codes_mp,
+                noms=noms,
+            )
+        return self._derived("colonnes", build)
+
+    def _indices_par_colonnes(self,
+                              nom_matiere: Optional[str] = None,
+                              quantite_min: Optional[float] = None,
+                              quantite_max: Optional[float] = None,
+                              interne_only: Optional[bool] = None) -> np.ndarray:
+        """
+        Positions des stocks hors magasin 30 satisfaisant les critères, calculées par masque vectorisé
+
+        Returns:
+            np.ndarray: Positions croissantes dans self.data
+        """
+        colonnes = self._get_colonnes()
+        codes_noms = None
+        if nom_matiere is not None:
+            codes_noms = self._cles_contenant("texte_noms", colonnes.noms, nom_matiere.lower())
+
+        def masque_tranche(tranche: slice) -> np.ndarray:
+            masque = ~colonnes.exclu[tranche]
+
+            if interne_only is not None:
+                masque &= colonnes.externe[tranche] != interne_only
+
+            if quantite_min is not None:
+                masque &= colonnes.quantite[tranche] >= quantite_min
+
+            if quantite_max is not None:
+                masque &= colonnes.quantite[tranche] <= quantite_max
+
+            if codes_noms is not None:
+                masque &= np.isin(colonnes.nom[tranche], codes_noms)
+
+            return masque
+
+        return self._positions_par_tranches(len(colonnes.quantite), masque_tranche)
+
     def get_stocks_list(self) -> List[Stock]:
         """
         Récupère tous les stocks (en excluant le magasin 30)
@@ -22,8 +159,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Une liste de stocks
         """
-        stocks = self.get_all()
-        return [stock for stock in stocks if stock.magasin != "30"]
+        return list(self._get_partition()[0])
 
     def get_internal_stocks(self) -> List[Stock]:
         """
@@ -32,9 +168,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks internes
         """
-        stocks = self.get_stocks_list()
-        internal_stocks = [stock for stock in stocks if not stock.magasin.startswith("EX")]
-        return internal_stocks
+        return list(self._get_partition()[1])
 
     def get_external_stocks(self) -> List[Stock]:
         """
@@ -43,9 +177,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks externes
         """
-        stocks = self.get_stocks_list()
-        external_stocks = [stock for stock in stocks if stock.magasin.startswith("EX")]
-        return external_stocks
+        return list(self._get_partition()[2])
 
     def get_stocks_by_matiere(self, code_mp: str) -> List[Stock]:
         """
@@ -57,9 +189,8 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks correspondants
         """
-        stocks = self.get_all()
-        filtered_stocks = [stock for stock in stocks if stock.matiere and stock.matiere.code_mp == code_mp and stock.magasin != "30"]
-        return filtered_stocks
+        stocks = self._get_index_by_code_mp().get(code_mp, [])
+        return [stock for stock in stocks if not stock.est_exclu]
 
     def get_internal_stocks_by_matiere(self, code_mp: str) -> List[Stock]:
         """
@@ -72,7 +203,7 @@ class StocksRepository(BaseRepository[Stock]):
             List[Stock]: Liste des stocks internes de cette matière
         """
         stocks = self.get_stocks_by_matiere(code_mp)
-        internal_stocks = [stock for stock in stocks if not stock.magasin.startswith("EX")]
+        internal_stocks = [stock for stock in stocks if not stock.est_externe]
         return internal_stocks
 
     def get_external_stocks_by_matiere(self, code_mp: str) -> List[Stock]:
@@ -86,7 +217,7 @@ class StocksRepository(BaseRepository[Stock]):
             List[Stock]: Liste des stocks externes de cette matière
         """
         stocks = self.get_stocks_by_matiere(code_mp)
-        external_stocks = [stock for stock in stocks if stock.magasin.startswith("EX")]
+        external_stocks = [stock for stock in stocks if stock.est_externe]
         return external_stocks
 
     def get_stocks_by_magasin(self, magasin: str) -> List[Stock]:
@@ -99,9 +230,8 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks correspondants
         """
-        stocks = self.get_all()
-        stocks = [stock for stock in stocks if stock.magasin == magasin and stock.magasin != "30"]
-        return stocks
+        stocks = self._get_index_by_magasin().get(magasin, [])
+        return [stock for stock in stocks if not stock.est_exclu]
 
     def get_stocks_by_statut(self, statut_lot: str) -> List[Stock]:
         """
@@ -113,9 +243,8 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks correspondants
         """
-        stocks = self.get_all()
-        stocks = [stock for stock in stocks if stock.statut_lot == statut_lot and stock.magasin != "30"]
-        return stocks
+        stocks = self._get_index_by_statut_lot().get(statut_lot, [])
+        return [stock for stock in stocks if not stock.est_exclu]
 
     def filter_stocks(self, stocks: List[Stock], **filters) -> List[Stock]:
         """
@@ -129,16 +258,17 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Nouvelle liste contenant uniquement les stocks correspondant aux critères
         """
-        filtered_stocks = stocks
+        # On ignore les filtres None
+        criteres = {key: value for key, value in filters.items() if value is not None}
+        if not criteres:
+            return stocks
 
-        for key, value in filters.items():
-            if value is not None:  # On ignore les filtres None
-                filtered_stocks = [
-                    stock for stock in filtered_stocks
-                    if getattr(stock, key) == value
-                ]
-
-        return filtered_stocks
+        # Un seul accesseur (en C) pour toutes les clés : la ligne est comparée
+        # d'un bloc au tuple des valeurs attendues, sans getattr ni boucle par critère
+        cles = tuple(criteres)
+        accesseur = attrgetter(*cles)
+        attendu = criteres[cles[0]] if len(cles) == 1 else tuple(criteres.values())
+        return [stock for stock in stocks if accesseur(stock) == attendu]
 
     def update_quantity(self, id: str, nouvelle_quantite: float) -> Optional[Stock]:
         """
@@ -157,6 +287,25 @@ class StocksRepository(BaseRepository[Stock]):
             return self.update(id, stock)
         return None
 
+    def bulk_update_quantity(self, updates: Dict[str, float]) -> List[Stock]:
+        """
+        Met à jour la quantité de plusieurs stocks avec une seule sauvegarde
+
+        Args:
+            updates: Nouvelle quantité par identifiant de stock (les identifiants inconnus sont ignorés)
+
+        Returns:
+            List[Stock]: Les stocks mis à jour
+        """
+        mis_a_jour = []
+        with self.bulk():
+            for id, nouvelle_quantite in updates.items():
+                stock = self.get_by_id(id)
+                if stock:
+                    stock.quantite = nouvelle_quantite
+                    mis_a_jour.append(self.update(id, stock))
+        return mis_a_jour
+
     def get_total_quantity_by_matiere(self, code_mp: str) -> float:
         """
         Calcule la quantité totale d'une matière en stock
@@ -167,8 +316,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             float: La quantité totale
         """
-        stocks = self.get_stocks_by_matiere(code_mp)
-        return sum(stock.quantite for stock in stocks)
+        return self._get_quantites_par_matiere().get(code_mp, [0, 0, 0])[0]
 
     def get_total_internal_quantity_by_matiere(self, code_mp: str) -> float:
         """
@@ -180,8 +328,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             float: La quantité totale en stock interne
         """
-        stocks = self.get_internal_stocks_by_matiere(code_mp)
-        return sum(stock.quantite for stock in stocks)
+        return self._get_quantites_par_matiere().get(code_mp, [0, 0, 0])[1]
 
     def get_total_external_quantity_by_matiere(self, code_mp: str) -> float:
         """
@@ -193,8 +340,7 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             float: La quantité totale en stock externe
         """
-        stocks = self.get_external_stocks_by_matiere(code_mp)
-        return sum(stock.quantite for stock in stocks)
+        return self._get_quantites_par_matiere().get(code_mp, [0, 0, 0])[2]
 
     def import_from_file(self, file_path: str) -> None:
         """
@@ -256,46 +402,55 @@ class StocksRepository(BaseRepository[Stock]):
         Returns:
             List[Stock]: Liste des stocks filtrés
         """
-        stocks = self.get_all()
-        # Exclure le magasin 30 de manière systématique
-        filtered_stocks = [s for s in stocks if s.magasin != "30"]
-
-        # Filtre par code matière première
+        # Critères d'égalité indexés : partir du plus petit groupe d'index
+        candidats = []
         if code_mp is not None:
-            filtered_stocks = [s for s in filtered_stocks
-                             if s.matiere and s.matiere.code_mp == code_mp]
-
-        # Filtre par nom de matière (recherche partielle)
-        if nom_matiere is not None:
-            nom_lower = nom_matiere.lower()
-            filtered_stocks = [s for s in filtered_stocks
-                             if s.matiere and nom_lower in s.matiere.nom.lower()]
-
-        # Filtre par magasin
+            candidats.append(self._get_index_by_code_mp().get(code_mp, []))
         if magasin is not None:
-            filtered_stocks = [s for s in filtered_stocks if s.magasin == magasin]
-
-        # Filtre par statut de lot
+            candidats.append(self._get_index_by_magasin().get(magasin, []))
         if statut_lot is not None:
-            filtered_stocks = [s for s in filtered_stocks if s.statut_lot == statut_lot]
-
-        # Filtre par quantité
-        if quantite_min is not None:
-            filtered_stocks = [s for s in filtered_stocks if s.quantite >= quantite_min]
-
-        if quantite_max is not None:
-            filtered_stocks = [s for s in filtered_stocks if s.quantite <= quantite_max]
-
-        # Filtre par lot
-        if lot is not None:
-            filtered_stocks = [s for s in filtered_stocks if s.lot == lot]
-
-        # Filtre par type de stock (interne/externe)
-        if interne_only is not None:
-            if interne_only:
-                filtered_stocks = [s for s in filtered_stocks if not s.magasin.startswith("EX")]
-            else:
-                filtered_stocks = [s for s in filtered_stocks if s.magasin.startswith("EX")]
+            candidats.append(self._get_index_by_statut_lot().get(statut_lot, []))
+        if not candidats and lot is None:
+            # Aucun index applicable (le lot n'a pas de colonne) : masque vectorisé sur la vue en colonnes
+            stocks = self._get_all_view()
+            return [stocks[i] for i in self._indices_par_colonnes(
+                nom_matiere, quantite_min, quantite_max, interne_only).tolist()]
+        stocks = min(candidats, key=len) if candidats else self._get_all_view()
+
+        nom_lower = nom_matiere.lower() if nom_matiere is not None else None
+        noms_minuscules = self._get_noms_matieres_minuscules() if nom_matiere is not None else None
+
+        # Un seul passage : égalités d'abord (les moins coûteuses), puis plages et recherche partielle
+        filtered_stocks = []
+        for s in stocks:
+            # Exclure le magasin 30 de manière systématique
+            if s.est_exclu:
+                continue
+            if code_mp is not None and not (s.matiere and s.matiere.code_mp == code_mp):
+                continue
+            if magasin is not None and s.magasin != magasin:
+                continue
+            if statut_lot is not None and s.statut_lot != statut_lot:
+                continue
+            if lot is not None and s.lot != lot:
+                continue
+
+            # Filtre par type de stock (interne/externe)
+            if interne_only is not None and s.est_externe == interne_only:
+                continue
+
+            # Filtre par quantité
+            if quantite_min is not None and not s.quantite >= quantite_min:
+                continue
+            if quantite_max is not None and not s.quantite <= quantite_max:
+                continue
+
+            # Filtre par nom de matière (recherche partielle)
+            if nom_lower is not None and not (s.matiere and nom_lower in (
+                    noms_minuscules.get(s.matiere.nom) or s.matiere.nom.lower())):
+                continue
+
+            filtered_stocks.append(s)
 
         return filtered_stocks
 
@@ -1,27 +1,223 @@
 """
 Stratégies de stockage pour les repositories
 """
+import asyncio
 import json
 import sqlite3
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Sequence, Set, Tuple
 from abc import ABC, abstractmethod
 from pathlib import Path
 import logging
+import mmap
 import os
+import tempfile
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 
+try:
+    import orjson
+except ImportError:  # orjson est optionnel : repli sur le module json standard
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson est optionnel : repli sur le module json standard
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson est optionnel : load_iter JSON se replie sur un chargement complet
+    ijson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack est optionnel : requis seulement par MsgPackStorageStrategy
+    msgpack = None
+
+try:
+    import zstandard as zstd
+except ImportError:  # zstandard est optionnel : objets S3 stockés non compressés
+    zstd = None
+
 logger = logging.getLogger(__name__)
 
+# Résultats de load() par (chemin, signature du fichier) : date de modification et taille
+# en local, ETag/LastModified sur S3. Une écriture du fichier change la signature.
+# Taille à partir de laquelle un fichier JSON est projeté en mémoire plutôt que lu (mmap)
+MMAP_MIN_BYTES = 256 * 1024
+# Taille minimale d'un document pour passer par simdjson (en deçà, le coût d'appel domine)
+SIMDJSON_MIN_BYTES = 100 * 1024
+# Un parseur simdjson par thread : il n'est pas réentrant et réutilise son tampon interne
+_simdjson_local = threading.local()
+
+_LOAD_CACHE: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+_LOAD_CACHE_MAX = 32
+_load_cache_lock = threading.Lock()
+
+
+def _file_cache_key(path: str, *companions: str) -> Optional[tuple]:
+    """
+    Clé de cache d'un fichier local
+
+    Args:
+        path: Chemin du fichier
+        companions: Fichiers annexes dont l'état compte aussi (journal WAL SQLite...)
+
+    Returns:
+        Optional[tuple]: Chemin, date de modification et taille, None si le fichier est absent
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = [path, stat.st_mtime_ns, stat.st_size]
+    for companion in companions:
+        try:
+            stat = os.stat(companion)
+            key += [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            key += [None, None]
+    return tuple(key)
+
+
+def _cached_load(key: Optional[tuple], loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Retourne le résultat de loader() mis en cache sous key (sans cache si key est None)
+
+    Args:
+        key: Clé de cache, dont le premier élément identifie le fichier
+        loader: Chargement effectif des données
+
+    Returns:
+        List[Dict[str, Any]]: Copie de la liste des enregistrements
+    """
+    if key is None:
+        return loader()
+
+    with _load_cache_lock:
+        data = _LOAD_CACHE.get(key)
+        if data is not None:
+            _LOAD_CACHE.move_to_end(key)
+            return list(data)
+
+    data = loader()
+    with _load_cache_lock:
+        # Une seule version par fichier : écarter les signatures périmées
+        for stale in [k for k in _LOAD_CACHE if k[0] == key[0]]:
+            del _LOAD_CACHE[stale]
+        _LOAD_CACHE[key] = data
+        while len(_LOAD_CACHE) > _LOAD_CACHE_MAX:
+            _LOAD_CACHE.popitem(last=False)
+    return list(data)
+
+
+def _invalidate_load_cache(identifier: Optional[str] = None) -> None:
+    """
+    Invalide le cache de load() pour un fichier, ou en totalité
+
+    Args:
+        identifier: Chemin (ou URI S3) du fichier, None pour tout vider
+    """
+    with _load_cache_lock:
+        if identifier is None:
+            _LOAD_CACHE.clear()
+            return
+        for key in [k for k in _LOAD_CACHE if k[0] == identifier]:
+            del _LOAD_CACHE[key]
+
+
+def _json_dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Sérialise un objet en JSON UTF-8 (orjson si disponible)
+
+    Args:
+        obj: Objet à sérialiser
+        pretty: Indente le document (2 espaces) au lieu de la sortie compacte
+
+    Returns:
+        bytes: Document JSON encodé en UTF-8
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, ensure_ascii=False, default=str, indent=2 if pretty else None).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Désérialise un document JSON
+
+    orjson est utilisé s'il est disponible ; à défaut, les gros documents passent
+    par simdjson, plus rapide que le module standard.
+
+    Args:
+        data: Document JSON encodé en UTF-8
+
+    Returns:
+        Any: Objet désérialisé
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if simdjson is not None and len(data) >= SIMDJSON_MIN_BYTES:
+        parser = getattr(_simdjson_local, 'parser', None)
+        if parser is None:
+            parser = _simdjson_local.parser = simdjson.Parser()
+        document = parser.parse(data)
+        # Conversion complète en objets Python avant la prochaine analyse du parseur
+        if isinstance(document, simdjson.Array):
+            return document.as_list()
+        if isinstance(document, simdjson.Object):
+            return document.as_dict()
+        return document
+    return json.loads(data)
+
 
 class StorageStrategy(ABC):
     """
     Interface pour les stratégies de stockage
     """
 
+    # Chemins résolus par (file_path, extension), créé à la première résolution
+    _path_cache: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None
+
+    def _resolve(self, file_path: str, extension: str = "") -> Tuple[str, str]:
+        """
+        Résout le chemin complet d'un fichier de stockage
+
+        Le répertoire parent n'est créé qu'à la première résolution d'un chemin,
+        les appels suivants ne font plus d'appel système.
+
+        Args:
+            file_path: Chemin de base du fichier
+            extension: Extension à ajouter (".json", ".db"...)
+
+        Returns:
+            Tuple[str, str]: Chemin complet et nom du fichier sans extension
+        """
+        if self._path_cache is None:
+            self._path_cache = {}
+        key = (file_path, extension)
+        resolved = self._path_cache.get(key)
+        if resolved is None:
+            path = Path(f"{file_path}{extension}")
+            # Créer le répertoire parent si nécessaire
+            path.parent.mkdir(parents=True, exist_ok=True)
+            resolved = self._path_cache[key] = (str(path), path.stem)
+        return resolved
+
     @abstractmethod
-    def save(self, data: List[Dict[str, Any]], file_path: str) -> None:
-        """Sauvegarde les données"""
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
+        """Sauvegarde les données (liste ou itérable d'enregistrements)"""
         pass
 
     @abstractmethod
@@ -29,33 +225,168 @@ class StorageStrategy(ABC):
         """Charge les données"""
         pass
 
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Charge les données enregistrement par enregistrement
+
+        Par défaut, parcourt le résultat de load() ; les stratégies capables de lire
+        en flux le redéfinissent pour ne pas matérialiser tout le fichier.
+
+        Args:
+            file_path: Chemin de base du fichier
+
+        Returns:
+            Iterator[Dict[str, Any]]: Enregistrements
+        """
+        return iter(self.load(file_path))
+
     @abstractmethod
     def flush(self) -> None:
         """Vide les données"""
         pass
 
+    def save_models(self, items: Sequence[Any], adapter: Any, file_path: str) -> None:
+        """
+        Sauvegarde une liste de modèles Pydantic
+
+        Par défaut chaque modèle est converti via model_dump() puis passé à save().
+
+        Args:
+            items: Modèles à sauvegarder
+            adapter: TypeAdapter de la liste de modèles (utilisable pour une sérialisation groupée)
+            file_path: Chemin de base du fichier
+        """
+        self.save((item.model_dump() for item in items), file_path)
+
 
 class JSONStorageStrategy(StorageStrategy):
     """
     Stratégie de stockage en JSON
+
+    La sortie est compacte par défaut ; pretty=True l'indente pour le débogage.
+    Avec compress=True, les fichiers sont écrits compressés en zstd (.json.zst) ;
+    le chargement accepte les deux variantes, celle du mode choisi en priorité.
     """
 
-    def save(self, data: List[Dict[str, Any]], file_path: str) -> None:
-        """Sauvegarde les données en JSON"""
+    # Tampon d'écriture : limite le nombre d'appels système write()
+    WRITE_BUFFER_SIZE = 1 << 20
+    # Compression zstd (niveau 3, tous les cœurs)
+    ZSTD_LEVEL = 3
+
+    def __init__(self, compress: bool = False, pretty: bool = False):
+        """
+        Initialise la stratégie JSON
+
+        Args:
+            compress: Écrit des fichiers .json.zst compressés en zstd
+            pretty: Indente le JSON écrit (lisible, mais plus volumineux et plus lent)
+        """
+        if compress and zstd is None:
+            raise ImportError("zstandard requis pour la compression JSON. Installez: pip install zstandard")
+        self.compress = compress
+        self.pretty = pretty
+
+    def _write_path(self, file_path: str) -> str:
+        """Chemin du fichier écrit, selon le mode de compression"""
+        path, _ = self._resolve(file_path, ".json.zst" if self.compress else ".json")
+        return path
+
+    def _read_path(self, file_path: str) -> str:
+        """Chemin du fichier à lire : variante du mode choisi si elle existe, sinon l'autre"""
+        json_path, _ = self._resolve(file_path, ".json")
+        zst_path, _ = self._resolve(file_path, ".json.zst")
+        preferred, other = (zst_path, json_path) if self.compress else (json_path, zst_path)
+        return preferred if os.path.exists(preferred) or not os.path.exists(other) else other
+
+    @contextmanager
+    def _open_writer(self, path: str) -> Iterator[Any]:
+        """
+        Ouvre le fichier en écriture tamponnée, à travers le compresseur zstd si demandé
+
+        L'écriture se fait dans un fichier temporaire qui remplace la cible (os.replace)
+        une fois complet : une erreur en cours d'écriture laisse l'ancien fichier intact.
+        """
+        tmp_path = f"{path}.tmp"
         try:
-            # Créer le répertoire parent si nécessaire
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as file:
+                if not self.compress:
+                    yield file
+                else:
+                    compressor = zstd.ZstdCompressor(level=self.ZSTD_LEVEL, threads=-1)
+                    with compressor.stream_writer(file, closefd=False) as writer:
+                        yield writer
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
-            with open(f"{file_path}.json", 'w', encoding='utf-8') as file:
-                json.dump(data, file, ensure_ascii=False, indent=2, default=str)
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
+        """Sauvegarde les données en JSON compact, un enregistrement par ligne"""
+        try:
+            json_path = self._write_path(file_path)
+
+            with self._open_writer(json_path) as file:
+                separator = b'[\n'
+                for item in data:
+                    file.write(separator)
+                    file.write(_json_dumps(item, self.pretty))
+                    separator = b',\n'
+                file.write(b'[]' if separator == b'[\n' else b'\n]')
+            _invalidate_load_cache(json_path)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde JSON: {e}")
+
+    def save_models(self, items: Sequence[Any], adapter: Any, file_path: str) -> None:
+        """Sauvegarde les modèles en JSON en une seule sérialisation pydantic-core"""
+        try:
+            json_path = self._write_path(file_path)
+
+            with self._open_writer(json_path) as file:
+                file.write(adapter.dump_json(items, indent=2 if self.pretty else None))
+            _invalidate_load_cache(json_path)
         except Exception as e:
             print(f"Erreur lors de la sauvegarde JSON: {e}")
 
     def load(self, file_path: str) -> List[Dict[str, Any]]:
-        """Charge les données depuis un fichier JSON"""
+        """Charge les données depuis un fichier JSON (en cache tant que le fichier est inchangé)"""
+        json_path = self._read_path(file_path)
+        return _cached_load(_file_cache_key(json_path), lambda: self._read(json_path))
+
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Charge les données en flux avec ijson (chargement complet si ijson est absent)"""
+        if ijson is None:
+            yield from self.load(file_path)
+            return
+        json_path = self._read_path(file_path)
+        try:
+            file = open(json_path, 'rb')
+        except FileNotFoundError:
+            return
+        with file:
+            if json_path.endswith('.zst'):
+                with zstd.ZstdDecompressor().stream_reader(file) as reader:
+                    yield from ijson.items(reader, 'item', use_float=True)
+            else:
+                yield from ijson.items(file, 'item', use_float=True)
+
+    def _read(self, json_path: str) -> List[Dict[str, Any]]:
+        """Lit et décode le fichier JSON (compressé ou non)"""
         try:
-            with open(f"{file_path}.json", 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            with open(json_path, 'rb') as file:
+                if json_path.endswith('.zst'):
+                    if zstd is None:
+                        raise RuntimeError("Fichier compressé en zstd : installez zstandard (pip install zstandard)")
+                    data = _json_loads(zstd.ZstdDecompressor().decompressobj().decompress(file.read()))
+                elif orjson is not None and os.fstat(file.fileno()).st_size >= MMAP_MIN_BYTES:
+                    # orjson lit directement les pages du fichier, sans copie en bytes
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                            memoryview(mapped) as view:
+                        data = orjson.loads(view)
+                else:
+                    data = _json_loads(file.read())
                 return data if isinstance(data, list) else []
         except FileNotFoundError:
             return []
@@ -68,7 +399,73 @@ class JSONStorageStrategy(StorageStrategy):
         # Dans un contexte de flush, on n'a pas accès au file_path
         # donc on ne peut pas supprimer le fichier directement ici
         # Cette méthode sera appelée avec un file_path par BaseRepository
-        pass
+        _invalidate_load_cache()
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """Convertit les objets non gérés par MessagePack (modèles Pydantic, dates...)"""
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    return str(obj)
+
+
+class MsgPackStorageStrategy(StorageStrategy):
+    """
+    Stratégie de stockage binaire en MessagePack
+
+    Plus compacte et plus rapide à écrire et relire que JSON, pour les données
+    qui ne sont pas destinées à être lues telles quelles. Les enregistrements
+    sont écrits à la suite les uns des autres dans un fichier .msgpack.
+    """
+
+    def __init__(self):
+        """Initialise la stratégie MessagePack"""
+        if msgpack is None:
+            raise ImportError("msgpack requis pour MsgPackStorageStrategy. Installez: pip install msgpack")
+
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
+        """Sauvegarde les données en MessagePack, enregistrement par enregistrement"""
+        try:
+            msgpack_path, _ = self._resolve(file_path, ".msgpack")
+            packer = msgpack.Packer(default=_msgpack_default, use_bin_type=True)
+
+            with open(msgpack_path, 'wb') as file:
+                for item in data:
+                    file.write(packer.pack(item))
+            _invalidate_load_cache(msgpack_path)
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde MessagePack: {e}")
+
+    def load(self, file_path: str) -> List[Dict[str, Any]]:
+        """Charge les données depuis un fichier MessagePack (en cache tant que le fichier est inchangé)"""
+        msgpack_path, _ = self._resolve(file_path, ".msgpack")
+        return _cached_load(_file_cache_key(msgpack_path), lambda: self._read(file_path))
+
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Charge les données en flux, enregistrement par enregistrement"""
+        msgpack_path, _ = self._resolve(file_path, ".msgpack")
+        try:
+            file = open(msgpack_path, 'rb')
+        except FileNotFoundError:
+            return
+        with file:
+            yield from msgpack.Unpacker(file, raw=False)
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
+        """Lit et décode le fichier MessagePack"""
+        try:
+            msgpack_path, _ = self._resolve(file_path, ".msgpack")
+            with open(msgpack_path, 'rb') as file:
+                return list(msgpack.Unpacker(file, raw=False))
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Erreur lors du chargement MessagePack: {e}")
+            return []
+
+    def flush(self) -> None:
+        """Vide les données (seul le cache de chargement est à vider pour MessagePack)"""
+        _invalidate_load_cache()
 
 
 class CSVStorageStrategy(StorageStrategy):
@@ -76,29 +473,49 @@ class CSVStorageStrategy(StorageStrategy):
     Stratégie de stockage en CSV
     """
 
-    def save(self, data: List[Dict[str, Any]], file_path: str) -> None:
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
         """Sauvegarde les données en CSV"""
         try:
             import csv
 
-            # Créer le répertoire parent si nécessaire
-            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            csv_path, _ = self._resolve(file_path, ".csv")
 
-            if data:
-                fieldnames = data[0].keys()
-                with open(f"{file_path}.csv", 'w', newline='', encoding='utf-8') as file:
+            rows = iter(data)
+            first = next(rows, None)
+            if first is not None:
+                fieldnames = first.keys()
+                with open(csv_path, 'w', newline='', encoding='utf-8') as file:
                     writer = csv.DictWriter(file, fieldnames=fieldnames)
                     writer.writeheader()
-                    writer.writerows(data)
+                    writer.writerows(chain([first], rows))
+            _invalidate_load_cache(csv_path)
         except Exception as e:
             print(f"Erreur lors de la sauvegarde CSV: {e}")
 
     def load(self, file_path: str) -> List[Dict[str, Any]]:
-        """Charge les données depuis un fichier CSV"""
+        """Charge les données depuis un fichier CSV (en cache tant que le fichier est inchangé)"""
+        csv_path, _ = self._resolve(file_path, ".csv")
+        return _cached_load(_file_cache_key(csv_path), lambda: self._read(file_path))
+
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Charge les données en flux, ligne par ligne"""
+        import csv
+
+        csv_path, _ = self._resolve(file_path, ".csv")
+        try:
+            file = open(csv_path, 'r', newline='', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with file:
+            yield from csv.DictReader(file)
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
+        """Lit le fichier CSV"""
         try:
             import csv
 
-            with open(f"{file_path}.csv", 'r', encoding='utf-8') as file:
+            csv_path, _ = self._resolve(file_path, ".csv")
+            with open(csv_path, 'r', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
                 return list(reader)
         except FileNotFoundError:
@@ -108,19 +525,104 @@ class CSVStorageStrategy(StorageStrategy):
             return []
 
     def flush(self) -> None:
-        """Vide les données (pas d'action nécessaire pour CSV)"""
-        pass
+        """Vide les données (seul le cache de chargement est à vider pour CSV)"""
+        _invalidate_load_cache()
+
+
+def _quote_identifier(name: str) -> str:
+    """Cite un identifiant SQLite (table, colonne, index) en doublant les guillemets internes"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sqlite_json(value: Any) -> Any:
+    """Convertit une valeur (dict, liste, modèle Pydantic...) en texte JSON compact pour SQLite"""
+    if value is None:
+        return None
+    if hasattr(value, 'model_dump'):  # Objets Pydantic
+        value = value.model_dump()
+    return _json_dumps(value).decode('utf-8')
+
+
+def _sqlite_converter(column: str, sample: Any, json_columns: Set[str],
+                      text_columns: Set[str]) -> Callable[[Any], Any]:
+    """
+    Choisit le convertisseur d'une colonne d'après sa première valeur
+
+    Une colonne dont la première valeur est structurée est entièrement encodée en JSON.
+    Sinon chaque valeur est convertie selon son type : la colonne est notée dans
+    text_columns et, si une valeur structurée apparaît, dans json_columns (colonne mixte).
+
+    Args:
+        column: Nom de la colonne
+        sample: Valeur de la colonne dans le premier enregistrement
+        json_columns: Colonnes ayant reçu au moins une valeur JSON, complété au fil de la conversion
+        text_columns: Colonnes ayant reçu au moins une valeur texte, complété au fil de la conversion
+
+    Returns:
+        Callable[[Any], Any]: Convertisseur valeur Python -> valeur SQLite
+    """
+    if isinstance(sample, (dict, list)) or hasattr(sample, 'model_dump'):
+        json_columns.add(column)
+        return _sqlite_json
+
+    def convert(value: Any) -> Any:
+        if value is None:
+            return None
+        if type(value) is not str and (isinstance(value, (dict, list)) or hasattr(value, 'model_dump')):
+            json_columns.add(column)
+            return _sqlite_json(value)
+        text_columns.add(column)
+        return str(value)
+
+    return convert
+
+
+def _decode_json_cell(value: Any) -> Any:
+    """Décode une valeur d'une colonne JSON, conservée telle quelle si elle n'est pas du JSON valide"""
+    if type(value) is not str or not value:
+        return value
+    try:
+        return _json_loads(value)
+    except ValueError:
+        logger.warning(f"Valeur JSON invalide conservée telle quelle: {value[:80]!r}")
+        return value
+
+
+def _decode_mixed_cell(value: Any) -> Any:
+    """Décode une valeur d'une colonne mixte si elle a la forme d'un objet ou d'une liste JSON"""
+    if type(value) is str and value[:1] in ('{', '[') and value[-1:] in ('}', ']'):
+        try:
+            return _json_loads(value)
+        except ValueError:
+            pass  # Texte entre accolades ou crochets, pas du JSON
+    return value
 
 
 class SQLiteStorageStrategy(StorageStrategy):
     """
     Stratégie de stockage en SQLite pour de meilleures performances avec de gros volumes
     """
+
+    # Table annexe listant, par table, les colonnes stockées en JSON
+    JSON_COLUMNS_TABLE = "_json_columns"
+
+    # Réglages appliqués à chaque connexion : journal WAL sans fsync à chaque commit,
+    # temporaires en mémoire, cache de 64 Mo et lecture par mmap (256 Mo)
+    CONNECTION_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA mmap_size=268435456",
+    )
     
     def __init__(self):
         """Initialise la stratégie SQLite"""
         self.connection = None
         self.current_file_path = None
+        # Requêtes d'insertion par (table, colonnes) : texte identique d'une sauvegarde à
+        # l'autre, donc servi par le cache d'instructions préparées de la connexion
+        self._stmt_cache: Dict[Tuple[str, Tuple[str, ...]], str] = {}
     
     def _get_connection(self, file_path: str) -> sqlite3.Connection:
         """
@@ -137,36 +639,31 @@ class SQLiteStorageStrategy(StorageStrategy):
             return self.connection
             
         # Créer le répertoire parent si nécessaire
-        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        self._resolve(file_path)
         
         # Fermer l'ancienne connexion si elle existe
         if self.connection:
             self.connection.close()
             
         # Créer une nouvelle connexion
-        self.connection = sqlite3.connect(file_path, check_same_thread=False)
+        self.connection = sqlite3.connect(file_path, check_same_thread=False, cached_statements=256)
         self.connection.row_factory = sqlite3.Row  # Pour avoir des dictionnaires
+        for pragma in self.CONNECTION_PRAGMAS:
+            self.connection.execute(pragma)
         self.current_file_path = file_path
         
         return self.connection
     
-    def _create_table(self, file_path: str, table_name: str, data: List[Dict[str, Any]]) -> None:
+    def _create_table(self, cursor: sqlite3.Cursor, table_name: str, sample_item: Dict[str, Any]) -> None:
         """
         Crée la table SQLite basée sur la structure des données
         
         Args:
-            file_path: Chemin vers le fichier de base de données
+            cursor: Curseur sur la base (dans la transaction d'écriture)
             table_name: Nom de la table
-            data: Données pour déterminer la structure
+            sample_item: Enregistrement servant à déterminer la structure
         """
-        if not data:
-            return
-            
-        conn = self._get_connection(file_path)
-        cursor = conn.cursor()
-        
         # Analyser la structure des données pour créer la table
-        sample_item = data[0]
         columns = []
         
         for key, value in sample_item.items():
@@ -181,105 +678,217 @@ class SQLiteStorageStrategy(StorageStrategy):
             else:
                 col_type = "TEXT"  # Fallback pour les autres types
                 
-            columns.append(f'"{key}" {col_type}')
+            columns.append(f'{_quote_identifier(key)} {col_type}')
         
         # Créer la table
-        create_sql = f'CREATE TABLE IF NOT EXISTS "{table_name}" (\n' + ',\n'.join(columns) + '\n)'
+        create_sql = f'CREATE TABLE {_quote_identifier(table_name)} (\n' + ',\n'.join(columns) + '\n)'
         cursor.execute(create_sql)
-        
+
+    def _create_indexes(self, cursor: sqlite3.Cursor, table_name: str, sample_item: Dict[str, Any]) -> None:
+        """
+        Crée les index de la table
+
+        Args:
+            cursor: Curseur sur la base (dans la transaction d'écriture)
+            table_name: Nom de la table
+            sample_item: Enregistrement donnant les colonnes de la table
+        """
         # Créer un index sur l'ID si il existe
         if 'id' in sample_item:
-            cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{table_name}_id ON "{table_name}" (id)')
-        
-        conn.commit()
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {_quote_identifier(f"idx_{table_name}_id")} '
+                f'ON {_quote_identifier(table_name)} (id)'
+            )
     
-    def save(self, data: List[Dict[str, Any]], file_path: str) -> None:
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
         """Sauvegarde les données en SQLite"""
         try:
-            if not data:
+            rows = iter(data)
+            first = next(rows, None)
+            if first is None:
                 return
                 
             # Déterminer le nom de la table à partir du nom du fichier
-            table_name = Path(f"{file_path}.db").stem
-            
-            # Créer la table
-            self._create_table(f"{file_path}.db", table_name, data)
+            db_path, table_name = self._resolve(file_path, ".db")
+            # Les données sont écrites dans une table de travail qui remplace ensuite la table
+            # existante : pas de suppression ligne à ligne journalisée
+            staging_name = f"{table_name}__new"
             
-            conn = self._get_connection(f"{file_path}.db")
+            conn = self._get_connection(db_path)
             cursor = conn.cursor()
-            
-            # Vider la table existante
-            cursor.execute(f'DELETE FROM "{table_name}"')
-            
-            # Préparer les colonnes et les valeurs
-            columns = list(data[0].keys())
-            placeholders = ', '.join(['?' for _ in columns])
-            columns_str = ', '.join([f'"{col}"' for col in columns])
-            
-            insert_sql = f'INSERT INTO "{table_name}" ({columns_str}) VALUES ({placeholders})'
-            
-            # Insérer les données par batch pour de meilleures performances
-            batch_size = 1000
-            for i in range(0, len(data), batch_size):
-                batch = data[i:i + batch_size]
-                batch_values = []
-                
-                for item in batch:
-                    values = []
-                    for col in columns:
-                        value = item.get(col)
-                        # Convertir les objets complexes en JSON
-                        if isinstance(value, (dict, list)):
-                            value = json.dumps(value, default=str)
-                        elif hasattr(value, 'model_dump'):  # Objets Pydantic
-                            value = json.dumps(value.model_dump(), default=str)
-                        elif value is None:
-                            value = None
-                        else:
-                            value = str(value)
-                        values.append(value)
-                    batch_values.append(tuple(values))
-                
-                cursor.executemany(insert_sql, batch_values)
-            
-            conn.commit()
-            logger.info(f"✅ {len(data)} enregistrements sauvegardés dans SQLite: {file_path}")
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                total = self._replace_table(cursor, table_name, staging_name, first, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            _invalidate_load_cache(db_path)
+            logger.info(f"✅ {total} enregistrements sauvegardés dans SQLite: {file_path}")
             
         except Exception as e:
             logger.error(f"Erreur lors de la sauvegarde SQLite: {e}")
             raise
+
+    def _replace_table(self, cursor: sqlite3.Cursor, table_name: str, staging_name: str,
+                       first: Dict[str, Any], rows: Iterator[Dict[str, Any]]) -> int:
+        """
+        Remplit une table de travail puis la substitue à la table existante
+
+        Args:
+            cursor: Curseur sur la base, dans une transaction ouverte
+            table_name: Nom de la table à remplacer
+            staging_name: Nom de la table de travail
+            first: Premier enregistrement (détermine la structure)
+            rows: Enregistrements suivants
+
+        Returns:
+            int: Nombre d'enregistrements écrits
+        """
+        cursor.execute(f'DROP TABLE IF EXISTS {_quote_identifier(staging_name)}')
+        self._create_table(cursor, staging_name, first)
+
+        # Préparer les colonnes et les valeurs
+        columns = list(first.keys())
+        insert_sql = self._insert_sql(staging_name, columns)
+
+        # Convertisseurs par position de colonne, choisis d'après le premier enregistrement
+        json_columns = set()
+        text_columns = set()
+        converters = [_sqlite_converter(col, first.get(col), json_columns, text_columns) for col in columns]
+        # Extraction de toutes les valeurs d'un enregistrement en un seul appel
+        getter = itemgetter(*columns)
+        if len(columns) == 1:
+            getter = lambda item, _get=getter: (_get(item),)
+        total = 0
+
+        def row_iter() -> Iterator[tuple]:
+            nonlocal total
+            for item in chain([first], rows):
+                total += 1
+                try:
+                    values = getter(item)
+                except KeyError:  # Enregistrement incomplet
+                    values = [item.get(col) for col in columns]
+                yield tuple([convert(value) for convert, value in zip(converters, values)])
+
+        # Insertion en flux dans la table de travail
+        cursor.executemany(insert_sql, row_iter())
+
+        # Substitution de la table, puis index (créés en une passe sur les données complètes)
+        cursor.execute(f'DROP TABLE IF EXISTS {_quote_identifier(table_name)}')
+        cursor.execute(f'ALTER TABLE {_quote_identifier(staging_name)} RENAME TO {_quote_identifier(table_name)}')
+        self._create_indexes(cursor, table_name, first)
+
+        # Mémoriser les colonnes JSON pour ne décoder qu'elles au chargement : entièrement
+        # JSON (décodées d'un bloc) ou mixtes (décodées valeur par valeur)
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {_quote_identifier(self.JSON_COLUMNS_TABLE)} '
+            '(table_name TEXT PRIMARY KEY, cols TEXT)'
+        )
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {_quote_identifier(self.JSON_COLUMNS_TABLE)} (table_name, cols) VALUES (?, ?)',
+            (table_name, json.dumps({
+                "json": [col for col in columns if col in json_columns and col not in text_columns],
+                "mixed": [col for col in columns if col in json_columns and col in text_columns],
+            }))
+        )
+        return total
+
+    def _insert_sql(self, table_name: str, columns: List[str]) -> str:
+        """
+        Requête d'insertion d'une table, construite une fois par jeu de colonnes
+
+        Args:
+            table_name: Nom de la table
+            columns: Colonnes insérées, dans l'ordre des valeurs
+
+        Returns:
+            str: Requête INSERT paramétrée
+        """
+        key = (table_name, tuple(columns))
+        insert_sql = self._stmt_cache.get(key)
+        if insert_sql is None:
+            placeholders = ', '.join(['?' for _ in columns])
+            columns_str = ', '.join([_quote_identifier(col) for col in columns])
+            insert_sql = f'INSERT INTO {_quote_identifier(table_name)} ({columns_str}) VALUES ({placeholders})'
+            self._stmt_cache[key] = insert_sql
+        return insert_sql
     
     def load(self, file_path: str) -> List[Dict[str, Any]]:
-        """Charge les données depuis une base SQLite"""
+        """Charge les données depuis une base SQLite (en cache tant que la base est inchangée)"""
+        db_path, _ = self._resolve(file_path, ".db")
+        # En mode WAL, les écritures récentes sont dans le journal et pas encore dans la base
+        return _cached_load(_file_cache_key(db_path, f"{db_path}-wal"), lambda: self._read(file_path))
+
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Charge les données en parcourant le curseur, sans fetchall()"""
+        db_path, table_name = self._resolve(file_path, ".db")
+        if not os.path.exists(db_path):
+            return
+
+        conn = self._get_connection(db_path)
+        cursor = conn.cursor()
+
+        # Vérifier que la table existe
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+        if not cursor.fetchone():
+            return
+
+        rows = conn.execute(f'SELECT * FROM {_quote_identifier(table_name)}')
+        first = rows.fetchone()
+        if first is None:
+            return
+        json_columns, mixed_columns = self._get_json_columns(cursor, table_name, first)
+        for row in chain([first], rows):
+            item = dict(row)
+            for key in json_columns:
+                item[key] = _decode_json_cell(item[key])
+            for key in mixed_columns:
+                item[key] = _decode_mixed_cell(item[key])
+            yield item
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
+        """Lit la table de la base SQLite"""
         try:
-            if not Path(f"{file_path}.db").exists():
+            db_path, table_name = self._resolve(file_path, ".db")
+            if not os.path.exists(db_path):
                 return []
                 
-            table_name = Path(f"{file_path}.db").stem
-            conn = self._get_connection(f"{file_path}.db")
+            conn = self._get_connection(db_path)
             cursor = conn.cursor()
             
             # Vérifier que la table existe
-            cursor.execute(f'SELECT name FROM sqlite_master WHERE type="table" AND name="{table_name}"')
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
             if not cursor.fetchone():
                 return []
             
             # Charger toutes les données
-            cursor.execute(f'SELECT * FROM "{table_name}"')
+            cursor.execute(f'SELECT * FROM {_quote_identifier(table_name)}')
             rows = cursor.fetchall()
             
-            # Convertir les Row en dictionnaires
-            data = []
-            for row in rows:
-                item = dict(row)
-                # Essayer de parser les champs JSON
-                for key, value in item.items():
-                    if isinstance(value, str) and value.startswith('{') and value.endswith('}'):
-                        try:
-                            item[key] = json.loads(value)
-                        except json.JSONDecodeError:
-                            pass  # Garder la valeur string si ce n'est pas du JSON valide
-                data.append(item)
+            # Convertir les Row en dictionnaires, en ne décodant que les colonnes JSON
+            json_columns, mixed_columns = self._get_json_columns(cursor, table_name, rows[0] if rows else None)
+            data = list(map(dict, rows))
+            for key in json_columns:
+                values = [item[key] for item in data]
+                try:
+                    # Toute la colonne décodée en un seul document JSON (un appel au parseur)
+                    present = list(filter(None, values))
+                    decoded = _json_loads("[" + ",".join(present) + "]")
+                    if len(decoded) != len(present):  # Une valeur malformée a décalé le découpage
+                        raise ValueError("nombre de valeurs JSON incohérent")
+                    decoded = iter(decoded)
+                    for item, value in zip(data, values):
+                        if value:
+                            item[key] = next(decoded)
+                except (ValueError, TypeError):
+                    # Au moins une valeur invalide : décodage valeur par valeur, sans rien perdre
+                    for item, value in zip(data, values):
+                        item[key] = _decode_json_cell(value)
+            for key in mixed_columns:
+                for item in data:
+                    item[key] = _decode_mixed_cell(item[key])
             
             logger.info(f"✅ {len(data)} enregistrements chargés depuis SQLite: {file_path}")
             return data
@@ -288,8 +897,51 @@ class SQLiteStorageStrategy(StorageStrategy):
             logger.error(f"Erreur lors du chargement SQLite: {e}")
             return []
     
+    def _get_json_columns(self, cursor: sqlite3.Cursor, table_name: str,
+                          sample_row: Any) -> Tuple[List[str], List[str]]:
+        """
+        Détermine une seule fois les colonnes d'une table stockées en JSON
+
+        Lit la table annexe renseignée par save() ; pour une base écrite avant
+        son introduction, les colonnes sont déduites de la première ligne.
+
+        Args:
+            cursor: Curseur sur la base
+            table_name: Nom de la table
+            sample_row: Première ligne de la table (None si la table est vide)
+
+        Returns:
+            Tuple[List[str], List[str]]: Colonnes entièrement JSON, colonnes mixtes (texte et JSON)
+        """
+        try:
+            cursor.execute(
+                f'SELECT cols FROM {_quote_identifier(self.JSON_COLUMNS_TABLE)} WHERE table_name = ?', (table_name,)
+            )
+            meta = cursor.fetchone()
+        except sqlite3.OperationalError:
+            meta = None
+        if meta is not None:
+            cols = json.loads(meta[0])
+            if isinstance(cols, list):  # Format sans colonnes mixtes
+                return cols, []
+            return cols["json"], cols["mixed"]
+
+        if sample_row is None:
+            return [], []
+        json_columns = []
+        for key in sample_row.keys():
+            value = sample_row[key]
+            if type(value) is str and value[:1] == '{' and value[-1:] == '}':
+                try:
+                    json.loads(value)
+                except json.JSONDecodeError:
+                    continue  # Texte entre accolades, pas du JSON
+                json_columns.append(key)
+        return json_columns, []
+
     def flush(self) -> None:
         """Vide les données en supprimant le fichier SQLite"""
+        _invalidate_load_cache()
         if self.connection:
             self.connection.close()
             self.connection = None
@@ -301,22 +953,136 @@ class SQLiteStorageStrategy(StorageStrategy):
             self.connection.close()
 
 
+class SQLiteRappatriementsStorageStrategy(SQLiteStorageStrategy):
+    """
+    Stockage SQLite pour les rapatriements
+
+    Chaque rapatriement est conservé intégralement (document JSON, produits compris)
+    avec sa position dans la liste : les requêtes du repository sont faites en mémoire,
+    la base ne sert qu'à restituer la liste dans son ordre.
+    """
+
+    # La table produits des bases plus anciennes n'est plus alimentée
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rappatriements (
+            position INTEGER PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+        DROP TABLE IF EXISTS produits;
+    """
+
+    def _get_connection(self, file_path: str) -> sqlite3.Connection:
+        """Obtient la connexion (mode WAL) et crée le schéma si besoin"""
+        is_new = not (self.connection and self.current_file_path == file_path)
+        conn = super()._get_connection(file_path)
+        if is_new:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.SCHEMA)
+        return conn
+
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
+        """Sauvegarde les rapatriements en une transaction"""
+        try:
+            db_path, _ = self._resolve(file_path, ".db")
+            conn = self._get_connection(db_path)
+            rappatriements = [
+                (position, _json_dumps(item).decode('utf-8'))
+                for position, item in enumerate(data)
+            ]
+
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("DELETE FROM rappatriements")
+                cursor.executemany("INSERT INTO rappatriements (position, data) VALUES (?, ?)", rappatriements)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            _invalidate_load_cache(db_path)
+            logger.info(f"✅ {len(rappatriements)} rapatriements sauvegardés dans SQLite: {file_path}")
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la sauvegarde SQLite: {e}")
+            raise
+
+    def load_iter(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Charge les rapatriements en flux, dans leur ordre d'enregistrement"""
+        db_path, _ = self._resolve(file_path, ".db")
+        if not os.path.exists(db_path):
+            return
+
+        conn = self._get_connection(db_path)
+        for row in conn.execute("SELECT position, data FROM rappatriements ORDER BY position"):
+            item = self._decode_row(row)
+            if item is not None:
+                yield item
+
+    @staticmethod
+    def _decode_row(row: sqlite3.Row) -> Optional[Dict[str, Any]]:
+        """Décode le JSON d'un rapatriement (None, avec une erreur journalisée, s'il est invalide)"""
+        try:
+            return _json_loads(row["data"])
+        except ValueError as e:
+            logger.error(f"Rapatriement {row['position']} illisible dans SQLite, ignoré: {e}")
+            return None
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
+        """Charge les rapatriements dans leur ordre d'enregistrement"""
+        try:
+            db_path, _ = self._resolve(file_path, ".db")
+            if not os.path.exists(db_path):
+                return []
+
+            conn = self._get_connection(db_path)
+            rows = conn.execute("SELECT position, data FROM rappatriements ORDER BY position").fetchall()
+            data = [item for item in map(self._decode_row, rows) if item is not None]
+            logger.info(f"✅ {len(data)} rapatriements chargés depuis SQLite: {file_path}")
+            return data
+
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement SQLite: {e}")
+            return []
+
+
 class S3StorageStrategy(StorageStrategy):
     """
     Stratégie de stockage en S3 pour les rappatriements
     """
+
+    # Transferts multipart concurrents (parts de 8 Mo, 10 connexions)
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=10,
+        use_threads=True,
+    )
+    # Taille au-delà de laquelle le tampon de transfert bascule sur disque
+    SPOOL_MAX_SIZE = 64 * 1024 * 1024
+    # Compression zstd des objets avec compress=True (niveau 3, tous les cœurs)
+    ZSTD_LEVEL = 3
+    # Nombre magique d'une trame zstd : distingue les objets compressés des anciens objets JSON
+    ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+    # Téléchargements simultanés de load_many (le client boto3 est thread-safe)
+    _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="s3-loader")
     
-    def __init__(self, bucket_name: str = None, region_name: str = None):
+    def __init__(self, bucket_name: str = None, region_name: str = None, compress: bool = False):
         """
         Initialise la stratégie S3
         
         Args:
             bucket_name: Nom du bucket S3 (optionnel, sera extrait de S3_RAPPATRIMENT_FILE_PATH)
             region_name: Région AWS (obligatoire via env var AWS_REGION)
+            compress: Écrit les objets compressés en zstd (lus quel que soit le réglage)
             
         Raises:
             ValueError: Si les variables d'environnement requises ne sont pas définies
+            ImportError: Si compress est demandé sans zstandard installé
         """
+        if compress and zstd is None:
+            raise ImportError("zstandard requis pour la compression S3. Installez: pip install zstandard")
+        self.compress = compress
+
         # Récupérer le chemin S3 complet
         s3_path = os.environ.get('S3_RAPPATRIMENT_FILE_PATH')
         if not s3_path:
@@ -352,11 +1118,16 @@ class S3StorageStrategy(StorageStrategy):
                 "Définissez la variable d'environnement AWS_REGION ou passez region_name en paramètre."
             )
         
-        # Initialiser le client S3 (utilise les credentials par défaut d'AWS)
+        # Existence du bucket vérifiée une seule fois par instance
+        self._bucket_verified = False
+
+        # Initialiser le client S3 (utilise les credentials par défaut d'AWS) ; le pool de
+        # connexions couvre les transferts multipart et les chargements parallèles
         try:
-            self.s3_client = boto3.client(
+            self.s3_client = boto3.Session().client(
                 's3',
-                region_name=self.region_name
+                region_name=self.region_name,
+                config=BotoConfig(max_pool_connections=50, retries={'mode': 'adaptive'})
             )
             logger.info(f"✅ Client S3 initialisé pour le bucket: {self.bucket_name}")
         except NoCredentialsError:
@@ -380,8 +1151,10 @@ class S3StorageStrategy(StorageStrategy):
     
     def _ensure_bucket_exists(self) -> None:
         """
-        Vérifie que le bucket S3 existe, le crée si nécessaire
+        Vérifie que le bucket S3 existe, le crée si nécessaire (une seule fois par instance)
         """
+        if self._bucket_verified:
+            return
         try:
             self.s3_client.head_bucket(Bucket=self.bucket_name)
             logger.debug(f"✅ Bucket {self.bucket_name} existe déjà")
@@ -404,49 +1177,85 @@ class S3StorageStrategy(StorageStrategy):
             else:
                 logger.error(f"❌ Erreur lors de la vérification du bucket: {e}")
                 raise
+        self._bucket_verified = True
     
-    def save(self, data: List[Dict[str, Any]], file_path: str) -> None:
+    def save(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
         """Sauvegarde les données en S3"""
         try:
             # S'assurer que le bucket existe
             self._ensure_bucket_exists()
             
-            # Convertir les données en JSON
-            json_data = json.dumps(data, ensure_ascii=False, indent=2, default=str)
-            
             # Obtenir la clé S3
             s3_key = self._get_s3_key(file_path)
             
-            # Upload vers S3
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=json_data.encode('utf-8'),
-                ContentType='application/json',
-                ServerSideEncryption='AES256'
-            )
+            extra_args = {
+                'ContentType': 'application/json',
+                'ServerSideEncryption': 'AES256'
+            }
+            with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE) as buffer:
+                if self.compress:
+                    writer = zstd.ZstdCompressor(level=self.ZSTD_LEVEL, threads=-1).stream_writer(buffer, closefd=False)
+                    extra_args['ContentEncoding'] = 'zstd'
+                else:
+                    writer = buffer
+
+                # Convertir les données en JSON compact, enregistrement par enregistrement
+                count = 0
+                separator = b'['
+                for item in data:
+                    writer.write(separator)
+                    writer.write(_json_dumps(item))
+                    separator = b','
+                    count += 1
+                writer.write(b'[]' if separator == b'[' else b']')
+                if writer is not buffer:
+                    writer.close()  # Termine la trame zstd (le tampon reste ouvert)
+                buffer.seek(0)
+
+                # Upload vers S3 (multipart concurrent au-delà du seuil)
+                self.s3_client.upload_fileobj(
+                    buffer,
+                    self.bucket_name,
+                    s3_key,
+                    Config=self.TRANSFER_CONFIG,
+                    ExtraArgs=extra_args
+                )
             
-            logger.info(f"✅ {len(data)} enregistrements sauvegardés dans S3: s3://{self.bucket_name}/{s3_key}")
+            _invalidate_load_cache(f"s3://{self.bucket_name}/{s3_key}")
+            logger.info(f"✅ {count} enregistrements sauvegardés dans S3: s3://{self.bucket_name}/{s3_key}")
             
         except Exception as e:
             logger.error(f"❌ Erreur lors de la sauvegarde S3: {e}")
             raise
     
     def load(self, file_path: str) -> List[Dict[str, Any]]:
-        """Charge les données depuis S3"""
+        """Charge les données depuis S3 (en cache tant que l'ETag de l'objet est inchangé)"""
+        s3_key = self._get_s3_key(file_path)
+        try:
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            key = (f"s3://{self.bucket_name}/{s3_key}", head.get('ETag'), head.get('LastModified'))
+        except Exception:
+            key = None  # Objet absent ou inaccessible : _read() gère l'erreur
+        return _cached_load(key, lambda: self._read(file_path))
+
+    def _read(self, file_path: str) -> List[Dict[str, Any]]:
+        """Télécharge et décode l'objet S3"""
         try:
             # Obtenir la clé S3
             s3_key = self._get_s3_key(file_path)
             
-            # Télécharger depuis S3
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            # Décoder le contenu JSON
-            json_data = response['Body'].read().decode('utf-8')
-            data = json.loads(json_data)
+            # Télécharger depuis S3 (parts récupérées en parallèle)
+            with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_SIZE) as buffer:
+                self.s3_client.download_fileobj(
+                    self.bucket_name,
+                    s3_key,
+                    buffer,
+                    Config=self.TRANSFER_CONFIG
+                )
+                buffer.seek(0)
+
+                # Décoder le contenu JSON
+                data = self._decode_payload(buffer.read())
             
             if not isinstance(data, list):
                 data = []
@@ -456,7 +1265,7 @@ class S3StorageStrategy(StorageStrategy):
             
         except ClientError as e:
             error_code = e.response['Error']['Code']
-            if error_code == 'NoSuchKey':
+            if error_code in ('NoSuchKey', '404'):
                 logger.info(f"ℹ️ Fichier S3 non trouvé: s3://{self.bucket_name}/{s3_key}")
                 return []
             else:
@@ -466,11 +1275,28 @@ class S3StorageStrategy(StorageStrategy):
             logger.error(f"❌ Erreur lors du chargement S3: {e}")
             return []
     
+    def _decode_payload(self, payload: bytes) -> Any:
+        """
+        Décode le contenu d'un objet S3, compressé en zstd ou en JSON brut
+
+        Args:
+            payload: Contenu de l'objet
+
+        Returns:
+            Any: Données JSON désérialisées
+        """
+        if payload[:4] == self.ZSTD_MAGIC:
+            if zstd is None:
+                raise RuntimeError("Objet S3 compressé en zstd : installez zstandard (pip install zstandard)")
+            # decompressobj : la taille décompressée n'est pas inscrite dans une trame écrite en flux
+            payload = zstd.ZstdDecompressor().decompressobj().decompress(payload)
+        return _json_loads(payload)
+
     def flush(self) -> None:
         """Vide les données en supprimant le fichier S3"""
         # Cette méthode sera appelée avec un file_path par BaseRepository
         # On ne peut pas supprimer ici car on n'a pas accès au file_path
-        pass
+        _invalidate_load_cache()
     
     def delete_file(self, file_path: str) -> bool:
         """
@@ -488,6 +1314,7 @@ class S3StorageStrategy(StorageStrategy):
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            _invalidate_load_cache(f"s3://{self.bucket_name}/{s3_key}")
             logger.info(f"✅ Fichier S3 supprimé: s3://{self.bucket_name}/{s3_key}")
             return True
         except Exception as e:
@@ -502,18 +1329,88 @@ class S3StorageStrategy(StorageStrategy):
             List[str]: Liste des clés S3
         """
         try:
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix='rappatriements/'
-            )
-            
+            # list_objects_v2 plafonne à 1000 clés par réponse : parcourir toutes les pages
+            paginator = self.s3_client.get_paginator('list_objects_v2')
             files = []
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    files.append(obj['Key'])
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix='rappatriements/'):
+                files.extend(obj['Key'] for obj in page.get('Contents', []))
             
             return files
         except Exception as e:
             logger.error(f"❌ Erreur lors de la liste des fichiers S3: {e}")
             return []
 
+    def _load_key(self, s3_key: str) -> List[Dict[str, Any]]:
+        """
+        Charge les enregistrements d'une clé S3
+
+        Args:
+            s3_key: Clé S3 à charger
+
+        Returns:
+            List[Dict[str, Any]]: Enregistrements (liste vide si absente ou illisible)
+        """
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            data = self._decode_payload(response['Body'].read())
+            return data if isinstance(data, list) else []
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                logger.info(f"ℹ️ Fichier S3 non trouvé: s3://{self.bucket_name}/{s3_key}")
+            else:
+                logger.error(f"❌ Erreur lors du chargement S3 de {s3_key}: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du chargement S3 de {s3_key}: {e}")
+            return []
+
+    def load_many(self, keys: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Charge plusieurs clés S3 en parallèle
+
+        Args:
+            keys: Clés S3 à charger (par exemple celles de list_files())
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Enregistrements par clé, dans l'ordre des clés
+        """
+        keys = list(keys)
+        return dict(zip(keys, self._executor.map(self._load_key, keys)))
+
+    # Variantes asynchrones : les appels boto3 bloquants s'exécutent sur le pool de la
+    # stratégie, ce qui permet de les superposer avec asyncio.gather depuis l'API
+
+    async def _run_async(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Exécute un appel S3 bloquant sur le pool de la stratégie sans bloquer la boucle"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def save_async(self, data: Iterable[Dict[str, Any]], file_path: str) -> None:
+        """Sauvegarde les données en S3 sans bloquer la boucle d'événements"""
+        await self._run_async(self.save, data, file_path)
+
+    async def load_async(self, file_path: str) -> List[Dict[str, Any]]:
+        """Charge les données depuis S3 sans bloquer la boucle d'événements"""
+        return await self._run_async(self.load, file_path)
+
+    async def delete_file_async(self, file_path: str) -> bool:
+        """Supprime un fichier S3 sans bloquer la boucle d'événements"""
+        return await self._run_async(self.delete_file, file_path)
+
+    async def list_files_async(self) -> List[str]:
+        """Liste les fichiers de rappatriements S3 sans bloquer la boucle d'événements"""
+        return await self._run_async(self.list_files)
+
+    async def load_many_async(self, keys: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Charge plusieurs clés S3 simultanément (asyncio.gather)
+
+        Args:
+            keys: Clés S3 à charger
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Enregistrements par clé, dans l'ordre des clés
+        """
+        keys = list(keys)
+        results = await asyncio.gather(*(self._run_async(self._load_key, key) for key in keys))
+        return dict(zip(keys, results))
+
@@ -1,6 +1,7 @@
 """
 Script pour analyser la couverture des besoins
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 import logging
@@ -48,11 +49,17 @@ def _analyse(**kwargs):
         # Utiliser le logger pour capturer tout l'output
         # Créer les services directement
         storage_strategy = JSONStorageStrategy()
+        # Chaque repository charge son fichier à la construction : lectures en parallèle
+        repository_classes = [BesoinsRepository, StocksRepository, ReceptionsRepository, RappatriementsRepository]
+        with ThreadPoolExecutor(max_workers=len(repository_classes)) as executor:
+            besoins_repo, stocks_repo, receptions_repo, rappatriements_repo = executor.map(
+                lambda repository_class: repository_class(storage_strategy), repository_classes
+            )
         analyse_service = AnalyseService(
-            besoins_repo=BesoinsRepository(storage_strategy),
-            stocks_repo=StocksRepository(storage_strategy),
-            receptions_repo=ReceptionsRepository(storage_strategy),
-            rappatriements_repo=RappatriementsRepository(storage_strategy)
+            besoins_repo=besoins_repo,
+            stocks_repo=stocks_repo,
+            receptions_repo=receptions_repo,
+            rappatriements_repo=rappatriements_repo
         )
 
         # Effectuer l'analyse et l'afficher
@@ -405,9 +405,10 @@ class AnalyseDisplayService:
     def _display_non_couverts(non_couverts: list) -> None:
         """Affiche les besoins non couverts"""
         print(f"\n❌ BESOINS NON COUVERTS ({len(non_couverts)}):")
+        maintenant = datetime.now()
         for couverture in non_couverts:
             besoin = couverture.besoin
-            jours_restants = (besoin.echeance - datetime.now().replace(tzinfo=None)).days
+            jours_restants = (besoin.echeance - maintenant).days
             print(f"   • {besoin.matiere.nom}: {besoin.quantite} unités")
             print(f"     Échéance: {besoin.echeance.strftime('%Y-%m-%d')} ({jours_restants} jours)")
             print(f"     Disponible (internes + rapatriements): {couverture.quantite_disponible_couverture} | Manque: {besoin.quantite - couverture.quantite_disponible_couverture}")
@@ -416,9 +417,10 @@ class AnalyseDisplayService:
     def _display_partiels(partiels: list) -> None:
         """Affiche les besoins partiellement couverts"""
         print(f"\n⚠️  BESOINS PARTIELLEMENT COUVERTS ({len(partiels)}):")
+        maintenant = datetime.now()
         for couverture in partiels:
             besoin = couverture.besoin
-            jours_restants = (besoin.echeance - datetime.now().replace(tzinfo=None)).days
+            jours_restants = (besoin.echeance - maintenant).days
             print(f"   • {besoin.matiere.nom}: {besoin.quantite} unités")
             print(f"     Échéance: {besoin.echeance.strftime('%Y-%m-%d')} ({jours_restants} jours)")
             print(f"     Couverture: {couverture.pourcentage_couverture:.1f}%")
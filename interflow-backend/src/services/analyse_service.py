@@ -50,7 +50,7 @@ class AnalyseService:
     def _normalize_date(self, date: Optional[datetime]) -> datetime:
         """Normalise une date en s'assurant qu'elle est naive (sans timezone)"""
         if date is None:
-            return datetime.now().replace(tzinfo=None)
+            return datetime.now()
         elif date.tzinfo is not None:
             return date.replace(tzinfo=None)
         return date
@@ -17,6 +17,7 @@ from repositories import (
     MatieresPremieresRepository,
     JSONStorageStrategy,
     SQLiteStorageStrategy,
+    SQLiteRappatriementsStorageStrategy,
     S3StorageStrategy
 )
 
@@ -64,14 +65,17 @@ class DataService:
         else:
             storage_strategy = JSONStorageStrategy()
         
-        # Stratégie spéciale pour les rappatriements (S3)
-        rappatriements_storage_strategy = S3StorageStrategy()
+        # Stratégie spéciale pour les rappatriements (S3 par défaut, SQLite en local)
+        if os.environ.get("RAPPATRIEMENTS_STORAGE_STRATEGY", "s3") == "sqlite":
+            rappatriements_storage_strategy = SQLiteRappatriementsStorageStrategy()
+        else:
+            rappatriements_storage_strategy = S3StorageStrategy()
         
-        self.besoins_repo = BesoinsRepository(storage_strategy)
+        self.matieres_repo = MatieresPremieresRepository(storage_strategy)
+        self.besoins_repo = BesoinsRepository(storage_strategy, matieres_repo=self.matieres_repo)
         self.stocks_repo = StocksRepository(storage_strategy)
         self.receptions_repo = ReceptionsRepository(storage_strategy)
         self.rappatriements_repo = RappatriementsRepository(rappatriements_storage_strategy)
-        self.matieres_repo = MatieresPremieresRepository(storage_strategy)
         
         # Marquer comme initialisé
         self._initialized = True
@@ -0,0 +1,15 @@
+"""
+Configuration commune des tests
+"""
+import pytest
+from lib.paths import paths
+from repositories.storage_strategies import _invalidate_load_cache
+
+
+@pytest.fixture(autouse=True)
+def repository_dir(tmp_path, monkeypatch):
+    """Isole les fichiers des repositories dans un répertoire temporaire"""
+    monkeypatch.setattr(paths, "data_repositories", tmp_path)
+    _invalidate_load_cache()
+    yield tmp_path
+    _invalidate_load_cache()
@@ -0,0 +1,191 @@
+"""
+Tests du repository de base (import atomique, bulk, caches dérivés, recherche partielle)
+"""
+import random
+from pathlib import Path
+from typing import Iterator
+import pytest
+from models.matieres import Matiere
+from models.stock import Stock
+from repositories import base_repository
+from repositories.base_repository import BaseRepository
+from repositories.stocks_repository import StocksRepository
+from repositories.storage_strategies import JSONStorageStrategy
+
+
+def make_stock(article: str, magasin: str = "10", quantite: float = 1.0, code_mp: str = "MP1") -> Stock:
+    """Construit un stock minimal (ID généré : "<article>_<magasin>_E1_C1")"""
+    return Stock(
+        article=article,
+        libelle_article=f"Article {article}",
+        quantite=quantite,
+        udm="KG",
+        statut_lot="LIBRE",
+        division="1",
+        magasin=magasin,
+        emplacement="E1",
+        contenant="C1",
+        statut_proprete="PROPRE",
+        reutilisable="OUI",
+        statut_contenant="PLEIN",
+        matiere=Matiere(code_mp=code_mp, nom=f"Matière {code_mp}"),
+    )
+
+
+def ids(stocks) -> list:
+    """Articles des stocks, dans l'ordre"""
+    return [stock.article for stock in stocks]
+
+
+class CountingStorage(JSONStorageStrategy):
+    """Stockage JSON qui compte les sauvegardes"""
+
+    def __init__(self):
+        super().__init__()
+        self.saves = 0
+
+    def save_models(self, items, adapter, file_path):
+        self.saves += 1
+        super().save_models(items, adapter, file_path)
+
+
+class FailingDecoder:
+    """Décodeur qui échoue après avoir produit quelques éléments"""
+
+    def decode_file(self, file_path: Path):
+        return list(self.decode_file_iter(file_path))
+
+    def decode_file_iter(self, file_path: Path) -> Iterator[Stock]:
+        yield make_stock("new-1")
+        yield make_stock("new-2")
+        raise OSError("fichier tronqué")
+
+
+def test_import_failing_mid_file_leaves_repository_unchanged(tmp_path):
+    storage = CountingStorage()
+    repo = BaseRepository(Stock, storage)
+    repo.create(make_stock("s1"))
+    saves = storage.saves
+
+    source = tmp_path / "stocks.csv"
+    source.write_text("")
+    with pytest.raises(OSError):
+        repo.import_from_file(str(source), FailingDecoder)
+
+    assert ids(repo.get_all()) == ["s1"]
+    assert repo.get_by_id(make_stock("new-1").id) is None
+    assert storage.saves == saves
+    assert ids(StocksRepository(JSONStorageStrategy()).get_all()) == ["s1"]
+
+
+def test_bulk_commits_once():
+    storage = CountingStorage()
+    repo = StocksRepository(storage)
+
+    with repo.bulk():
+        stocks = repo.create_many(make_stock(f"s{i}") for i in range(3))
+        repo.update_quantity(stocks[0].id, 5.0)
+        repo.delete(stocks[2].id)
+        assert storage.saves == 0
+
+    assert storage.saves == 1
+    reloaded = StocksRepository(JSONStorageStrategy())
+    assert ids(reloaded.get_all()) == ["s0", "s1"]
+    assert reloaded.get_by_id(stocks[0].id).quantite == 5.0
+
+
+def test_bulk_without_changes_does_not_save():
+    storage = CountingStorage()
+    repo = StocksRepository(storage)
+
+    with repo.bulk():
+        pass
+
+    assert storage.saves == 0
+
+
+def test_update_invalidates_derived_caches():
+    repo = StocksRepository(JSONStorageStrategy())
+    s1, s2 = repo.create_many([make_stock("s1", quantite=2.0), make_stock("s2", quantite=3.0)])
+    assert ids(repo.get_stocks_by_matiere("MP1")) == ["s1", "s2"]
+    assert repo.get_total_quantity_by_matiere("MP1") == 5.0
+
+    repo.update(s1.id, make_stock("s1", quantite=7.0, code_mp="MP2"))
+
+    assert ids(repo.get_stocks_by_matiere("MP1")) == ["s2"]
+    assert ids(repo.get_stocks_by_matiere("MP2")) == ["s1"]
+    assert repo.get_total_quantity_by_matiere("MP1") == 3.0
+    assert repo.get_total_quantity_by_matiere("MP2") == 7.0
+
+
+def test_update_changing_id_reindexes():
+    repo = StocksRepository(JSONStorageStrategy())
+    s1 = repo.create(make_stock("s1", magasin="10"))
+    assert ids(repo.get_stocks_by_magasin("10")) == ["s1"]
+
+    moved = repo.update(s1.id, make_stock("s1", magasin="20"))
+
+    assert repo.get_by_id(s1.id) is None
+    assert repo.get_by_id(moved.id) is moved
+    assert repo.get_stocks_by_magasin("10") == []
+    assert ids(repo.get_stocks_by_magasin("20")) == ["s1"]
+    assert repo.update(s1.id, make_stock("s1")) is None
+
+
+def test_delete_invalidates_index_and_derived_caches():
+    repo = StocksRepository(JSONStorageStrategy())
+    s1, s2, s3 = repo.create_many(
+        [make_stock("s1", quantite=2.0), make_stock("s2", quantite=3.0), make_stock("s3", quantite=4.0)]
+    )
+    assert repo.get_total_quantity_by_matiere("MP1") == 9.0
+
+    assert repo.delete(s1.id)
+
+    assert repo.get_by_id(s1.id) is None
+    assert ids(repo.get_stocks_by_magasin("10")) == ["s2", "s3"]
+    assert repo.get_total_quantity_by_matiere("MP1") == 7.0
+    # Les positions suivant l'élément supprimé sont décalées
+    repo.update(s3.id, make_stock("s3", quantite=1.0))
+    assert [(s.article, s.quantite) for s in repo.get_all()] == [("s2", 3.0), ("s3", 1.0)]
+    assert not repo.delete(s1.id)
+
+
+def test_parallel_scan_matches_single_block(monkeypatch):
+    repo = StocksRepository(JSONStorageStrategy())
+    magasins = ["10", "30", "EX1", "20"]
+    repo.create_many(
+        make_stock(f"s{i}", magasin=magasins[i % 4], quantite=float(i % 17), code_mp=f"MP{i % 5}")
+        for i in range(1000)
+    )
+    criteres = [
+        dict(quantite_min=3.0, quantite_max=12.0),
+        dict(nom_matiere="mp3", interne_only=True),
+        dict(nom_matiere="matière", interne_only=False, quantite_min=8.0),
+    ]
+    monkeypatch.setattr(base_repository, "_scanner", None)
+    attendus = [ids(repo.filter_stocks_advanced(**c)) for c in criteres]
+    # Pas de pool tant qu'aucun balayage n'atteint le seuil
+    assert base_repository._scanner is None
+
+    monkeypatch.setattr(base_repository, "PARALLEL_SCAN_MIN_ROWS", 1)
+    monkeypatch.setattr(base_repository, "_SCAN_WORKERS", 4)
+    try:
+        assert [ids(repo.filter_stocks_advanced(**c)) for c in criteres] == attendus
+        assert base_repository._scanner is not None
+    finally:
+        if base_repository._scanner is not None:
+            base_repository._scanner.shutdown()
+
+
+def test_key_search_matches_substring_test():
+    repo = StocksRepository(JSONStorageStrategy())
+    random.seed(1)
+    for _ in range(200):
+        valeurs = {"".join(random.choice("aB") for _ in range(random.randint(0, 5))): object()
+                   for _ in range(random.randint(0, 8))}
+        valeurs[None] = object()
+        repo._mark_changed()
+        for recherche in ["", "a", "b", "ab", "aa", "bab", "aaaa", "\x00", "a\x00b"]:
+            assert repo._cles_contenant("test", valeurs, recherche) == [
+                valeur for cle, valeur in valeurs.items() if cle is not None and recherche in cle.lower()
+            ]
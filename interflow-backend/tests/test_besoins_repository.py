@@ -0,0 +1,39 @@
+"""
+Tests du repository des besoins
+"""
+from datetime import datetime, timedelta
+from models.besoin import Besoin, Etat
+from models.matieres import Matiere
+from repositories.besoins_repository import BesoinsRepository
+from repositories.storage_strategies import JSONStorageStrategy
+
+
+def test_aggregation_groups_by_equal_matiere_etat_and_lot():
+    repo = BesoinsRepository(JSONStorageStrategy())
+    debut = datetime(2026, 1, 1)
+    etat = list(Etat)[0]
+    specs = [
+        (Matiere(code_mp="MP1", nom="Acide"), "L1", 1.0),
+        (Matiere(code_mp="MP1", nom="Acide"), "L1", 2.0),
+        # Même code, autre nom : matière différente
+        (Matiere(code_mp="MP1", nom="Base"), "L1", 5.0),
+        (Matiere(code_mp="MP1", nom="Acide", description="Diluée"), "L1", 7.0),
+        (Matiere(code_mp="MP1", nom="Acide"), "L2", 11.0),
+        (Matiere(code_mp="MP1", nom="Acide"), "L1", 4.0),
+    ]
+    repo.create_many(
+        Besoin(id=f"b{i}", matiere=matiere, quantite=quantite, etat=etat, lot=lot,
+               echeance=debut + timedelta(hours=i))
+        for i, (matiere, lot, quantite) in enumerate(specs)
+    )
+
+    agreges = repo.get_besoins_aggregated_by_timelapse(2, debut)
+
+    assert [(b.id, b.matiere.nom, b.matiere.description, b.lot, b.quantite) for b in agreges] == [
+        ("b0", "Acide", None, "L1", 7.0),
+        ("b2", "Base", None, "L1", 5.0),
+        ("b3", "Acide", "Diluée", "L1", 7.0),
+        ("b4", "Acide", None, "L2", 11.0),
+    ]
+    # Les besoins du repository ne sont pas modifiés
+    assert repo.get_by_id("b0").quantite == 1.0